@@ -0,0 +1,111 @@
+import time
+import typing as tp
+
+import numpy as np
+from src.framework.graph.Graph import Graph
+from src.framework.graph.constraint.EdgePosePointV2 import EdgePosePointV2
+from src.framework.graph.constraint.EdgePoseV2 import EdgePoseV2
+from src.framework.graph.constraint.EdgePosesSE2 import EdgePosesSE2
+from src.framework.graph.parameter.ParameterNodeSE2 import ParameterNodeSE2
+from src.framework.graph.parameter.ParameterNodeV1 import ParameterNodeV1
+from src.framework.graph.parameter.ParameterNodeV2 import ParameterNodeV2
+from src.framework.graph.parameter.ParameterNodeV3 import ParameterNodeV3
+from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification
+from src.framework.graph.spatial.NodeSE2 import NodeSE2
+from src.framework.graph.spatial.NodeV2 import NodeV2
+from src.framework.math.lie.transformation import SE2
+from src.framework.math.matrix.vector import Vector1, Vector2, Vector3
+from src.framework.optimiser.SparseOptimiser import SparseOptimiser
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubEdge, SubParameterNode
+
+# analytic jacobians of all edge types with 0, 1 or 2 parameter nodes, checked and timed against finite differences
+
+rng: np.random.RandomState = np.random.RandomState(0)
+num_edges: int = 200
+
+
+def create_parameter(
+        type_: tp.Type['SubParameterNode'],
+        specification: ParameterSpecification,
+        index: int,
+        id_: int
+) -> 'SubParameterNode':
+    if type_ == ParameterNodeSE2:
+        value: SE2 = SE2.from_translation_angle_elements(*rng.uniform(-0.2, 0.2, 3))
+        return type_(f'parameter_{id_}', value, specification, id_=id_)
+    dim: int = {ParameterNodeV1: 1, ParameterNodeV2: 2, ParameterNodeV3: 3}[type_]
+    center: float = 1. if specification == ParameterSpecification.SCALE else 0.
+    vector_type = {1: Vector1, 2: Vector2, 3: Vector3}[dim]
+    return type_(f'parameter_{id_}', vector_type(rng.uniform(center - 0.2, center + 0.2, dim)), specification, id_=id_, index=index)
+
+
+def create_graph(
+        edge_type: tp.Type['SubEdge'],
+        parameters: tp.List[tp.Tuple[tp.Type['SubParameterNode'], ParameterSpecification, int]]
+) -> Graph:
+    graph: Graph = Graph()
+    parameter_nodes: tp.List['SubParameterNode'] = [
+        create_parameter(type_, specification, index, id_) for id_, (type_, specification, index) in enumerate(parameters)
+    ]
+    for node in parameter_nodes:
+        graph.add_node(node)
+
+    id_: int = len(parameter_nodes)
+    for _ in range(num_edges):
+        a: NodeSE2 = NodeSE2('pose', SE2.from_translation_angle_elements(*rng.uniform(-3, 3, 3)), id_=id_)
+        graph.add_node(a)
+        edge: 'SubEdge'
+        if edge_type == EdgePosesSE2:
+            b: NodeSE2 = NodeSE2('pose', SE2.from_translation_angle_elements(*rng.uniform(-3, 3, 3)), id_=id_ + 1)
+            graph.add_node(b)
+            edge = EdgePosesSE2('odometry', SE2.from_translation_angle_elements(*rng.uniform(-1, 1, 3)), node_a=a, node_b=b)
+        elif edge_type == EdgePoseV2:
+            edge = EdgePoseV2('gps', Vector2(rng.uniform(-3, 3, 2)), node=a)
+        else:
+            b: NodeV2 = NodeV2('point', Vector2(rng.uniform(-3, 3, 2)), id_=id_ + 1)
+            graph.add_node(b)
+            edge = EdgePosePointV2('landmark', Vector2(rng.uniform(-1, 1, 2)), node_a=a, node_b=b)
+        for node in parameter_nodes:
+            edge.add_node(node)
+        graph.add_edge(edge)
+        id_ += 2
+    return graph
+
+
+specifications: tp.Dict[tp.Type['SubParameterNode'], tp.List[ParameterSpecification]] = {
+    ParameterNodeSE2: [ParameterSpecification.BIAS, ParameterSpecification.OFFSET],
+    ParameterNodeV1: list(ParameterSpecification),
+    ParameterNodeV2: list(ParameterSpecification),
+    ParameterNodeV3: [ParameterSpecification.SCALE]
+}
+configurations: tp.List[tp.List[tp.Tuple[tp.Type['SubParameterNode'], ParameterSpecification, int]]] = [[]]
+for parameter_type, parameter_specifications in specifications.items():
+    for parameter_specification in parameter_specifications:
+        for parameter_index in (range(3) if parameter_type in [ParameterNodeV1, ParameterNodeV2] else [0]):
+            configurations.append([(parameter_type, parameter_specification, parameter_index)])
+configurations.append([(ParameterNodeSE2, ParameterSpecification.OFFSET, 0), (ParameterNodeV3, ParameterSpecification.SCALE, 0)])
+configurations.append([(ParameterNodeV1, ParameterSpecification.BIAS, 2), (ParameterNodeV2, ParameterSpecification.SCALE, 1)])
+
+time_analytic: float = 0.
+time_numeric: float = 0.
+difference: float = 0.
+for edge_class in [EdgePosesSE2, EdgePoseV2, EdgePosePointV2]:
+    for configuration in configurations:
+        graph_: Graph = create_graph(edge_class, configuration)
+        difference = max(difference, SparseOptimiser.check_jacobians(graph_))
+
+        vector: np.ndarray = graph_.to_vector().array().flatten()
+        for group in graph_.get_evaluator().get_groups():
+            values: tp.List[np.ndarray] = group.gather(vector)
+            t: float = time.time()
+            group.jacobians(values)
+            time_analytic += time.time() - t
+            t = time.time()
+            for slot in range(len(values)):
+                SparseOptimiser.numeric_jacobian(group, values, slot)
+            time_numeric += time.time() - t
+
+print(f'{3 * len(configurations)} edge configurations of {num_edges} edges: largest difference {difference:.3e}')
+print(f'analytic {1e3 * time_analytic:.2f} ms, numeric {1e3 * time_numeric:.2f} ms, speedup {time_numeric / time_analytic:.1f}x')
@@ -0,0 +1,57 @@
+import timeit
+import typing as tp
+
+import numpy as np
+from src.framework.math.lie.rotation.SO2 import SO2
+from src.framework.math.lie.transformation import SE2
+from src.framework.math.lie.transformation.SE import SE
+from src.framework.math.matrix.square import Square2, Square3
+from src.framework.math.matrix.vector import Vector2, Vector3
+
+# closed-form SE2 operations, against the same operations on homogeneous matrices
+
+
+def matrix_compose(a: SE2, b: SE2) -> SE2:
+    matrix: Square3 = Square3(
+        SE2._construct_matrix(a.translation(), a.rotation()).array() @
+        SE2._construct_matrix(b.translation(), b.rotation()).array()
+    )
+    return SE.from_matrix.__func__(SE2, matrix)
+
+
+def matrix_inverse(a: SE2) -> SE2:
+    return SE.from_matrix.__func__(SE2, Square3(np.linalg.inv(SE2._construct_matrix(a.translation(), a.rotation()).array())))
+
+
+def matrix_between(a: SE2, b: SE2) -> SE2:
+    return matrix_compose(matrix_inverse(b), a)
+
+
+def matrix_oplus(a: SE2, vector: Vector3) -> SE2:
+    rotation: Square2 = Square2(a.rotation().array() @ SO2._angle_to_matrix(vector[2]).array())
+    return SE2(Vector2(a.translation().array() + vector[:2]), SO2(rotation))
+
+
+a: SE2 = SE2.from_translation_angle_elements(1., 2., 0.3)
+b: SE2 = SE2.from_translation_angle_elements(-0.5, 0.2, 2.9)
+vector: Vector3 = Vector3(0.1, -0.2, 0.05)
+number: int = 20000
+
+cases: tp.List[tp.Tuple[str, tp.Callable[[], tp.Any], tp.Callable[[], tp.Any]]] = [
+    ('compose', lambda: a + b, lambda: matrix_compose(a, b)),
+    ('inverse', lambda: a.inverse(), lambda: matrix_inverse(a)),
+    ('between', lambda: a - b, lambda: matrix_between(a, b)),
+    ('oplus', lambda: a.oplus(vector), lambda: matrix_oplus(a, vector)),
+    ('ominus', lambda: a.ominus(b), lambda: matrix_between(a, b).translation_angle_vector()),
+    ('exp', lambda: SE2.from_vector(vector), lambda: SE.from_vector.__func__(SE2, vector)),
+    ('log', lambda: a.vector(), lambda: SE.vector(a))
+]
+
+for name, closed_form, matrix_form in cases:
+    assert np.allclose(closed_form().array(), matrix_form().array())
+    time_closed: float = timeit.timeit(closed_form, number=number) / number
+    time_matrix: float = timeit.timeit(matrix_form, number=number) / number
+    print(
+        f'{name:>8}: closed-form {1e6 * time_closed:6.2f} us, matrix {1e6 * time_matrix:6.2f} us, '
+        f'speedup {time_matrix / time_closed:5.1f}x'
+    )
@@ -0,0 +1,48 @@
+import time
+import typing as tp
+
+import numpy as np
+from src.utils.GeoHash2D import GeoHash2D
+from src.utils.GridIndex2D import GridIndex2D
+
+# closure search of the oldest pose within a distance, separated by a number of poses, on random-walk trajectories
+
+rng: np.random.RandomState = np.random.RandomState(0)
+distance: float = 2.
+separation: int = 10
+num_queries: int = 100
+
+for num_poses in [10000, 30000, 100000]:
+    steps: np.ndarray = rng.normal(0., 1., (num_poses, 2))
+    points: np.ndarray = np.cumsum(steps, axis=0)
+    geo: GeoHash2D[int] = GeoHash2D[int]()
+    grid: GridIndex2D = GridIndex2D()
+    for id_, (x, y) in enumerate(points.tolist()):
+        geo.add(x, y, id_)
+        grid.add(x, y, id_)
+    pose_ids: tp.List[int] = list(range(num_poses))
+
+    queries: np.ndarray = rng.randint(num_poses // 2, num_poses, num_queries)
+    time_geo: float = 0.
+    time_grid: float = 0.
+    num_closures: int = 0
+    for query in queries.tolist():
+        x, y = points[query].tolist()
+
+        # as before: the hits of the geo-hash, filtered by a slice of the pose-ids
+        t: float = time.time()
+        filtered: tp.List[int] = pose_ids[:query - separation]
+        matches: tp.List[int] = [closure for closure in geo.find_within(x, y, distance) if closure in filtered]
+        oldest: tp.Optional[int] = min(matches) if matches else None
+        time_geo += time.time() - t
+
+        t = time.time()
+        closure_id: tp.Optional[int] = grid.find_oldest_within(x, y, distance, max_value=query - separation - 1)
+        time_grid += time.time() - t
+
+        assert closure_id == oldest
+        num_closures += closure_id is not None
+    print(
+        f'{num_poses:>6} poses ({num_closures}/{num_queries} closures): geo-hash {1e3 * time_geo / num_queries:8.3f} ms, '
+        f'grid {1e3 * time_grid / num_queries:6.3f} ms, speedup {time_geo / time_grid:6.1f}x'
+    )
@@ -0,0 +1,184 @@
+//
+// Long-lived optimisation process, driven over stdin/stdout.
+//
+// Commands (one per line), each answered with a single status line:
+//   LOAD <n>                       the next <n> lines are g2o-lines, appended to the graph
+//                                  -> OK | FAILED
+//   SET <n>                        the next <n> lines are '<id> <fixed> <estimate...>' of vertices in the graph
+//                                  -> OK | FAILED
+//   OPTIMIZE <solver> <iterations> optimises the graph, re-using the structure of the previous call
+//                                  -> ESTIMATES <n> <chi2>, followed by <n> lines '<id> <estimate...>'
+//                                     of the non-fixed vertices | FAILED
+//   CLEAR                          removes all vertices and edges
+//                                  -> OK
+//   QUIT                           exits
+//
+
+#include <iostream>
+#include <iomanip>
+#include <limits>
+#include <sstream>
+#include <string>
+#include <vector>
+
+#include "g2o/apps/g2o_cli/dl_wrapper.h"
+#include "g2o/apps/g2o_cli/g2o_common.h"
+
+#include "g2o/config.h"
+#include "g2o/core/sparse_optimizer.h"
+#include "g2o/core/optimization_algorithm_factory.h"
+
+using namespace std;
+using namespace g2o;
+
+class Worker {
+public:
+    Worker() : _isInitialized(false) {
+        _optimizer.setVerbose(false);
+    }
+
+    bool load(istream& is, int count) {
+        stringstream lines;
+        string line;
+        for (int i = 0; i < count; ++i) {
+            if (!getline(is, line)) return false;
+            lines << line << '\n';
+        }
+
+        // register the added elements, for updating the structure incrementally
+        HyperGraph::VertexIDMap verticesBefore = _optimizer.vertices();
+        HyperGraph::EdgeSet edgesBefore = _optimizer.edges();
+        if (!_optimizer.load(lines)) return false;
+        for (auto it = _optimizer.vertices().begin(); it != _optimizer.vertices().end(); ++it) {
+            if (verticesBefore.find(it->first) == verticesBefore.end()) _addedVertices.insert(it->second);
+        }
+        for (auto it = _optimizer.edges().begin(); it != _optimizer.edges().end(); ++it) {
+            if (edgesBefore.find(*it) == edgesBefore.end()) _addedEdges.insert(*it);
+        }
+        return true;
+    }
+
+    bool set(istream& is, int count) {
+        bool isSet = true;
+        string line;
+        vector<number_t> estimate;
+        for (int i = 0; i < count; ++i) {
+            if (!getline(is, line)) return false;
+            stringstream words(line);
+            int id = -1;
+            bool isFixed = false;
+            words >> id >> isFixed;
+            OptimizableGraph::Vertex* v = _optimizer.vertex(id);
+            if (!v) {
+                isSet = false;
+                continue;
+            }
+            estimate.resize(v->estimateDimension());
+            for (number_t& value : estimate) words >> value;
+            isSet = v->setEstimateData(estimate.data()) && isSet;
+            if (v->fixed() != isFixed) {
+                // the active vertices change: rebuild the structure
+                v->setFixed(isFixed);
+                _isInitialized = false;
+            }
+        }
+        return isSet;
+    }
+
+    bool optimize(const string& solver, int iterations) {
+        if (solver != _solver) {
+            OptimizationAlgorithmProperty solverProperty;
+            _optimizer.setAlgorithm(OptimizationAlgorithmFactory::instance()->construct(solver, solverProperty));
+            if (!_optimizer.solver()) return false;
+            _solver = solver;
+            _isInitialized = false;
+        }
+
+        bool isOnline = _isInitialized;
+        if (!_isInitialized) {
+            if (!_optimizer.initializeOptimization()) return false;
+            _isInitialized = true;
+        } else if (!_addedVertices.empty() || !_addedEdges.empty()) {
+            if (!_optimizer.updateInitialization(_addedVertices, _addedEdges)) return false;
+        }
+        _addedVertices.clear();
+        _addedEdges.clear();
+
+        return _optimizer.optimize(iterations, isOnline) > 0;
+    }
+
+    void writeEstimates(ostream& os) {
+        _optimizer.computeActiveErrors();
+        // the vertices in the index mapping are the active, non-fixed ones
+        os << "ESTIMATES " << _optimizer.indexMapping().size() << " " << _optimizer.activeChi2() << '\n';
+        vector<number_t> estimate;
+        for (auto it = _optimizer.indexMapping().begin(); it != _optimizer.indexMapping().end(); ++it) {
+            OptimizableGraph::Vertex* v = *it;
+            estimate.resize(v->estimateDimension());
+            v->getEstimateData(estimate.data());
+            os << v->id();
+            for (number_t value : estimate) os << ' ' << value;
+            os << '\n';
+        }
+    }
+
+    void clear() {
+        _optimizer.clear();
+        _addedVertices.clear();
+        _addedEdges.clear();
+        _isInitialized = false;
+    }
+
+private:
+    SparseOptimizer _optimizer;
+    string _solver;
+    bool _isInitialized;
+    HyperGraph::VertexSet _addedVertices;
+    HyperGraph::EdgeSet _addedEdges;
+};
+
+int main(int argc, char** argv) {
+#ifndef G2O_DISABLE_DYNAMIC_LOADING_OF_LIBRARIES
+    DlWrapper dlTypesWrapper;
+    loadStandardTypes(dlTypesWrapper, argc, argv);
+    DlWrapper dlSolverWrapper;
+    loadStandardSolver(dlSolverWrapper, argc, argv);
+#endif
+
+    cout << setprecision(numeric_limits<number_t>::max_digits10);
+    Worker worker;
+    string line;
+    while (getline(cin, line)) {
+        stringstream words(line);
+        string command;
+        words >> command;
+        if (command == "LOAD") {
+            int count = 0;
+            words >> count;
+            cout << (worker.load(cin, count) ? "OK" : "FAILED") << endl;
+        } else if (command == "SET") {
+            int count = 0;
+            words >> count;
+            cout << (worker.set(cin, count) ? "OK" : "FAILED") << endl;
+        } else if (command == "OPTIMIZE") {
+            string solver;
+            int iterations = 0;
+            words >> solver >> iterations;
+            if (worker.optimize(solver, iterations)) {
+                worker.writeEstimates(cout);
+                cout.flush();
+            } else {
+                cout << "FAILED" << endl;
+            }
+        } else if (command == "CLEAR") {
+            worker.clear();
+            cout << "OK" << endl;
+        } else if (command == "QUIT") {
+            break;
+        } else if (!command.empty()) {
+            cerr << "g2o_worker: unknown command '" << command << "'" << endl;
+            cout << "FAILED" << endl;
+        }
+    }
+    return 0;
+}
@@ -1,21 +1,20 @@
-import sys
 import typing as tp
 from abc import abstractmethod
 
-import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
+from src.framework.analysis.RollingWindow import RollingWindow
 from src.framework.analysis.plot.FigureParser import FigureParser
 from src.framework.analysis.plot.Plotter import Plotter
-from src.framework.graph.Visualisable import Visualisable, DrawPoint, DrawAxis, DrawEdge
+from src.framework.analysis.plot.TopologyPlotter import TopologyPlotter
+from src.framework.graph.Visualisable import Visualisable, DrawPoint, DrawEdge
 from src.framework.math.matrix.vector.Vector import Vector
-from src.gui.viewer.Rgb import Rgb
+from src.utils.ProgressLog import progress_log
 
 if tp.TYPE_CHECKING:
     from src.framework.graph.Graph import SubGraph, SubNode, SubSpatialNode, SubParameterNode, SubNodeEdge, SubEdge
-    from src.framework.math.lie.transformation import SE2
     from src.framework.math.matrix.vector.Vector import SubSizeVector
-    from src.framework.math.matrix.vector import SubVector, Vector2, Vector3
+    from src.framework.math.matrix.vector import SubVector, Vector2
 
 
 class SubgraphSet(object):
@@ -43,11 +42,6 @@ def round_down(value: float, nearest: float = 1.) -> float:
     return nearest * np.floor(value / nearest)
 
 
-def update_print(text: str) -> None:
-    sys.__stdout__.write(f'\r{text}')
-    sys.__stdout__.flush()
-
-
 class AnalyserTopology(object):
 
     @staticmethod
@@ -87,37 +81,12 @@ class AnalyserTopology(object):
     @classmethod
     def plot(
             cls,
-            graph: 'SubGraph'
+            graph: 'SubGraph',
+            should_rasterise: bool = False
     ) -> plt.Figure:
-        import time
-
-        _, __, size_x, size_y = cls.find_domain(graph)
         fig, ax = plt.subplots(figsize=(6, 6))
-        # fig, ax = plt.subplots(figsize=(0.2 * size_x, 0.2 * size_y))
 
-        for type_ in graph.get_types():
-            if issubclass(type_, Visualisable):
-                t = time.time()
-                elements: tp.List['SubNodeEdge'] = graph.get_of_type(type_)
-                element: 'SubNodeEdge'
-                for element in elements:
-                    color: tp.Tuple = type_.draw_rgb()
-                    if isinstance(element, DrawAxis):
-                        pose: 'SE2' = element.draw_pose().to_se2()
-                        translation: 'Vector2' = pose.translation()
-                        marker = mpl.markers.MarkerStyle(marker='4')
-                        marker._transform = marker.get_transform().rotate_deg(np.rad2deg(pose.rotation().angle()))
-                        ax.scatter(
-                            (translation[0]), (translation[1]), marker=marker, s=40,
-                            c=[list(Rgb.invert(color))]
-                        )
-                    elif isinstance(element, DrawPoint):
-                        point: 'Vector3' = element.draw_point()
-                        ax.plot(point[0], point[1], color=Rgb.invert(color), marker='.')
-                    elif isinstance(element, DrawEdge):
-                        a, b = element.draw_nodeset()
-                        ax.plot([a[0], b[0]], [a[1], b[1]], color=Rgb.invert(color), linestyle='-')
-                print(f'Plotting <{type_.__name__}> = time: {time.time() - t} s')
+        TopologyPlotter.draw(ax, graph, should_rasterise)
         ax.set_aspect('equal')
         fig.show()
         return fig
@@ -162,8 +131,8 @@ class AnalyserMetric(object):
             timesteps.append(subgraph.timestep())
             metrics.append(self.get_metric(subgraph))
 
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+            progress_log.progress('framework/Analyser', f'{100 * i / size:.2f}%')
+        progress_log.log('framework/Analyser', 'Done!')
 
         ax: plt.Axes = self._fig.axes[0]
         ax.plot(timesteps, metrics)
@@ -188,8 +157,8 @@ class AnalyserMetric(object):
             means.append(float(np.mean(metrics)))
             stds.append(float(np.std(metrics)))
 
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+            progress_log.progress('framework/Analyser', f'{100 * i / size:.2f}%')
+        progress_log.log('framework/Analyser', 'Done!')
 
         means_array: np.ndarray = np.array(means)
         stds_array: np.ndarray = np.array(stds)
@@ -341,8 +310,8 @@ class AnalyserParameterValues(object):
                 mean_set[j, i] = float(np.mean(values))
                 std_set[j, i] = float(np.std(values))
 
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+            progress_log.progress('framework/Analyser', f'{100 * i / size:.2f}%')
+        progress_log.log('framework/Analyser', 'Done!')
 
         fig: plt.Figure = cls.create_fig(name, dim)
         for i, ax in enumerate(fig.axes):
@@ -473,8 +442,8 @@ class AnalyserParameterDynamics(object):
                 mean_set[j, i] = float(np.mean(values))
                 std_set[j, i] = float(np.std(values))
 
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+            progress_log.progress('framework/Analyser', f'{100 * i / size:.2f}%')
+        progress_log.log('framework/Analyser', 'Done!')
 
         fig: plt.Figure = cls.create_fig(name, dim)
         for i, ax in enumerate(fig.axes):
@@ -511,15 +480,12 @@ class AnalyserParameterSpatial(object):
         assert cls.is_eligible(graph, parameter_name)
 
         parameters: tp.List['SubParameterNode'] = graph.get_of_name(parameter_name)
-        edges: tp.List['SubEdge'] = graph.get_edges()
-        batches: tp.List[tp.List['SubEdge']] = [[] for _ in parameters]
+        batches: tp.List[tp.List['SubEdge']] = []
         averages: tp.List[np.ndarray] = []
         centres: np.ndarray = np.zeros((2, len(parameters)))
         for i, parameter in enumerate(parameters):
             centres[:, i] = parameter.get_translation().array().flatten()
-            for edge in edges:
-                if edge.contains_node_id(parameter.get_id()):
-                    batches[i].append(edge)
+            batches.append(graph.get_edges_of_node(parameter.get_id()))
         for batch in batches:
             average: np.ndarray = np.zeros((2, len(batch)))
             for i, edge in enumerate(batch):
@@ -626,21 +592,14 @@ class AnalyserVariance(object):
         return [edge.get_timestep() for edge in edges]
 
     @staticmethod
-    def estimate_variances(edges: tp.List['SubEdge'], window: int) -> np.ndarray:
-        size: int = len(edges)
-        dim: int = edges[0].dim()
-
-        left: int = int(np.floor(window / 2))
-        right: int = window - left
+    def error_vectors(edges: tp.List['SubEdge']) -> np.ndarray:
+        """ Returns the error vectors of edges as rows of an array. """
+        return np.array([edge.error_vector().to_list() for edge in edges], dtype=float)
 
-        data: np.ndarray = np.zeros((dim, size))
-        for i, edge in enumerate(edges):
-            edge_window: tp.List[edges] = edges[np.maximum(0, i - left + 1): i + right + 1]
-            error_vectors: tp.List['SubVector'] = [edge.error_vector() for edge in edge_window]
-            for j in range(dim):
-                errors: tp.List[float] = [error_vector[j] for error_vector in error_vectors]
-                data[j, i] = float(np.var(errors))
-        return data
+    @classmethod
+    def estimate_variances(cls, edges: tp.List['SubEdge'], window: int) -> np.ndarray:
+        """ Returns the variance of the errors in the window around each edge, per dimension (dim x edges). """
+        return RollingWindow(window).variances(cls.error_vectors(edges)).transpose()
 
     @classmethod
     def plot_estimate_variance(
@@ -673,27 +632,14 @@ class AnalyserVariance(object):
         assert cls.is_group_eligible(graphs, name)
 
         first_edges: tp.List['SubEdge'] = graphs[0].get_of_name(name)
-
-        size: int = len(first_edges)
         dim: int = first_edges[0].dim()
+        timesteps: tp.List[float] = cls.timesteps(first_edges)
 
-        variances: tp.List[np.ndarray] = []
-        for graph in graphs:
-            edges: tp.List['SubEdge'] = graph.get_of_name(name)
-            variances.append(cls.estimate_variances(edges, window))
-
-        mean_set: np.ndarray = np.zeros((dim, size))
-        std_set: np.ndarray = np.zeros((dim, size))
-
-        timesteps: tp.List[float] = []
-        for i, edge in enumerate(first_edges):
-            timesteps.append(edge.get_timestep())
-            for j in range(dim):
-                values: tp.List[float] = [variance[j, i] for variance in variances]
-                mean_set[j, i] = float(np.mean(values))
-                std_set[j, i] = float(np.std(values))
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+        # runs x edges x dim
+        errors: np.ndarray = np.stack([cls.error_vectors(graph.get_of_name(name)) for graph in graphs])
+        variances: np.ndarray = RollingWindow(window).variances(errors)
+        mean_set: np.ndarray = np.mean(variances, axis=0).transpose()
+        std_set: np.ndarray = np.std(variances, axis=0).transpose()
 
         fig: plt.Figure = cls.create_fig(name, dim)
         for i, ax in enumerate(fig.axes):
@@ -724,8 +670,8 @@ class AnalyserVariance(object):
             for j in range(dim):
                 data[j, i] = cov_diagonal[j]
 
-            update_print(f'\r{100 * i / size:.2f}%')
-        update_print('\rDone!\n')
+            progress_log.progress('framework/Analyser', f'{100 * i / size:.2f}%')
+        progress_log.log('framework/Analyser', 'Done!')
 
         fig: plt.Figure = cls.create_fig(name, dim)
         for i, ax in enumerate(fig.axes):
@@ -0,0 +1,43 @@
+import typing as tp
+
+import numpy as np
+
+
+class RollingWindow(object):
+    """ Windows of rows around each row of an array, of which the statistics follow from cumulative sums. """
+
+    _left: int
+    _right: int
+
+    def __init__(self, window: int):
+        self._left = int(np.floor(window / 2))
+        self._right = window - self._left
+
+    def bounds(self, size: int) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ Returns the first row and the end of the window of each row, i.e. [i - left + 1, i + right + 1). """
+        rows: np.ndarray = np.arange(size)
+        return np.clip(rows - self._left + 1, 0, size), np.minimum(rows + self._right + 1, size)
+
+    def statistics(self, data: np.ndarray) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ Returns the mean and variance of the window of each row, for data of shape (..., rows, dim). """
+        starts, ends = self.bounds(data.shape[-2])
+        counts: np.ndarray = (ends - starts)[:, None]
+
+        # shifted by the mean of all rows, to limit cancellation in the sums of squares
+        offset: np.ndarray = np.mean(data, axis=-2, keepdims=True)
+        shifted: np.ndarray = data - offset
+        zeros: np.ndarray = np.zeros(data.shape[:-2] + (1, data.shape[-1]))
+        sums: np.ndarray = np.concatenate((zeros, np.cumsum(shifted, axis=-2)), axis=-2)
+        squares: np.ndarray = np.concatenate((zeros, np.cumsum(shifted ** 2, axis=-2)), axis=-2)
+
+        # empty windows (at the end, for a window of 1) have no statistics
+        with np.errstate(invalid='ignore'):
+            means: np.ndarray = (sums[..., ends, :] - sums[..., starts, :]) / counts
+            variances: np.ndarray = (squares[..., ends, :] - squares[..., starts, :]) / counts - means ** 2
+        return means + offset, np.maximum(variances, 0.)
+
+    def means(self, data: np.ndarray) -> np.ndarray:
+        return self.statistics(data)[0]
+
+    def variances(self, data: np.ndarray) -> np.ndarray:
+        return self.statistics(data)[1]
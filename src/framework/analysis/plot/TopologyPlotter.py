@@ -0,0 +1,88 @@
+import typing as tp
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.path import Path
+from src.framework.graph.Visualisable import Visualisable, DrawPoint, DrawAxis, DrawEdge
+from src.gui.viewer.Rgb import Rgb
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubNodeEdge
+
+
+class TopologyPlotter(object):
+    """ Draws the elements of a graph with a single artist per type: scatters of poses and points, and edge lines. """
+
+    @classmethod
+    def draw(
+            cls,
+            ax: plt.Axes,
+            graph: 'SubGraph',
+            should_rasterise: bool = False
+    ) -> None:
+        for type_ in graph.get_types():
+            if issubclass(type_, Visualisable):
+                elements: tp.List['SubNodeEdge'] = graph.get_of_type(type_)
+                if not elements:
+                    continue
+                color: tp.Tuple = Rgb.invert(type_.draw_rgb())
+                if issubclass(type_, DrawAxis):
+                    cls.draw_axes(ax, elements, color, should_rasterise)
+                elif issubclass(type_, DrawPoint):
+                    cls.draw_points(ax, elements, color, should_rasterise)
+                elif issubclass(type_, DrawEdge):
+                    cls.draw_edges(ax, elements, color, should_rasterise)
+        ax.autoscale_view()
+
+    @staticmethod
+    def draw_axes(
+            ax: plt.Axes,
+            elements: tp.List[DrawAxis],
+            color: tp.Tuple,
+            should_rasterise: bool = False
+    ) -> None:
+        """ Draws poses as a scatter of tri-markers, each rotated to the heading of its pose. """
+        poses: np.ndarray = np.array([element.draw_planar_pose() for element in elements], dtype=float)
+        translations: np.ndarray = poses[:, :2]
+        angles: np.ndarray = poses[:, 2]
+
+        marker = mpl.markers.MarkerStyle(marker='4')
+        collection = ax.scatter(
+            translations[:, 0], translations[:, 1], marker=marker, s=40, c=[list(color)], rasterized=should_rasterise
+        )
+
+        # one path per pose, as the marker path rotated by its angle
+        path: Path = marker.get_path().transformed(marker.get_transform())
+        cos: np.ndarray = np.cos(angles)[:, None]
+        sin: np.ndarray = np.sin(angles)[:, None]
+        xs: np.ndarray = cos * path.vertices[:, 0] - sin * path.vertices[:, 1]
+        ys: np.ndarray = sin * path.vertices[:, 0] + cos * path.vertices[:, 1]
+        vertices: np.ndarray = np.stack((xs, ys), axis=2)
+        collection.set_paths([Path(pose_vertices, path.codes) for pose_vertices in vertices])
+
+    @staticmethod
+    def draw_points(
+            ax: plt.Axes,
+            elements: tp.List[DrawPoint],
+            color: tp.Tuple,
+            should_rasterise: bool = False
+    ) -> None:
+        points: np.ndarray = np.array([element.draw_point().to_list()[:2] for element in elements], dtype=float)
+        ax.plot(
+            points[:, 0], points[:, 1], color=color, marker='.', linestyle='none', rasterized=should_rasterise
+        )
+
+    @staticmethod
+    def draw_edges(
+            ax: plt.Axes,
+            elements: tp.List[DrawEdge],
+            color: tp.Tuple,
+            should_rasterise: bool = False
+    ) -> None:
+        segments: np.ndarray = np.array(
+            [[a.to_list()[:2], b.to_list()[:2]] for a, b in (element.draw_nodeset() for element in elements)],
+            dtype=float
+        )
+        ax.add_collection(LineCollection(segments, colors=[color], linestyles='-', rasterized=should_rasterise))
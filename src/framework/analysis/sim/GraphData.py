@@ -1,30 +1,74 @@
 import copy
+import json
 import pathlib
 import pickle as pkl
-import sys
+import shutil
 import typing as tp
 
-import matplotlib as mpl
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib import ticker
 from scipy.stats import norm
 from src.definitions import get_project_root
+from src.framework.analysis.plot.TopologyPlotter import TopologyPlotter
 from src.framework.analysis.sim.TimeData import Data, TimeData
-from src.framework.graph.Visualisable import Visualisable, DrawPoint, DrawAxis, DrawEdge
-from src.gui.viewer.Rgb import Rgb
+from src.framework.graph.Graph import Graph
+from src.framework.graph.GraphParser import GraphParser
+from src.framework.graph.Visualisable import Visualisable, DrawPoint
+from src.utils.ProgressLog import progress_log
 
 if tp.TYPE_CHECKING:
     from src.framework.analysis.sim.TimeData import SubData, SubTimeData
     from src.framework.graph.Graph import SubNode, SubParameterNode, SubEdge, SubNodeEdge, SubGraph
-    from src.framework.math.lie.transformation import SE2
-    from src.framework.math.matrix.vector.Vector import SubSizeVector, Vector2, Vector3
+    from src.framework.math.matrix.vector.Vector import SubSizeVector
 
 default_figsize: tp.Tuple[float, float] = (4, 2.4)  # (4, 3.2)
 
 SubGraphData = tp.TypeVar('SubGraphData', bound='GraphData')
 
 
+Series = tp.Dict[str, tp.List[tp.List[float]]]  # per name: timesteps, followed by a row per dimension
+
+
+class GraphRecord(object):
+    """ The series GraphData takes from a graph, compact enough to be passed between processes. """
+
+    _time: tp.List[float]
+    _metrics: tp.Dict[str, tp.List[float]]
+    _par_evolution: Series
+    _measurements: Series
+    _par_values: Series
+
+    def __init__(
+            self,
+            time: tp.List[float],
+            metrics: tp.Dict[str, tp.List[float]],
+            par_evolution: Series,
+            measurements: Series,
+            par_values: Series
+    ):
+        self._time = time
+        self._metrics = metrics
+        self._par_evolution = par_evolution
+        self._measurements = measurements
+        self._par_values = par_values
+
+    def time(self) -> tp.List[float]:
+        return self._time
+
+    def metrics(self) -> tp.Dict[str, tp.List[float]]:
+        return self._metrics
+
+    def par_evolution(self) -> Series:
+        return self._par_evolution
+
+    def measurements(self) -> Series:
+        return self._measurements
+
+    def par_values(self) -> Series:
+        return self._par_values
+
+
 class GraphData(object):
     _ATE: str = 'ate'
     _COST: str = 'cost'
@@ -32,9 +76,17 @@ class GraphData(object):
     _RPER: str = 'rper'
 
     _path: pathlib.Path = (get_project_root() / 'plots').resolve()
-    _graphs: tp.List['SubGraph']
     _resolution: int = 30
 
+    # results format: a folder of arrays per series, with optional binary graphs
+    _suffix: str = '.results'
+    _version: int = 2
+
+    # graphs, or the files they (and their truths) are loaded from when first needed
+    _graphs: tp.List[tp.Optional['SubGraph']]
+    _graph_files: tp.List[tp.Optional[pathlib.Path]]
+    _truth_files: tp.List[tp.Optional[pathlib.Path]]
+
     _metrics: tp.Optional['SubTimeData']
     _measurements: tp.Dict[str, 'SubTimeData']
     _par_evolution: tp.Dict[str, 'SubTimeData']
@@ -43,6 +95,8 @@ class GraphData(object):
 
     def __init__(self):
         self._graphs = []
+        self._graph_files = []
+        self._truth_files = []
         self._metrics = None
         self._measurements = {}
         self._par_evolution = {}
@@ -51,19 +105,39 @@ class GraphData(object):
     def path(self) -> pathlib.Path:
         return self._path
 
+    @classmethod
+    def metric_names(cls) -> tp.List[str]:
+        return [cls._COST, cls._ATE, cls._RPET, cls._RPER]
+
     def has_first(self) -> bool:
         return len(self._graphs) > 0
 
     def graph(self, index: int = 0) -> 'SubGraph':
         assert len(self._graphs) > index
+        if self._graphs[index] is None:
+            graph: 'SubGraph' = GraphParser.load(self._graph_files[index], should_print=False)
+            if self._truth_files[index] is not None:
+                graph.assign_truth(GraphParser.load(self._truth_files[index], should_print=False))
+            self._graphs[index] = graph
         return self._graphs[index]
 
     def add_graph(self, graph: 'SubGraph') -> None:
         assert graph.has_truth()
-        has_first: bool = self.has_first()
-        if has_first:
-            assert self._graphs[0].is_equivalent(graph)
+        if self.has_first():
+            assert self.graph().is_equivalent(graph)
         self._graphs.append(copy.copy(graph))
+        self._graph_files.append(None)
+        self._truth_files.append(None)
+        self.add_record(self.extract(graph))
+
+    @classmethod
+    def extract(
+            cls,
+            graph: 'SubGraph',
+            should_print: bool = True
+    ) -> GraphRecord:
+        """ Returns the metric, parameter and measurement series of a graph, without the graph itself. """
+        assert graph.has_truth()
 
         # metrics
         time_: tp.List[float] = []
@@ -119,29 +193,10 @@ class GraphData(object):
                         for d in range(dim):
                             meas[edge_name][d + 1].append(measurement[d])
 
-            self.print(f'\rframework/AnalysisSet: Analysing: {100 * i / size:.2f}%')
-        self.print('\rframework/AnalysisSet: Analysis done!\n')
-
-        if not has_first:
-            self._metrics = TimeData(time_)
-        self._metrics.add(self._COST, error)
-        self._metrics.add(self._ATE, ate)
-        self._metrics.add(self._RPET, rpet)
-        self._metrics.add(self._RPER, rper)
-
-        for parameter_name, list_ in par_evolution.items():
-            if parameter_name not in self._par_evolution:
-                self._par_evolution[parameter_name] = TimeData(par_evolution[parameter_name][0])
-            dim: int = len(list_) - 1
-            for d in range(dim):
-                self._par_evolution[parameter_name].add(d, par_evolution[parameter_name][d + 1])
-
-        for edge_name, list_ in meas.items():
-            if edge_name not in self._measurements:
-                self._measurements[edge_name] = TimeData(meas[edge_name][0])
-            dim: int = len(list_) - 1
-            for d in range(dim):
-                self._measurements[edge_name].add(d, meas[edge_name][d + 1])
+            if should_print:
+                progress_log.progress('framework/AnalysisSet', f'Analysing: {100 * i / size:.2f}%')
+        if should_print:
+            progress_log.log('framework/AnalysisSet', 'Analysis done!')
 
         # parameter set
         par_values: tp.Dict[str, tp.List[tp.List[float]]] = {}
@@ -168,12 +223,33 @@ class GraphData(object):
                         #     for d in range(dim):
                         #         par_spatial[parameter_name][d].append(vector[d])
 
-        for parameter_name, list_ in par_values.items():
+        metrics: tp.Dict[str, tp.List[float]] = {cls._COST: error, cls._ATE: ate, cls._RPET: rpet, cls._RPER: rper}
+        return GraphRecord(time_, metrics, par_evolution, meas, par_values)
+
+    def add_record(self, record: GraphRecord) -> None:
+        """ Adds the series of a graph, as extracted from it. """
+        if self._metrics is None:
+            self._metrics = TimeData(record.time())
+        for key, series in record.metrics().items():
+            self._metrics.add(key, series)
+
+        for parameter_name, series in record.par_evolution().items():
+            if parameter_name not in self._par_evolution:
+                self._par_evolution[parameter_name] = TimeData(series[0])
+            for d in range(len(series) - 1):
+                self._par_evolution[parameter_name].add(d, series[d + 1])
+
+        for edge_name, series in record.measurements().items():
+            if edge_name not in self._measurements:
+                self._measurements[edge_name] = TimeData(series[0])
+            for d in range(len(series) - 1):
+                self._measurements[edge_name].add(d, series[d + 1])
+
+        for parameter_name, series in record.par_values().items():
             if parameter_name not in self._par_values:
-                self._par_values[parameter_name] = TimeData(par_values[parameter_name][0])
-            dim: int = len(list_) - 1
-            for d in range(dim):
-                self._par_values[parameter_name].add(d, par_values[parameter_name][d + 1])
+                self._par_values[parameter_name] = TimeData(series[0])
+            for d in range(len(series) - 1):
+                self._par_values[parameter_name].add(d, series[d + 1])
 
         # for parameter_name, list_ in par_spatial.items():
         #     if parameter_name not in self._par_spatial:
@@ -182,11 +258,6 @@ class GraphData(object):
         #     for d in range(dim):
         #         self._par_spatial[parameter_name].add(d, par_values[parameter_name][d])
 
-    @staticmethod
-    def print(text: str) -> None:
-        sys.__stdout__.write(f'\r{text}')
-        sys.__stdout__.flush()
-
     # metrics
     def time(self) -> tp.List[float]:
         return self._metrics.time()
@@ -670,65 +741,182 @@ class GraphData(object):
                         y_max = max(y_max, point[1])
         return x_min, y_min, x_max - x_min, y_max - y_min
 
-    def plot_topology(self, index: int = 0) -> plt.Figure:
-        import time
-        graph: 'SubGraph' = self._graphs[index]
+    def plot_topology(
+            self,
+            index: int = 0,
+            should_rasterise: bool = False
+    ) -> plt.Figure:
+        graph: 'SubGraph' = self.graph(index)
 
-        _, __, size_x, size_y = self.find_domain(graph)
         fig, ax = plt.subplots(figsize=(6, 6))
-        # fig, ax = plt.subplots(figsize=(0.2 * size_x, 0.2 * size_y))
 
-        for type_ in graph.get_types():
-            if issubclass(type_, Visualisable):
-                t = time.time()
-                elements: tp.List['SubNodeEdge'] = graph.get_of_type(type_)
-                element: 'SubNodeEdge'
-                for element in elements:
-                    color: tp.Tuple = type_.draw_rgb()
-                    if isinstance(element, DrawAxis):
-                        pose: 'SE2' = element.draw_pose().to_se2()
-                        translation: 'Vector2' = pose.translation()
-                        marker = mpl.markers.MarkerStyle(marker='4')
-                        marker._transform = marker.get_transform().rotate_deg(np.rad2deg(pose.rotation().angle()))
-                        ax.scatter(
-                            (translation[0]), (translation[1]), marker=marker, s=40,
-                            c=[list(Rgb.invert(color))]
-                        )
-                    elif isinstance(element, DrawPoint):
-                        point: 'Vector3' = element.draw_point()
-                        ax.plot(point[0], point[1], color=Rgb.invert(color), marker='.')
-                    elif isinstance(element, DrawEdge):
-                        a, b = element.draw_nodeset()
-                        ax.plot([a[0], b[0]], [a[1], b[1]], color=Rgb.invert(color), linestyle='-')
-                print(f'Plotting <{type_.__name__}> = time: {time.time() - t} s')
+        TopologyPlotter.draw(ax, graph, should_rasterise)
         ax.set_aspect('equal')
         fig.show()
         return fig
 
     # save load
-    def save(self, path: tp.Union[str, pathlib.Path]) -> None:
+    @classmethod
+    def _resolve(cls, path: tp.Union[str, pathlib.Path], suffix: str) -> pathlib.Path:
+        """ Resolves a name in the plots folder, or returns a path as is. """
         if isinstance(path, str):
-            if not path.endswith('.pickle'):
-                path += '.pickle'
-            self._path.mkdir(parents=True, exist_ok=True)
-            path: pathlib.Path = (self._path / path).resolve()
-        with open(path, 'wb') as file:
-            pkl.dump(self, file)
+            if not path.endswith(suffix):
+                path += suffix
+            path: pathlib.Path = (cls._path / path).resolve()
+        return path
+
+    def save(
+            self,
+            path: tp.Union[str, pathlib.Path],
+            should_save_graphs: bool = False
+    ) -> pathlib.Path:
+        """ Saves the series as arrays in a results folder, with the final graphs of the runs if required. """
+        path = self._resolve(path, self._suffix)
+        header: tp.Dict[str, tp.Any] = {
+            'version': self._version,
+            'has_metrics': self._metrics is not None,
+            'par_evolution': list(self._par_evolution.keys()),
+            'measurements': list(self._measurements.keys()),
+            'par_values': list(self._par_values.keys()),
+            'graphs': [],
+            'truths': []
+        }
+
+        # written next to the target first, since its arrays may be memory-mapped by a loaded instance
+        temp: pathlib.Path = path.with_name(f'{path.name}.temp')
+        if temp.exists():
+            shutil.rmtree(temp)
+        temp.mkdir(parents=True)
+        if self._metrics is not None:
+            self._metrics.save(temp / 'metrics')
+        for group, time_datas in self._series_groups().items():
+            for i, time_data in enumerate(time_datas.values()):
+                time_data.save(temp / group / f'{i}')
+        if should_save_graphs:
+            (temp / 'graphs').mkdir()
+            for i in range(len(self._graphs)):
+                graph: 'SubGraph' = self.graph(i)
+                file: str = f'graphs/{i}{GraphParser.binary_suffix()}'
+                GraphParser.save(graph, temp / file, should_print=False)
+                header['graphs'].append(file)
+
+                truth: tp.Optional['SubGraph'] = self.truth_graph(graph)
+                truth_file: tp.Optional[str] = None
+                if truth is not None:
+                    truth_file = f'graphs/{i}_truth{GraphParser.binary_suffix()}'
+                    GraphParser.save(truth, temp / truth_file, should_print=False)
+                header['truths'].append(truth_file)
+        with open(temp / 'header.json', 'w') as file:
+            json.dump(header, file, indent=4)
+
+        if path.exists():
+            shutil.rmtree(path)
+        temp.rename(path)
         print(f"src/AnalysisSet: Instance saved as '{path}'")
+        return path
 
     @classmethod
     def load(
+            cls,
+            path: tp.Union[str, pathlib.Path],
+            should_print: bool = False,
+            mmap_mode: tp.Optional[str] = 'r'
+    ) -> 'SubGraphData':
+        """ Loads a results folder, of which the arrays are memory-mapped, or a pickled instance. """
+        if not cls._resolve(path, cls._suffix).is_dir():
+            # saved before the results format
+            return cls.load_pickle(path, should_print=should_print)
+
+        path = cls._resolve(path, cls._suffix)
+        with open(path / 'header.json', 'r') as file:
+            header: tp.Dict[str, tp.Any] = json.load(file)
+        assert header['version'] <= cls._version, f'{path} has version {header["version"]}'
+
+        instance: 'SubGraphData' = cls()
+        if header['has_metrics']:
+            instance._metrics = TimeData.load(path / 'metrics', mmap_mode=mmap_mode)
+        for group, time_datas in instance._series_groups().items():
+            for i, name in enumerate(header[group]):
+                time_datas[name] = TimeData.load(path / group / f'{i}', mmap_mode=mmap_mode)
+        instance._graph_files = [path / file for file in header['graphs']]
+        instance._truth_files = [
+            None if file is None else path / file for file in header.get('truths', [None] * len(header['graphs']))
+        ]
+        instance._graphs = [None] * len(instance._graph_files)
+        if should_print:
+            print(f"src/AnalysisSet: Instance loaded from '{path}'")
+        return instance
+
+    @classmethod
+    def load_pickle(
             cls,
             path: tp.Union[str, pathlib.Path],
             should_print: bool = False
     ) -> 'SubGraphData':
-        if isinstance(path, str):
-            if not path.endswith('.pickle'):
-                path += '.pickle'
-            path: pathlib.Path = (cls._path / path).resolve()
+        """ Loads an instance as pickled by earlier versions. """
+        path = cls._resolve(path, '.pickle')
         assert path.is_file(), path
         with open(path, 'rb') as file:
             instance: 'SubGraphData' = pkl.load(file)
         if should_print:
             print(f"src/AnalysisSet: Instance loaded from '{path}'")
         return instance
+
+    @classmethod
+    def migrate(
+            cls,
+            path: tp.Union[str, pathlib.Path],
+            should_save_graphs: bool = True
+    ) -> pathlib.Path:
+        """ Converts a pickled instance to a results folder next to it, and returns the folder. """
+        path = cls._resolve(path, '.pickle')
+        return cls.load_pickle(path).save(path.with_suffix(cls._suffix), should_save_graphs=should_save_graphs)
+
+    @classmethod
+    def migrate_all(
+            cls,
+            folder: tp.Optional[pathlib.Path] = None,
+            should_save_graphs: bool = True
+    ) -> tp.List[pathlib.Path]:
+        """ Converts the pickled instances in a folder (the plots folder by default) that have no results folder. """
+        if folder is None:
+            folder = cls._path
+        return [
+            cls.migrate(path, should_save_graphs=should_save_graphs) for path in sorted(folder.glob('*.pickle'))
+            if not path.with_suffix(cls._suffix).is_dir()
+        ]
+
+    @staticmethod
+    def truth_graph(graph: 'SubGraph') -> tp.Optional['SubGraph']:
+        """ Returns the truth of a graph, or a graph of the truths of its elements if it has none itself. """
+        if graph.has_truth():
+            return graph.get_truth()
+        edges: tp.List['SubEdge'] = graph.get_edges()
+        if not edges or not all(edge.has_truth() for edge in edges):
+            return None
+
+        truth: 'SubGraph' = Graph()
+        nodes: tp.List['SubNode'] = [node.get_truth() for node in graph.get_nodes() if node.has_truth()]
+        nodes += [node for edge in edges for node in edge.get_truth().get_nodes()]
+        for node in nodes:
+            if not truth.contains_node_id(node.get_id()):
+                truth.add_node(node)
+        for edge in edges:
+            truth.add_edge(edge.get_truth())
+        return truth
+
+    def _series_groups(self) -> tp.Dict[str, tp.Dict[str, 'SubTimeData']]:
+        return {
+            'par_evolution': self._par_evolution,
+            'measurements': self._measurements,
+            'par_values': self._par_values
+        }
+
+    # pickle
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__dict__.update(state)
+        if '_graph_files' not in state:
+            # pickled before graphs could be loaded from files
+            self._graph_files = [None] * len(self._graphs)
+        if '_truth_files' not in state:
+            self._truth_files = [None] * len(self._graphs)
@@ -0,0 +1,97 @@
+import typing as tp
+
+import numpy as np
+from src.framework.analysis.sim.GraphData import GraphData, GraphRecord, Series
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubParameterNode, SubEdge
+
+
+class SeriesArray(object):
+    """ Rows of a timestep and values, appended to a preallocated array that doubles when full. """
+
+    _array: np.ndarray
+    _count: int
+
+    def __init__(self, dim: int, capacity: int = 256):
+        self._array = np.zeros((capacity, dim + 1))
+        self._count = 0
+
+    def append(self, timestep: float, values: tp.List[float]) -> None:
+        if self._count == len(self._array):
+            self._array = np.concatenate((self._array, np.zeros_like(self._array)))
+        self._array[self._count, 0] = timestep
+        self._array[self._count, 1:] = values
+        self._count += 1
+
+    def array(self) -> np.ndarray:
+        return self._array[:self._count]
+
+    def to_series(self) -> tp.List[tp.List[float]]:
+        """ Returns the timesteps, followed by a row per dimension. """
+        return self.array().transpose().tolist()
+
+
+class GraphRecorder(object):
+    """ Records the series GraphData takes from a graph while it is simulated, one timestep at a time. """
+
+    _capacity: int
+    _metrics: SeriesArray  # as GraphData.metric_names
+    _par_evolution: tp.Dict[str, SeriesArray]
+    _measurements: tp.Dict[str, SeriesArray]
+    _par_values: Series
+
+    def __init__(self, capacity: int = 256):
+        self._capacity = capacity
+        self.reset()
+
+    def reset(self) -> None:
+        self._metrics = SeriesArray(4, self._capacity)
+        self._par_evolution = {}
+        self._measurements = {}
+        self._par_values = {}
+
+    def record(self, graph: 'SubGraph') -> None:
+        """ Appends the metrics, parameter values and latest measurements of the graph at a timestep. """
+        assert graph.has_truth()
+        timestep: float = graph.timestep()
+        self._metrics.append(
+            timestep, [graph.cost(), graph.ate(), graph.rpe_translation(), graph.rpe_rotation()]
+        )
+
+        for parameter_name in graph.get_parameter_names():
+            if graph.has_name(parameter_name):
+                parameter: 'SubParameterNode' = graph.get_of_name(parameter_name)[0]
+                if parameter_name not in self._par_evolution:
+                    self._par_evolution[parameter_name] = SeriesArray(parameter.dim(), self._capacity)
+                self._par_evolution[parameter_name].append(timestep, parameter.to_list())
+
+        for edge_name in graph.get_edge_names():
+            edge: 'SubEdge' = graph.get_of_name(edge_name)[-1]
+            if edge.timestep() == timestep:
+                if edge_name not in self._measurements:
+                    self._measurements[edge_name] = SeriesArray(edge.dim(), self._capacity)
+                self._measurements[edge_name].append(timestep, edge.to_list())
+
+    def finish(self, graph: 'SubGraph') -> None:
+        """ Records the final graph, and the values of its parameters that have been added more than once. """
+        self.record(graph)
+        self._par_values = {}
+        for parameter_name in graph.get_parameter_names():
+            if graph.has_name(parameter_name):
+                parameters: tp.List['SubParameterNode'] = graph.get_of_name(parameter_name)
+                if len(parameters) > 1:
+                    series: SeriesArray = SeriesArray(parameters[0].dim(), len(parameters))
+                    for parameter in parameters:
+                        series.append(parameter.get_timestep(), parameter.to_list())
+                    self._par_values[parameter_name] = series.to_series()
+
+    def to_record(self) -> GraphRecord:
+        metrics: np.ndarray = self._metrics.array()
+        return GraphRecord(
+            metrics[:, 0].tolist(),
+            {name: metrics[:, i + 1].tolist() for i, name in enumerate(GraphData.metric_names())},
+            {name: series.to_series() for name, series in self._par_evolution.items()},
+            {name: series.to_series() for name, series in self._measurements.items()},
+            self._par_values
+        )
@@ -0,0 +1,157 @@
+import os
+import pathlib
+import pickle as pkl
+import sys
+import tempfile
+import time
+import typing as tp
+from concurrent import futures
+
+from src.definitions import get_project_root
+from src.framework.analysis.sim.GraphData import GraphData, GraphRecord
+from src.framework.analysis.sim.GraphRecorder import GraphRecorder
+from src.framework.optimiser.Optimiser import Optimiser
+from src.utils.ProgressLog import progress_log
+
+if tp.TYPE_CHECKING:
+    from src.framework.analysis.sim.GraphData import SubGraphData
+    from src.framework.simulation.BiSimulation import SubBiSimulation
+
+Job = tp.Tuple[int, int]  # config index, seed
+Key = tp.Tuple[str, str]  # simulation identifier, config
+
+
+def initialise_worker(temp_folder: str) -> None:
+    """ Gives a worker process its own folder for optimiser files within <temp_folder>, and silences its output. """
+    Optimiser.set_temp_folder(tempfile.mkdtemp(dir=temp_folder))
+    sys.stdout = sys.__stdout__ = open(os.devnull, 'w')
+    progress_log.set_enabled(False)
+
+
+def run_job(
+        simulation_bytes: bytes,
+        config: tp.Any,
+        has_config: bool,
+        seed: int
+) -> GraphRecord:
+    simulation: 'SubBiSimulation' = pkl.loads(simulation_bytes)
+    simulation.set_sensor_seed(seed)
+    if has_config:
+        simulation.set_config(config)
+
+    # the series are recorded at each step, such that no history is kept
+    recorder: GraphRecorder = GraphRecorder()
+    simulation.estimate_simulation().set_recorder(recorder, should_keep_history=False)
+    simulation.run()
+    return recorder.to_record()
+
+
+class MonteCarlo(object):
+    """ Monte Carlo runs of a simulation per configuration, in a pool of worker processes. """
+
+    _path: pathlib.Path = (get_project_root() / 'plots/monte_carlo').resolve()
+
+    _simulation: 'SubBiSimulation'
+    _configs: tp.List[tp.Any]
+    _has_config: bool
+    _num_runs: int
+    _num_workers: tp.Optional[int]
+    _name: tp.Optional[str]
+
+    def __init__(
+            self,
+            simulation: 'SubBiSimulation',
+            configs: tp.Optional[tp.List[tp.Any]] = None,
+            num_runs: int = 1,
+            num_workers: tp.Optional[int] = None,
+            name: tp.Optional[str] = None
+    ):
+        """ Runs of a named instance are kept on disk, such that an interrupted or failed set resumes. """
+        self._simulation = simulation
+        self._has_config = configs is not None
+        self._configs = configs if configs is not None else [None]
+        self._num_runs = num_runs
+        self._num_workers = num_workers
+        self._name = name
+
+    # checkpoints
+    def _key(self, job: Job) -> Key:
+        """ Returns what a checkpoint of a run is valid for: the simulation, its steps and the config. """
+        return self._simulation.identifier(), repr(self._configs[job[0]])
+
+    def _checkpoint(self, job: Job) -> tp.Optional[pathlib.Path]:
+        if self._name is None:
+            return None
+        return (self._path / self._name / f'{job[0]}-{job[1]}.pickle').resolve()
+
+    def _load(self, job: Job) -> tp.Optional[GraphRecord]:
+        path: tp.Optional[pathlib.Path] = self._checkpoint(job)
+        if path is None or not path.is_file():
+            return None
+        with open(path, 'rb') as file:
+            key, record = pkl.load(file)
+        if key != self._key(job):
+            return None
+        return record
+
+    def _save(self, job: Job, record: GraphRecord) -> None:
+        path: tp.Optional[pathlib.Path] = self._checkpoint(job)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as file:
+            pkl.dump((self._key(job), record), file)
+
+    # run
+    def run(self, should_print: bool = True) -> tp.List['SubGraphData']:
+        """ Returns a GraphData per configuration, with its runs added in the order of their seeds. """
+        jobs: tp.List[Job] = [(j, k) for j in range(len(self._configs)) for k in range(self._num_runs)]
+        records: tp.Dict[Job, GraphRecord] = {}
+        for job in jobs:
+            record: tp.Optional[GraphRecord] = self._load(job)
+            if record is not None:
+                records[job] = record
+        pending: tp.List[Job] = [job for job in jobs if job not in records]
+        if should_print and len(records) > 0:
+            print(f'framework/MonteCarlo: Resuming with {len(records)} of {len(jobs)} runs done.')
+
+        failures: tp.Dict[Job, BaseException] = {}
+        if pending:
+            simulation_bytes: bytes = pkl.dumps(self._simulation)
+            t_start: float = time.time()
+            with tempfile.TemporaryDirectory() as temp_folder, futures.ProcessPoolExecutor(
+                    max_workers=self._num_workers, initializer=initialise_worker, initargs=(temp_folder,)
+            ) as pool:
+                by_future: tp.Dict[futures.Future, Job] = {
+                    pool.submit(run_job, simulation_bytes, self._configs[job[0]], self._has_config, job[1]): job
+                    for job in pending
+                }
+                for count, future in enumerate(futures.as_completed(by_future)):
+                    job: Job = by_future[future]
+                    exception: tp.Optional[BaseException] = future.exception()
+                    if exception is None:
+                        records[job] = future.result()
+                        self._save(job, records[job])
+                    else:
+                        failures[job] = exception
+
+                    if should_print:
+                        duration: float = time.time() - t_start
+                        num_left: int = len(pending) - count - 1
+                        print(
+                            f'framework/MonteCarlo: Run {count + 1}/{len(pending)} done '
+                            f'(config {job[0] + 1}, seed {job[1]}{", failed" if exception is not None else ""}); '
+                            f'Estimated time left: {duration / (count + 1) * num_left:.2f} s ({num_left} runs)'
+                        )
+
+        for job, exception in failures.items():
+            print(f'framework/MonteCarlo: Run of config {job[0] + 1}, seed {job[1]} failed: {exception!r}')
+        assert not failures, f'{len(failures)} of {len(jobs)} runs failed.'
+
+        graph_datas: tp.List['SubGraphData'] = []
+        for j in range(len(self._configs)):
+            graph_data: 'SubGraphData' = GraphData()
+            for k in range(self._num_runs):
+                graph_data.add_record(records[(j, k)])
+            graph_datas.append(graph_data)
+        return graph_datas
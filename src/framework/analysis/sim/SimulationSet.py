@@ -4,6 +4,7 @@ import typing as tp
 import matplotlib.pyplot as plt
 import numpy as np
 from src.framework.analysis.sim.GraphData import GraphData
+from src.framework.analysis.sim.MonteCarlo import MonteCarlo
 
 if tp.TYPE_CHECKING:
     from src.framework.analysis.sim.GraphData import SubGraphData
@@ -12,9 +13,11 @@ if tp.TYPE_CHECKING:
 
 class SimulationSet(object):
     _simulations: tp.Dict[str, tp.Tuple['SubResults', tp.List[int], int]]
+    _num_workers: int
 
-    def __init__(self):
+    def __init__(self, num_workers: int = 1):
         self._simulations = {}
+        self._num_workers = num_workers
 
     def add(
             self,
@@ -49,30 +52,41 @@ class SimulationSet(object):
         durations: tp.List[float] = []
         t_sim: float = time.time()
 
+        # runs in parallel worker processes, which resume from the runs of a previous, interrupted set
+        parallel_datas: tp.Optional[tp.List['SubGraphData']] = None
+        if self._num_workers > 1:
+            print(f"Simulating {simulation.__class__.__name__} '{sim_name}' {print_index}: {num_runs} runs on {self._num_workers} workers...")
+            parallel_datas = MonteCarlo(simulation, configs, num_mc, self._num_workers, name=sim_name).run()
+            print(f'Simulation duration: {time.time() - t_sim:.2f} s')
+
         for j, config in enumerate(configs):
             config_str: str = f'{j + 1}'
             if isinstance(config, int) or isinstance(config, str):
                 config_str = f'{config}'
 
-            graph_data: 'SubGraphData' = GraphData()
-            for k in range(num_mc):
-                print(
-                    f"Simulating {simulation.__class__.__name__} '{sim_name}' {print_index}: config {config_str} of {len(configs)},  Monte Carlo run {k + 1}/{num_mc}..."
-                )
-                simulation.set_sensor_seed(k)
-                simulation.set_config(config)
-                t_run: float = time.time()
-                graph_data.add_graph(simulation.run())
-                t_current: float = time.time()
-                duration: float = t_current - t_run
-
-                count: int = j * num_mc + k + 1
-                durations.append(duration)
-                avg_duration: float = float(np.mean(duration))
-                num_runs_left: int = num_runs - count
-                print(
-                    f"Run duration: {duration:.2f} (total: {t_current - t_sim:.2f}, {count} runs); Estimated time left: {num_runs_left * avg_duration:.2f} s ({num_runs_left} runs)"
-                )
+            graph_data: 'SubGraphData'
+            if parallel_datas is not None:
+                graph_data = parallel_datas[j]
+            else:
+                graph_data = GraphData()
+                for k in range(num_mc):
+                    print(
+                        f"Simulating {simulation.__class__.__name__} '{sim_name}' {print_index}: config {config_str} of {len(configs)},  Monte Carlo run {k + 1}/{num_mc}..."
+                    )
+                    simulation.set_sensor_seed(k)
+                    simulation.set_config(config)
+                    t_run: float = time.time()
+                    graph_data.add_graph(simulation.run())
+                    t_current: float = time.time()
+                    duration: float = t_current - t_run
+
+                    count: int = j * num_mc + k + 1
+                    durations.append(duration)
+                    avg_duration: float = float(np.mean(duration))
+                    num_runs_left: int = num_runs - count
+                    print(
+                        f"Run duration: {duration:.2f} (total: {t_current - t_sim:.2f}, {count} runs); Estimated time left: {num_runs_left * avg_duration:.2f} s ({num_runs_left} runs)"
+                    )
 
             title: str = f'{sim_name}-{config_str}-{num_mc}'
             graph_data.save(title)
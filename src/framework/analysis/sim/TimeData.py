@@ -1,3 +1,5 @@
+import json
+import pathlib
 import typing as tp
 
 import numpy as np
@@ -8,12 +10,24 @@ SubTimeData = tp.TypeVar('SubTimeData', bound='TimeData')
 
 
 class Data(object):
+    """ Rows per key, in arrays of which the capacity doubles when full, with a running mean and variance. """
+
+    _capacity: int = 8  # initial rows per key
+
     _len: tp.Optional[int]
     _data: tp.Dict[Key, np.ndarray]
+    _num_rows: tp.Dict[Key, int]
+
+    # running mean and sum of squared differences (Welford), per key with rows added since it was computed
+    _means: tp.Dict[Key, np.ndarray]
+    _m2s: tp.Dict[Key, np.ndarray]
 
     def __init__(self):
         self._len = None
         self._data = {}
+        self._num_rows = {}
+        self._means = {}
+        self._m2s = {}
 
     def has_first(self) -> bool:
         return self._len is not None
@@ -39,29 +53,99 @@ class Data(object):
         if not self.has_first():
             self._len = len(value)
 
+        row: np.ndarray = np.asarray(value, dtype=float)
         if key not in self._data:
-            self._data[key] = np.array([value])
-        else:
-            self._data[key] = np.vstack((self._data[key], [value]))
+            self._data[key] = np.zeros((self._capacity, len(row)))
+            self._num_rows[key] = 0
+            self._means[key] = np.zeros(len(row))
+            self._m2s[key] = np.zeros(len(row))
+
+        num_rows: int = self._num_rows[key]
+        if num_rows == len(self._data[key]):
+            self._data[key] = np.concatenate((self._data[key], np.zeros_like(self._data[key])))
+        self._data[key][num_rows] = row
+        self._num_rows[key] = num_rows + 1
+
+        if key in self._means:
+            delta: np.ndarray = row - self._means[key]
+            self._means[key] += delta / (num_rows + 1)
+            self._m2s[key] += delta * (row - self._means[key])
 
     def data(self, key: Key) -> np.ndarray:
         assert self.has_first()
         assert self.has_key(key)
-        return self._data[key]
+        return self._data[key][:self._num_rows[key]]
 
     def num_rows(self, key: Key) -> int:
-        data: np.ndarray = self.data(key)
-        return data.shape[0]
+        assert self.has_key(key)
+        return self._num_rows[key]
 
     def row(self, key: Key, row: int) -> np.ndarray:
         data: np.ndarray = self.data(key)
         return data[row, :]
 
     def mean(self, key: Key) -> np.ndarray:
-        return np.mean(self.data(key), axis=0)
+        self._compute_statistics(key)
+        return self._means[key].copy()
 
     def std(self, key: Key) -> np.ndarray:
-        return np.std(self.data(key), axis=0)
+        self._compute_statistics(key)
+        return np.sqrt(self._m2s[key] / self._num_rows[key])
+
+    def _compute_statistics(self, key: Key) -> None:
+        """ Computes the mean and variance of a key from all its rows, if they are not kept up to date. """
+        if key not in self._means:
+            data: np.ndarray = self.data(key)
+            self._means[key] = np.mean(data, axis=0)
+            self._m2s[key] = np.var(data, axis=0) * len(data)
+
+    # save load
+    def save(self, folder: pathlib.Path) -> None:
+        """ Saves the rows of each key as a .npy file, which can be memory-mapped when loaded. """
+        folder.mkdir(parents=True, exist_ok=True)
+        keys: tp.List[Key] = self.keys()
+        for i, key in enumerate(keys):
+            np.save(folder / f'{i}.npy', self.data(key))
+        with open(folder / 'keys.json', 'w') as file:
+            json.dump({'length': self._len, 'keys': keys}, file)
+
+    @classmethod
+    def load(
+            cls,
+            folder: pathlib.Path,
+            mmap_mode: tp.Optional[str] = None
+    ) -> SubData:
+        data: SubData = cls()
+        data._load_rows(folder, mmap_mode)
+        return data
+
+    def _load_rows(
+            self,
+            folder: pathlib.Path,
+            mmap_mode: tp.Optional[str]
+    ) -> None:
+        with open(folder / 'keys.json', 'r') as file:
+            header: tp.Dict[str, tp.Any] = json.load(file)
+        self._len = header['length']
+        for i, key in enumerate(header['keys']):
+            self._data[key] = np.load(folder / f'{i}.npy', mmap_mode=mmap_mode)
+            self._num_rows[key] = len(self._data[key])
+
+    # pickle
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        state: tp.Dict[str, tp.Any] = self.__dict__.copy()
+        state['_data'] = {key: self.data(key) for key in self.keys()}  # without unused capacity
+        state['_means'] = {}  # recomputed when needed
+        state['_m2s'] = {}
+        return state
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__dict__.update(state)
+        if '_num_rows' not in state:
+            # pickled before rows were preallocated
+            self._num_rows = {key: len(data) for key, data in self._data.items()}
+            self._means = {}
+            self._m2s = {}
 
 
 class TimeData(Data):
@@ -74,3 +158,18 @@ class TimeData(Data):
 
     def time(self) -> tp.List[float]:
         return self._time
+
+    # save load
+    def save(self, folder: pathlib.Path) -> None:
+        super().save(folder)
+        np.save(folder / 'time.npy', np.array(self._time, dtype=float))
+
+    @classmethod
+    def load(
+            cls,
+            folder: pathlib.Path,
+            mmap_mode: tp.Optional[str] = None
+    ) -> SubTimeData:
+        time_data: SubTimeData = cls(np.load(folder / 'time.npy').tolist())
+        time_data._load_rows(folder, mmap_mode)
+        return time_data
@@ -0,0 +1,232 @@
+import typing as tp
+
+import numpy as np
+from src.framework.graph.ElementLog import Change, Entry, element_log
+from src.framework.graph.data import DataSE2
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubNode, SubEdge
+
+
+class EdgeGroup(object):
+    """
+    Edges of the same type and parameter configuration, evaluated together on arrays of node values. Edges can be
+    appended, of which the arrays are extended when next needed, and updated when their measurements change.
+    """
+
+    _edges: tp.List['SubEdge']
+    _rows: tp.Dict[int, int]  # id of edge -> row
+    _positions: np.ndarray
+    _is_angular: bool
+    _offsets: tp.Dict[int, int]
+    _pending_positions: tp.List[int]  # of appended edges, not yet in the arrays
+
+    # node layout: per node slot, the indices of the node values in the graph vector
+    _slot_indices: tp.List[np.ndarray]
+
+    # measurements
+    _measurements: np.ndarray
+    _info_matrices: np.ndarray
+
+    def __init__(
+            self,
+            edges: tp.List['SubEdge'],
+            positions: tp.List[int],
+            offsets: tp.Dict[int, int]
+    ):
+        self._edges = []
+        self._rows = {}
+        self._positions = np.zeros(0, dtype=int)
+        edge: 'SubEdge' = edges[0]
+        self._is_angular = issubclass(edge.data_type(), DataSE2)
+        self._offsets = offsets
+        self._pending_positions = []
+
+        self._slot_indices = [np.zeros((0, node.dim()), dtype=int) for node in edge.get_nodes()]
+        self._measurements = np.zeros((0, len(edge.to_list())))
+        self._info_matrices = np.zeros((0, edge.dim(), edge.dim()))
+        for edge_, position in zip(edges, positions):
+            self.append(edge_, position)
+
+    def append(self, edge: 'SubEdge', position: int) -> None:
+        """ Appends an edge, at its position in the graph edges, of which the nodes have (or will have) offsets. """
+        self._rows[id(edge)] = len(self._edges)
+        self._edges.append(edge)
+        self._pending_positions.append(position)
+
+    def _extend(self) -> None:
+        """ Extends the arrays with the appended edges. """
+        if not self._pending_positions:
+            return
+        edges: tp.List['SubEdge'] = self._edges[-len(self._pending_positions):]
+        self._positions = np.concatenate((self._positions, np.array(self._pending_positions, dtype=int)))
+        for slot, indices in enumerate(self._slot_indices):
+            slot_offsets: np.ndarray = np.array([self._offsets[edge.get_nodes()[slot].get_id()] for edge in edges])
+            self._slot_indices[slot] = np.concatenate(
+                (indices, slot_offsets[:, None] + np.arange(indices.shape[1]))
+            )
+        self._measurements = np.concatenate((self._measurements, np.array([edge.to_list() for edge in edges])))
+        self._info_matrices = np.concatenate(
+            (self._info_matrices, np.array([edge.get_info_matrix().array() for edge in edges]))
+        )
+        self._pending_positions = []
+
+    def update(self, edge: 'SubEdge') -> None:
+        """ Rewrites the measurement and info matrix of an edge of the group. """
+        row: int = self._rows[id(edge)]
+        if row < len(self._measurements):
+            # appended edges are read when the arrays are extended
+            self._measurements[row] = edge.to_list()
+            self._info_matrices[row] = edge.get_info_matrix().array()
+
+    @staticmethod
+    def key(edge: 'SubEdge') -> tp.Tuple[tp.Any, ...]:
+        parameters: tp.Tuple[tp.Any, ...] = tuple(
+            (type(node), node.get_specification(), node.index()) for node in edge.get_parameter_nodes()
+        )
+        return type(edge), parameters
+
+    def get_edges(self) -> tp.List['SubEdge']:
+        return self._edges
+
+    def positions(self) -> np.ndarray:
+        self._extend()
+        return self._positions
+
+    def size(self) -> int:
+        return len(self._edges)
+
+    def dim(self) -> int:
+        return self._measurements.shape[1]
+
+    def slot_indices(self) -> tp.List[np.ndarray]:
+        self._extend()
+        return self._slot_indices
+
+    def info_matrices(self) -> np.ndarray:
+        self._extend()
+        return self._info_matrices
+
+    # measurement model
+    def gather(self, vector: np.ndarray) -> tp.List[np.ndarray]:
+        return [vector[indices] for indices in self.slot_indices()]
+
+    def errors(self, values: tp.List[np.ndarray]) -> np.ndarray:
+        self._extend()
+        edge: 'SubEdge' = self._edges[0]
+        return edge.error_arrays(edge.estimate_arrays(values), self._measurements)
+
+    def jacobians(self, values: tp.List[np.ndarray]) -> tp.List[np.ndarray]:
+        """ Returns the jacobians (size x dim x slot-dim) of the errors, per node slot. """
+        self._extend()
+        return self._edges[0].jacobian_arrays(values, self._measurements)
+
+    def costs(self, errors: np.ndarray) -> np.ndarray:
+        return np.einsum('ni,nij,nj->n', errors, self.info_matrices(), errors)
+
+    def difference(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        difference: np.ndarray = a - b
+        if self._is_angular:
+            difference[:, 2] = np.arctan2(np.sin(difference[:, 2]), np.cos(difference[:, 2]))
+        return difference
+
+
+class BatchEvaluator(object):
+    """
+    Evaluates the error vectors and costs of all edges of a graph in one pass over edge types. Nodes and edges that
+    are added to the graph are appended, such that the evaluator is only rebuilt when elements are removed, and the
+    measurements of edges are kept up to date with the element log.
+    """
+
+    _offsets: tp.Dict[int, int]
+    _size: int
+    _groups: tp.List[EdgeGroup]
+    _by_key: tp.Dict[tp.Tuple[tp.Any, ...], EdgeGroup]
+    _by_edge: tp.Dict[int, EdgeGroup]  # id of edge -> group
+    _num_edges: int
+    _position: int  # in the element log
+
+    def __init__(self, graph: 'SubGraph'):
+        self._position = element_log.head()
+        self._offsets = {}
+        self._size = 0
+        for node in graph.get_nodes():
+            self.add_node(node)
+
+        edges: tp.List['SubEdge'] = graph.get_edges()
+        self._num_edges = len(edges)
+        positions: tp.Dict[int, int] = {id(edge): i for i, edge in enumerate(edges)}
+
+        self._groups = []
+        self._by_key = {}
+        self._by_edge = {}
+        for type_ in graph.get_edge_types():
+            by_key: tp.Dict[tp.Tuple[tp.Any, ...], tp.List['SubEdge']] = {}
+            for edge in graph.get_of_type(type_):
+                key: tp.Tuple[tp.Any, ...] = EdgeGroup.key(edge)
+                if key not in by_key:
+                    by_key[key] = []
+                by_key[key].append(edge)
+            for key, group_edges in by_key.items():
+                group_positions: tp.List[int] = [positions[id(edge)] for edge in group_edges]
+                self._by_key[key] = EdgeGroup(group_edges, group_positions, self._offsets)
+                self._groups.append(self._by_key[key])
+                for edge in group_edges:
+                    self._by_edge[id(edge)] = self._by_key[key]
+
+    # elements
+    def add_node(self, node: 'SubNode') -> None:
+        """ Adds a node at the end of the graph vector. """
+        self._offsets[node.get_id()] = self._size
+        self._size += node.dim()
+
+    def add_edge(self, edge: 'SubEdge') -> None:
+        """ Adds an edge at the end of the graph edges. """
+        key: tp.Tuple[tp.Any, ...] = EdgeGroup.key(edge)
+        if key in self._by_key:
+            self._by_key[key].append(edge, self._num_edges)
+        else:
+            self._by_key[key] = EdgeGroup([edge], [self._num_edges], self._offsets)
+            self._groups.append(self._by_key[key])
+        self._by_edge[id(edge)] = self._by_key[key]
+        self._num_edges += 1
+
+    def sync(self) -> bool:
+        """
+        Updates the edges of which the state changed, as recorded in the element log. Returns False if the changes are
+        no longer retained, in which case the evaluator is to be rebuilt.
+        """
+        head: int = element_log.head()
+        if self._position == head:
+            return True
+        entries: tp.Optional[tp.List[Entry]] = element_log.since(self._position, Change.STATE, head)
+        if entries is None:
+            return False
+        for element, _ in entries:
+            # logged elements are alive, so an edge of the evaluator with the same id is the same edge
+            group: tp.Optional[EdgeGroup] = self._by_edge.get(id(element))
+            if group is not None:
+                group.update(element)
+        self._position = head
+        return True
+
+    def get_offsets(self) -> tp.Dict[int, int]:
+        return self._offsets
+
+    def get_groups(self) -> tp.List[EdgeGroup]:
+        return self._groups
+
+    # evaluation
+    def error_vectors(self, vector: np.ndarray) -> tp.List[np.ndarray]:
+        """ Returns the error vectors of all edges, per group, given the (flat) graph vector. """
+        return [group.errors(group.gather(vector)) for group in self._groups]
+
+    def costs(self, vector: np.ndarray) -> np.ndarray:
+        """ Returns the cost of each edge, in the order of the graph edges. """
+        costs: np.ndarray = np.zeros(self._num_edges)
+        for group in self._groups:
+            costs[group.positions()] = group.costs(group.errors(group.gather(vector)))
+        return costs
+
+    def cost(self, vector: np.ndarray) -> float:
+        return float(sum(np.sum(group.costs(group.errors(group.gather(vector)))) for group in self._groups))
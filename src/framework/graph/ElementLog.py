@@ -0,0 +1,88 @@
+import collections
+import itertools
+import threading
+import typing as tp
+import weakref
+from enum import Enum
+
+import numpy as np
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubElement
+
+
+class Change(Enum):
+    METRICS = 'metrics'  # the metric terms (cost, ate2, rpet2, rper2) of an element, with their delta
+    TOPOLOGY = 'topology'  # the nodes of an edge
+    STATE = 'state'  # any attribute that is copied into snapshots: value, info matrix, nodes, truth, etc.
+
+
+Entry = tp.Tuple['SubElement', tp.Optional[np.ndarray]]  # element, delta (of its metric terms)
+
+
+class ElementLog(object):
+    """
+    A bounded log of changes to nodes and edges, from which graphs bring their caches up to date. Elements are referred
+    to weakly, such that the log does not keep discarded graphs alive, and changes may be recorded by several threads.
+    """
+
+    _entries: tp.Deque[tp.Tuple[weakref.ref, Change, tp.Optional[np.ndarray]]]
+    _head: int
+    _lock: threading.Lock
+
+    def __init__(self, capacity: int = 2 ** 17):
+        self._entries = collections.deque(maxlen=capacity)
+        self._head = 0
+        self._lock = threading.Lock()
+
+    def record(
+            self,
+            element: 'SubElement',
+            change: Change,
+            delta: tp.Optional[np.ndarray] = None
+    ) -> None:
+        """ Registers a change of an element. """
+        with self._lock:
+            self._entries.append((weakref.ref(element), change, delta))
+            self._head += 1
+
+    def record_all(
+            self,
+            elements: tp.List['SubElement'],
+            change: Change
+    ) -> None:
+        """ Registers the same change of many elements. """
+        with self._lock:
+            self._entries.extend((weakref.ref(element), change, None) for element in elements)
+            self._head += len(elements)
+
+    def head(self) -> int:
+        """ Returns the position following the last entry. """
+        return self._head
+
+    def since(
+            self,
+            position: int,
+            change: Change,
+            head: tp.Optional[int] = None
+    ) -> tp.Optional[tp.List[Entry]]:
+        """
+        Returns the changes of a kind recorded after a position and before a head (by default the current head), of
+        elements that are still alive, or None if they are no longer retained.
+        """
+        with self._lock:
+            if head is None:
+                head = self._head
+            if self._head - position > len(self._entries):
+                return None
+            entries = list(itertools.islice(reversed(self._entries), self._head - head, self._head - position))
+        changes: tp.List[Entry] = []
+        for reference, change_, delta in reversed(entries):
+            if change_ is change:
+                element: tp.Optional['SubElement'] = reference()
+                if element is not None:
+                    changes.append((element, delta))
+        return changes
+
+
+element_log: ElementLog = ElementLog()
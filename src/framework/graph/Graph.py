@@ -1,10 +1,14 @@
 import copy
+import itertools
 import typing as tp
 from abc import abstractmethod
 
 import numpy as np
-from src.framework.graph.data import DataFactory
+from src.framework.graph.BatchEvaluator import BatchEvaluator
+from src.framework.graph.ElementLog import Change, Entry, element_log
+from src.framework.graph.data import DataFactory, DataSE2, DataView, StateBuffer
 from src.framework.graph.parameter.ParameterSpecification import ParameterDict
+from src.framework.math.lie.transformation import SE2, SE2Array
 from src.framework.math.matrix.square import SquareFactory
 from src.framework.math.matrix.vector import VectorFactory
 from src.framework.math.matrix.vector.Vector import Vector
@@ -13,7 +17,6 @@ if tp.TYPE_CHECKING:
     from src.framework.graph.data import SubData, SubDataSymmetric
     from src.framework.optimiser.Optimiser import Optimiser
     from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification
-    from src.framework.math.lie.transformation import SE2
     from src.framework.math.matrix.vector import SubVector, SubSizeVector, Vector2, Vector3
     from src.framework.math.matrix.square import SubSquare
 
@@ -55,6 +58,7 @@ class Element(object):
 
     def set_name(self, name: str) -> None:
         self._name = name
+        element_log.record(self, Change.STATE)
 
     def get_name(self) -> str:
         return self._name
@@ -104,9 +108,16 @@ class DataContainer(tp.Generic[T]):
     def dim(cls) -> int:
         return DataFactory.from_type(cls._type).dim()
 
+    @classmethod
+    def data_type(cls) -> tp.Type['SubData']:
+        return DataFactory.from_type(cls._type)
+
     def data(self) -> 'SubData':
         return self._data
 
+    def set_data(self, data: 'SubData') -> None:
+        self._data = data
+
     def has_value(self) -> bool:
         return self._data.has_value()
 
@@ -116,18 +127,28 @@ class DataContainer(tp.Generic[T]):
 
     def set_value(self, value: T) -> None:
         self._data.set_value(value)
+        element_log.record(self, Change.STATE)
 
     def to_vector(self) -> 'SubSizeVector':
         return self._data.to_vector()
 
     def set_from_vector(self, vector: 'SubSizeVector') -> None:
         self._data.set_from_vector(vector)
+        element_log.record(self, Change.STATE)
+
+    def to_list(self) -> tp.List[float]:
+        return self._data.to_list()
+
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        self._data.set_from_list(list_)
+        element_log.record(self, Change.STATE)
 
     def set_zero(self) -> None:
         self.set_from_vector(VectorFactory.from_dim(self.dim()).zeros())
 
     # read/write
     def read(self, words: tp.List[str]) -> tp.List[str]:
+        element_log.record(self, Change.STATE)
         return self._data.read_rest(words)
 
     def write(self) -> tp.List[str]:
@@ -166,12 +187,14 @@ class Node(Element, tp.Generic[T], DataContainer[T]):
 
     def set_timestep(self, timestep: int) -> None:
         self._timestep = timestep
+        element_log.record(self, Change.STATE)
 
     def get_timestep(self) -> int:
         return self._timestep
 
     def fix(self, is_fixed: bool = True) -> None:
         self._is_fixed = is_fixed
+        element_log.record(self, Change.STATE)
 
     def is_fixed(self) -> bool:
         return self._is_fixed
@@ -184,11 +207,35 @@ class Node(Element, tp.Generic[T], DataContainer[T]):
         assert not self.has_truth()
         assert self.is_equivalent(node)
         self._truth = node
+        element_log.record(self, Change.STATE)
 
     def get_truth(self) -> SubNode:
         assert self.has_truth()
         return self._truth
 
+    # bulk construction
+    def replicate(
+            self,
+            values: tp.List[T],
+            ids: tp.List[int],
+            timesteps: tp.List[int],
+            fixed: tp.List[bool]
+    ) -> tp.List[SubNode]:
+        """ Returns new nodes with the attributes of this node (without truth), but for their values, ids, etc. """
+        assert not self.has_truth()
+        node_type: tp.Type[SubNode] = type(self)
+        data_type: tp.Type['SubData'] = self.data_type()
+        nodes: tp.List[SubNode] = []
+        for value, id_, timestep, is_fixed in zip(values, ids, timesteps, fixed):
+            node: SubNode = node_type.__new__(node_type)
+            node.__dict__.update(self.__dict__)
+            node._data = data_type(value)
+            node._id = id_
+            node._timestep = timestep
+            node._is_fixed = is_fixed
+            nodes.append(node)
+        return nodes
+
     # copy
     def is_equivalent(self, other: SubNode) -> bool:
         has_same_type: bool = type(other) == type(self)
@@ -253,13 +300,25 @@ class SpatialNode(tp.Generic[T], Node[T]):
         super().set_from_vector(vector)
         self.set_metrics()
 
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        super().set_from_list(list_)
+        self.set_metrics()
+
     def assign_truth(self, edge: SubEdge):
         super().assign_truth(edge)
         self.set_metrics()
 
-    def set_metrics(self) -> None:
+    def set_metrics(self, ate2: tp.Optional[float] = None) -> None:
         if self.has_value() and self.has_truth():
-            self._ate2 = self._compute_ate2()
+            if ate2 is None:
+                ate2 = self._compute_ate2()
+            if ate2 != self._ate2:
+                element_log.record(self, Change.METRICS, np.array([0., (ate2 or 0.) - (self._ate2 or 0.), 0., 0.]))
+            self._ate2 = ate2
+
+    def metric_terms(self) -> np.ndarray:
+        """ Returns the contribution (cost, ate2, rpet2, rper2) of this node to the graph metrics. """
+        return np.array([0., self._ate2 or 0., 0., 0.])
 
     @abstractmethod
     def _compute_ate2(self) -> tp.Optional[float]:
@@ -333,9 +392,20 @@ class ParameterNode(tp.Generic[T], Node[T]):
     ) -> 'SE2':
         pass
 
+    @abstractmethod
+    def compose_transformation_arrays(
+            self,
+            transformations: np.ndarray,
+            values: np.ndarray,
+            is_inverse: bool = False
+    ) -> np.ndarray:
+        """ Composes rows (x, y, angle) with rows of parameter values, configured as this parameter. """
+        pass
+
     # attributes
     def set_specification(self, specification: 'ParameterSpecification') -> None:
         self._specification = specification
+        element_log.record(self, Change.STATE)
 
     def get_specification(self) -> 'ParameterSpecification':
         return self._specification
@@ -356,12 +426,17 @@ class ParameterNode(tp.Generic[T], Node[T]):
     def to_vector3(self) -> 'Vector3':
         pass
 
+    @abstractmethod
+    def to_vector3_array(self, values: np.ndarray) -> np.ndarray:
+        pass
+
     # translation
     def has_translation(self) -> bool:
         return self._translation is not None
 
     def set_translation(self, translation: 'Vector2') -> None:
         self._translation = translation
+        element_log.record(self, Change.STATE)
 
     def get_translation(self) -> 'Vector2':
         assert self.has_translation()
@@ -522,6 +597,7 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
 
     # metrics
     _error_vector: tp.Optional['SubSizeVector']
+    _cost: tp.Optional[float]
     _rpet2: tp.Optional[float]
     _rper2: tp.Optional[float]
 
@@ -541,6 +617,7 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
 
         # metrics
         self._error_vector = None
+        self._cost = None
         self._rpet2 = None
         self._rper2 = None
 
@@ -568,12 +645,67 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
     def delta(self) -> T:
         pass
 
+    # batch measurement model
+    @classmethod
+    @abstractmethod
+    def delta_arrays(cls, values: tp.List[np.ndarray]) -> np.ndarray:
+        """ Returns the deltas of many edges of this type, given arrays of their spatial node values. """
+        pass
+
+    @abstractmethod
+    def estimate_arrays(self, values: tp.List[np.ndarray]) -> np.ndarray:
+        """ Returns the estimates of many edges configured as this edge, given arrays of their node values. """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def error_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        pass
+
+    # batch jacobians
+    @classmethod
+    @abstractmethod
+    def delta_jacobian_arrays(cls, values: tp.List[np.ndarray]) -> tp.List[np.ndarray]:
+        """ Returns the jacobians (N x delta-dim x node-dim) of the deltas, to the values of each spatial node. """
+        pass
+
+    @abstractmethod
+    def estimate_jacobian_arrays(self, values: tp.List[np.ndarray]) -> tp.Tuple[np.ndarray, tp.List[np.ndarray]]:
+        """ Returns the estimates, with their jacobians (N x estimate-dim x node-dim) to the values of each node. """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def error_jacobian_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        """ Returns the jacobians (N x dim x estimate-dim) of the errors to the estimates. """
+        pass
+
+    def jacobian_arrays(
+            self,
+            values: tp.List[np.ndarray],
+            measurements: np.ndarray
+    ) -> tp.List[np.ndarray]:
+        """ Returns the jacobians (N x dim x node-dim) of the errors of many edges configured as this edge. """
+        estimates, jacobians = self.estimate_jacobian_arrays(values)
+        error_jacobian: np.ndarray = self.error_jacobian_arrays(estimates, measurements)
+        return [error_jacobian @ jacobian for jacobian in jacobians]
+
     # info matrix
     def get_info_matrix(self) -> 'SubSquare':
         return self._info_matrix.get_value()
 
     def set_info_matrix(self, info_matrix: 'SubSquare') -> None:
         self._info_matrix.set_value(info_matrix)
+        element_log.record(self, Change.STATE)
+        self.set_metrics()
 
     # truth
     def has_truth(self) -> bool:
@@ -587,16 +719,66 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         assert not self.has_truth()
         assert self.is_similar(edge)
         self._truth = edge
+        element_log.record(self, Change.STATE)
         self.set_metrics()
 
+    # bulk construction
+    def replicate(
+            self,
+            node_lists: tp.List[tp.List[SubNode]],
+            values: tp.List[T],
+            info_matrices: tp.List['SubSquare']
+    ) -> tp.List[SubEdge]:
+        """
+        Returns new edges with the attributes of this edge (without nodes and truth), but for their nodes, values and
+        info matrices, of which the metrics are to be set in batch.
+        """
+        assert not self.get_nodes() and not self.has_truth()
+        edge_type: tp.Type[SubEdge] = type(self)
+        data_type: tp.Type['SubData'] = self.data_type()
+        info_type: tp.Type['SubDataSymmetric'] = type(self._info_matrix)
+        edges: tp.List[SubEdge] = []
+        for nodes, value, info_matrix in zip(node_lists, values, info_matrices):
+            edge: SubEdge = edge_type.__new__(edge_type)
+            edge.__dict__.update(self.__dict__)
+            edge._data = data_type(value)
+            edge._info_matrix = info_type(info_matrix)
+            edge._nodes = {}
+            edge._spatial_nodes = {}
+            edge._parameter_nodes = {}
+            edge._parameter_names = []
+            for node in nodes:
+                NodeContainer.add_node(edge, node)
+            edges.append(edge)
+        return edges
+
+    @staticmethod
+    def set_batch_metrics(
+            edges: tp.List[SubEdge],
+            errors: np.ndarray
+    ) -> None:
+        """ Sets the metrics of new edges without truth, of equal dimensions, from their error vectors (rows). """
+        num_edges, dim = errors.shape
+        info_arrays: np.ndarray = np.array([edge.get_info_matrix().array() for edge in edges]).reshape((num_edges, dim, dim))
+        costs: tp.List[float] = np.einsum('ni,nij,nj->n', errors, info_arrays, errors).tolist()
+        error_vectors: tp.List['SubSizeVector'] = VectorFactory.from_dim(dim).from_arrays(errors.reshape((num_edges, dim, 1)))
+        for edge, error_vector, cost in zip(edges, error_vectors, costs):
+            assert not edge.has_truth()
+            edge._error_vector = error_vector
+            edge._cost = cost
+
     # metrics
     def add_node(self, node: SubNode) -> None:
         super().add_node(node)
         self.set_metrics()
+        element_log.record(self, Change.TOPOLOGY)
+        element_log.record(self, Change.STATE)
 
     def remove_node_id(self, id_) -> None:
         super().remove_node_id(id_)
         self.set_metrics()
+        element_log.record(self, Change.TOPOLOGY)
+        element_log.record(self, Change.STATE)
 
     @abstractmethod
     def set_from_transformation(
@@ -617,12 +799,28 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         super().set_from_vector(vector)
         self.set_metrics()
 
-    def set_metrics(self) -> None:
+    def set_metrics(
+            self,
+            error_vector: tp.Optional['SubSizeVector'] = None,
+            rpe2: tp.Optional[tp.Tuple[float, float]] = None
+    ) -> None:
         if self._is_complete():
-            self._error_vector = self._compute_error_vector()
+            terms: np.ndarray = self.metric_terms()
+            if error_vector is None:
+                error_vector = self._compute_error_vector()
+            self._error_vector = error_vector
+            self._cost = self.mahalanobis_distance(self._error_vector, self._info_matrix.get_value())
             if self.has_truth():
-                self._rpet2 = self._compute_rpe_translation2()
-                self._rper2 = self._compute_rpe_rotation2()
+                if rpe2 is None:
+                    rpe2 = self._compute_rpe_translation2(), self._compute_rpe_rotation2()
+                self._rpet2, self._rper2 = rpe2
+            delta: np.ndarray = self.metric_terms() - terms
+            if delta.any():
+                element_log.record(self, Change.METRICS, delta)
+
+    def metric_terms(self) -> np.ndarray:
+        """ Returns the contribution (cost, ate2, rpet2, rper2) of this edge to the graph metrics. """
+        return np.array([self._cost or 0., 0., self._rpet2 or 0., self._rper2 or 0.])
 
     def _is_complete(self) -> bool:
         return self.has_value() and len(self.get_spatial_nodes()) == self.cardinality()
@@ -652,7 +850,8 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         return self._rper2
 
     def cost(self) -> float:
-        return self.mahalanobis_distance(self.error_vector(), self._info_matrix.get_value())
+        assert self._is_complete()
+        return self._cost
 
     @staticmethod
     def mahalanobis_distance(
@@ -669,16 +868,34 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         return max(timesteps)
 
     # read/write
-    def read(self, words: tp.List[str]) -> tp.List[str]:
+    def read(
+            self,
+            words: tp.List[str],
+            error_vector: tp.Optional['SubSizeVector'] = None
+    ) -> tp.List[str]:
+        """ Reads the measurement and info matrix, with the error vector if it has been evaluated in batch. """
         words = self.data().read_rest(words)
         words = self._info_matrix.read_rest(words)
-        self.set_metrics()
+        element_log.record(self, Change.STATE)
+        self.set_metrics(error_vector)
         return words
 
     def write(self) -> tp.List[str]:
         words: tp.List[str] = self.data().write() + self._info_matrix.write()
         return words
 
+    def set_from_lists(
+            self,
+            list_: tp.List[float],
+            info_list: tp.List[float],
+            error_vector: tp.Optional['SubSizeVector'] = None
+    ) -> None:
+        """ Sets the measurement and info matrix (upper triangle), with the error vector if evaluated in batch. """
+        self._data.set_from_list(list_)
+        self._info_matrix.set_from_list(info_list)
+        element_log.record(self, Change.STATE)
+        self.set_metrics(error_vector)
+
     # copy
     def copy_attributes_to(self, other: SubEdge) -> SubEdge:
         super().copy_attributes_to(other)
@@ -696,6 +913,7 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         # other attributes
         new._truth = self._truth  # same truth
         new._error_vector = self._error_vector  # passed by reference
+        new._cost = self._cost  # passed by value
         new._rpet2 = self._rpet2  # passed by value
         new._rper2 = self._rper2  # passed by value
         return new
@@ -713,10 +931,20 @@ class Edge(tp.Generic[T], DataContainer[T], NodeContainer):
         # other attributes
         new._truth = self._truth  # same truth
         new._error_vector = copy.deepcopy(self._error_vector, memo)  # passed by reference -> copy
+        new._cost = self._cost  # passed by value
         new._rpet2 = self._rpet2  # passed by value
         new._rper2 = self._rper2  # passed by value
         return new
 
+    # pickle
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__dict__.update(state)
+        if '_cost' not in state:
+            # pickled before the cost was cached
+            self._cost = None
+            if self._error_vector is not None:
+                self._cost = self.mahalanobis_distance(self._error_vector, self._info_matrix.get_value())
+
 
 class Graph(NodeContainer):
     # elements
@@ -729,6 +957,30 @@ class Graph(NodeContainer):
     _truth: tp.Optional[SubGraph]
     _atol: float
 
+    # batch evaluation
+    _evaluator: tp.Optional[BatchEvaluator]
+
+    # values of the nodes, of which the nodes are views (in order) as long as all of them are
+    _buffer: StateBuffer
+
+    # edge index: node ids -> edge, node id -> incident edges, and the node ids each edge is indexed by
+    # valid up to a position in the element log
+    _edges_by_ids: tp.Dict[tp.Tuple[int, ...], SubEdge]
+    _adjacency: tp.Dict[int, tp.List[SubEdge]]
+    _edge_keys: tp.Dict[int, tp.Tuple[int, ...]]
+    _topology_position: int
+
+    # running sums of the metric terms (cost, ate2, rpet2, rper2), valid up to a position in the element log
+    _metric_sums: tp.Optional[np.ndarray]
+    _metric_position: int
+
+    # the last snapshot, valid up to a position in the element log, with the copies of the nodes it holds by their ids
+    # and the positions of the edges it holds by the ids of the edges
+    _last_snapshot: tp.Optional['GraphSnapshot']
+    _snapshot_position: int
+    _snapshot_nodes: tp.Dict[int, SubNode]
+    _snapshot_edges: tp.Dict[int, int]
+
     def __init__(
             self,
             name: tp.Optional[str] = None
@@ -740,6 +992,15 @@ class Graph(NodeContainer):
         self._previous = None
         self._truth = None
         self._atol = 1e-6
+        self._evaluator = None
+        self._buffer = StateBuffer()
+        self._edges_by_ids = {}
+        self._adjacency = {}
+        self._edge_keys = {}
+        self._topology_position = element_log.head()
+        self._metric_sums = None
+        self._metric_position = 0
+        self._reset_snapshots()
 
     def identifier(self) -> str:
         return f'{len(self.get_nodes())}; {len(self.get_edges())}'
@@ -781,9 +1042,58 @@ class Graph(NodeContainer):
         return self._edges
 
     def get_edge_from_ids(self, *node_ids: int) -> SubEdge:
-        by_node_ids: tp.Dict[tp.Tuple[int, ...], SubEdge] = {tuple(edge.get_node_ids()): edge for edge in self.get_edges()}
-        assert tuple(node_ids) in by_node_ids
-        return by_node_ids[node_ids]
+        self._sync_index()
+        assert node_ids in self._edges_by_ids
+        return self._edges_by_ids[node_ids]
+
+    def get_edges_of_node(self, id_: int) -> tp.List[SubEdge]:
+        """ Returns the edges incident to a node, in the order they were added. """
+        self._sync_index()
+        return copy.copy(self._adjacency.get(id_, []))
+
+    def _sync_index(self) -> None:
+        """ Reindexes the edges of the graph of which the nodes changed, as recorded in the element log. """
+        head: int = element_log.head()
+        if self._topology_position == head:
+            return
+        entries: tp.Optional[tp.List[Entry]] = element_log.since(self._topology_position, Change.TOPOLOGY, head)
+        if entries is None:
+            # too many changes: index from scratch
+            self._index_edges()
+            self._evaluator = None
+            return
+        for edge, _ in entries:
+            # logged edges are alive, so an edge of the graph with the same id is the same edge
+            if id(edge) in self._edge_keys and self._edge_keys[id(edge)] != tuple(edge.get_node_ids()):
+                self._unindex_edge(edge)
+                self._index_edge(edge)
+                self._evaluator = None
+        self._topology_position = head
+
+    def _index_edge(self, edge: SubEdge) -> None:
+        key: tp.Tuple[int, ...] = tuple(edge.get_node_ids())
+        self._edge_keys[id(edge)] = key
+        self._edges_by_ids[key] = edge
+        for id_ in key:
+            if id_ not in self._adjacency:
+                self._adjacency[id_] = []
+            self._adjacency[id_].append(edge)
+
+    def _unindex_edge(self, edge: SubEdge) -> None:
+        key: tp.Tuple[int, ...] = self._edge_keys.pop(id(edge))
+        if self._edges_by_ids.get(key) is edge:
+            del self._edges_by_ids[key]
+        for id_ in key:
+            if id_ in self._adjacency:
+                self._adjacency[id_] = [edge_ for edge_ in self._adjacency[id_] if edge_ is not edge]
+
+    def _index_edges(self) -> None:
+        self._edges_by_ids = {}
+        self._adjacency = {}
+        self._edge_keys = {}
+        for edge in self._edges:
+            self._index_edge(edge)
+        self._topology_position = element_log.head()
 
     def get_node_names(self) -> tp.List[str]:
         return [name for name in self.get_names() if issubclass(self.get_type_of_name(name), Node)]
@@ -792,14 +1102,65 @@ class Graph(NodeContainer):
         return [name for name in self.get_names() if issubclass(self.get_type_of_name(name), Edge)]
 
     def add_node(self, node: SubNode) -> None:
+        self._sync_metrics()
         super().add_node(node)
         self._add_element(node)
+        self._buffer_node(node)
+        if self._evaluator is not None:
+            self._evaluator.add_node(node)
+        if self._metric_sums is not None and isinstance(node, SpatialNode):
+            self._metric_sums += node.metric_terms()
+
+    def remove_node_id(self, id_) -> None:
+        self._sync_metrics()
+        node: SubNode = self.get_node(id_)
+        super().remove_node_id(id_)
+        data: 'SubData' = node.data()
+        if isinstance(data, DataView) and data.buffer() is self._buffer:
+            self._buffer.detach(data)
+        if id_ in self._adjacency:
+            # incident edges keep their key until reindexed
+            del self._adjacency[id_]
+        self._reset_snapshots()
+        self._evaluator = None
+        if self._metric_sums is not None and isinstance(node, SpatialNode):
+            self._metric_sums -= node.metric_terms()
 
     def add_edge(self, edge: SubEdge):
         for node in edge.get_nodes():
             assert self.contains_node_id(node.get_id())
+        self._sync_metrics()
+        self._sync_index()
         self._edges.append(edge)
+        self._index_edge(edge)
         self._add_element(edge)
+        if self._evaluator is not None:
+            self._evaluator.add_edge(edge)
+        if self._metric_sums is not None:
+            self._metric_sums += edge.metric_terms()
+
+    def add_nodes(self, nodes: tp.List[SubNode]) -> None:
+        """ Adds many nodes at once, of which the metrics are summed when next needed. """
+        for node in nodes:
+            super().add_node(node)
+            self._add_element(node)
+            self._buffer_node(node)
+            if self._evaluator is not None:
+                self._evaluator.add_node(node)
+        self._metric_sums = None
+
+    def add_edges(self, edges: tp.List[SubEdge]) -> None:
+        """ Adds many edges at once, of which the metrics are summed when next needed. """
+        self._sync_index()
+        for edge in edges:
+            for id_ in edge.get_node_ids():
+                assert self.contains_node_id(id_)
+            self._edges.append(edge)
+            self._index_edge(edge)
+            self._add_element(edge)
+            if self._evaluator is not None:
+                self._evaluator.add_edge(edge)
+        self._metric_sums = None
 
     def _add_element(self, element: SubNodeEdge) -> None:
         element_type: tp.Type[SubNodeEdge] = type(element)
@@ -833,7 +1194,7 @@ class Graph(NodeContainer):
         if solution is not None:
 
             # cost below cost_threshold is considered optimal
-            cost: float = solution.cost()
+            cost: float = solution.cost(is_batched=True)
             if cost < cost_threshold:
                 # accept solution
                 return self.accept_solution(solution)
@@ -866,8 +1227,86 @@ class Graph(NodeContainer):
             copy_.set_previous(self.get_previous())
         return copy_
 
+    def snapshot(self) -> SubGraph:
+        """
+        Returns the graph as it is, which holds copies of the elements that changed since the previous snapshot, and
+        shares the other copies with it. Elements of a snapshot are not to be modified.
+        """
+        head: int = element_log.head()
+        entries: tp.Optional[tp.List[Entry]] = element_log.since(self._snapshot_position, Change.STATE, head)
+        previous: tp.Optional['GraphSnapshot'] = self._last_snapshot
+        if previous is None or entries is None:
+            # copy all elements
+            self._reset_snapshots()
+            previous = None
+            entries = []
+        elements: tp.List[SubElement] = [element for element, _ in entries]
+
+        # changed and new nodes, the latter in order of addition
+        nodes: tp.Dict[int, SubNode] = {}
+        for element in elements:
+            if isinstance(element, Node):
+                id_: int = element.get_id()
+                if id_ in self._snapshot_nodes and self._nodes.get(id_) is element:
+                    nodes[id_] = element
+        num_new_nodes: int = len(self._nodes) - len(self._snapshot_nodes)
+        for node in reversed(list(itertools.islice(reversed(self._nodes.values()), num_new_nodes))):
+            nodes[node.get_id()] = node
+
+        # changed edges, and edges of changed nodes
+        self._sync_index()
+        edges: tp.Dict[int, SubEdge] = {}
+        for element in elements:
+            if isinstance(element, Edge) and id(element) in self._snapshot_edges:
+                edges[self._snapshot_edges[id(element)]] = element
+        for id_ in nodes:
+            for edge in self._adjacency.get(id_, []):
+                if id(edge) in self._snapshot_edges:
+                    edges[self._snapshot_edges[id(edge)]] = edge
+        for position in range(len(self._snapshot_edges), len(self._edges)):
+            edges[position] = self._edges[position]
+            self._snapshot_edges[id(self._edges[position])] = position
+
+        # copies, of which the edges refer to the copies of their nodes
+        node_copies: tp.Dict[int, SubNode] = {id_: copy.deepcopy(node) for id_, node in nodes.items()}
+        self._snapshot_nodes.update(node_copies)
+        edge_copies: tp.Dict[int, SubEdge] = {}
+        for position, edge in edges.items():
+            memo: tp.Dict[int, tp.Any] = {id(node): self._snapshot_nodes[node.get_id()] for node in edge.get_nodes()}
+            edge_copies[position] = copy.deepcopy(edge, memo)
+
+        snapshot: 'GraphSnapshot' = GraphSnapshot(
+            self, previous, node_copies, edge_copies, len(self._edges), self._get_metric_sums()
+        )
+        if self.has_previous():
+            snapshot.set_previous(self.get_previous())
+        self._last_snapshot = snapshot
+        self._snapshot_position = head
+        return snapshot
+
+    def _reset_snapshots(self) -> None:
+        """ Lets the next snapshot copy all elements, e.g. after nodes have been removed. """
+        self._last_snapshot = None
+        self._snapshot_position = element_log.head()
+        self._snapshot_nodes = {}
+        self._snapshot_edges = {}
+
+    # state buffer
+    def _is_buffered(self) -> bool:
+        """ Returns whether all nodes are views of the state buffer, in order. """
+        return self._buffer.count() == len(self._nodes)
+
+    def _buffer_node(self, node: SubNode) -> None:
+        """ Moves the value of a node that was just added into the state buffer, if all other nodes are views of it. """
+        data: 'SubData' = node.data()
+        is_free: bool = not isinstance(data, DataView) or not data.is_attached()
+        if is_free and node.has_value() and self._buffer.count() == len(self._nodes) - 1:
+            node.set_data(self._buffer.attach(node.data_type(), node.get_value()))
+
     # vector
     def to_vector(self) -> 'SubVector':
+        if self._is_buffered():
+            return Vector(self._buffer.values())
         vector_list: tp.List[float] = []
         node: SubNode
         for node in self.get_nodes():
@@ -875,17 +1314,68 @@ class Graph(NodeContainer):
         return Vector(vector_list)
 
     def from_vector(self, vector: 'SubVector') -> None:
-        vector_list: tp.List[float] = vector.to_list()
-        index: int = 0
-        for node in self.get_nodes():
-            dim: int = node.dim()
-            segment: tp.List[float] = vector_list[index: index + dim]
-            assert len(segment) == dim
-            node.set_from_vector(VectorFactory.from_list(segment))
-            index += dim
-        assert index == len(vector_list)
-        for edge in self.get_edges():
-            edge.set_metrics()
+        array: np.ndarray = vector.array().flatten()
+        if self._is_buffered():
+            # a single copy, after which the nodes create their values when these are read
+            self._buffer.set_values(array)
+            element_log.record_all(self.get_nodes(), Change.STATE)
+            array = self._buffer.values()
+            self._set_node_metrics(array)
+        else:
+            vector_list: tp.List[float] = array.tolist()
+            index: int = 0
+            for node in self.get_nodes():
+                dim: int = node.dim()
+                segment: tp.List[float] = vector_list[index: index + dim]
+                assert len(segment) == dim
+                node.set_from_vector(VectorFactory.from_list(segment))
+                index += dim
+            assert index == len(vector_list)
+
+        # metrics of edges in batch, of which the evaluator holds the current measurements
+        evaluator: BatchEvaluator = self.get_evaluator()
+        rpe2s: tp.Dict[int, tp.Tuple[float, float]] = self._rpe2s_of_edges(array)
+        for group, errors in zip(evaluator.get_groups(), evaluator.error_vectors(array)):
+            vector_type: tp.Type['SubSizeVector'] = VectorFactory.from_dim(group.dim())
+            error_vectors: tp.List['SubSizeVector'] = vector_type.from_arrays(errors.reshape((-1, group.dim(), 1)))
+            for edge, error_vector in zip(group.get_edges(), error_vectors):
+                edge.set_metrics(error_vector, rpe2s.get(id(edge)))
+
+    def _set_node_metrics(self, vector: np.ndarray) -> None:
+        """ Sets the metrics of the nodes with truth, of SE2 nodes in batch from the (flat) graph vector. """
+        nodes: tp.List[SubSpatialNode] = [node for node in self._spatial_nodes.values() if node.has_truth()]
+        se2_nodes: tp.List[SubSpatialNode] = [node for node in nodes if issubclass(node.data_type(), DataSE2)]
+        if se2_nodes:
+            estimates: SE2Array = SE2Array.gather(self, [node.get_id() for node in se2_nodes], vector)
+            truths: SE2Array = SE2Array(np.array([node.get_truth().to_list() for node in se2_nodes]))
+            ate2s: tp.List[float] = np.sum((estimates.translations() - truths.translations()) ** 2, axis=1).tolist()
+            for node, ate2 in zip(se2_nodes, ate2s):
+                node.set_metrics(ate2)
+        for node in nodes:
+            if not issubclass(node.data_type(), DataSE2):
+                node.set_metrics()
+
+    def _rpe2s_of_edges(self, vector: np.ndarray) -> tp.Dict[int, tp.Tuple[float, float]]:
+        """
+        Returns the squared translation and rotation errors of the SE2 odometry edges with truth, by the ids of the
+        edges, evaluated in batch from the (flat) graph vector.
+        """
+        edges: tp.List[SubEdge] = [edge for edge in self._edges if edge.has_truth() and self._is_odometry(edge)]
+        if not edges:
+            return {}
+        nodes: tp.List[tp.List[SubSpatialNode]] = [edge.get_spatial_nodes() for edge in edges]
+        truth_nodes: tp.List[tp.List[SubSpatialNode]] = [edge.get_truth().get_spatial_nodes() for edge in edges]
+        deltas: SE2Array = SE2Array.gather(self, [nodes_[1].get_id() for nodes_ in nodes], vector) - \
+            SE2Array.gather(self, [nodes_[0].get_id() for nodes_ in nodes], vector)
+        truth_deltas: SE2Array = SE2Array(np.array([nodes_[1].to_list() for nodes_ in truth_nodes])) - \
+            SE2Array(np.array([nodes_[0].to_list() for nodes_ in truth_nodes]))
+        rpet2s: tp.List[float] = np.sum((deltas.translations() - truth_deltas.translations()) ** 2, axis=1).tolist()
+        rper2s: tp.List[float] = (SE2.wrap_angles(deltas.angles() - truth_deltas.angles()) ** 2).tolist()
+        return {id(edge): rpe2 for edge, rpe2 in zip(edges, zip(rpet2s, rper2s))}
+
+    @staticmethod
+    def _is_odometry(edge: SubEdge) -> bool:
+        return issubclass(edge.data_type(), DataSE2) and len(edge.get_spatial_nodes()) == 2
 
     # timestep
     def timestep(self) -> tp.Optional[int]:
@@ -955,42 +1445,35 @@ class Graph(NodeContainer):
         return graphs[::-1]
 
     def find_subgraphs(self) -> tp.List[SubGraph]:
+        """ Sets the previous subgraphs, as views of the nodes and edges of this graph in the order of its edges. """
         assert not self.has_previous()
-        graph: SubGraph = self.__class__()
+        edges: tp.List[SubEdge] = self.get_edges()
         subgraphs: tp.List[SubGraph] = []
 
-        # initialise an empty node-set and edge-iterator
-        node_set: tp.Set[SubGraph] = set()
-        edge_iter: iter = iter(self.get_edges())
-        edge: tp.Optional[SubEdge] = next(edge_iter)
-
-        is_completed: bool = False
-        while not is_completed:
-            # add nodes connected to current edge to node-set
-            edges_to_add: tp.List[SubEdge] = []
-            node_set.update(edge.get_spatial_nodes())
-
-            # find all edges contained in the current node-set
-            is_contained = True
-            while is_contained:
-                edges_to_add.append(edge)
-                edge = next(edge_iter, None)
-                if edge is not None:
-                    is_contained = (set(edge.get_spatial_nodes()) <= node_set)
-                else:
-                    is_completed = True
-                    is_contained = False
-
-            # copy graph
-            if not is_completed:
-                timestep: int = len(subgraphs)
-                for edge_to_add in edges_to_add:
-                    for node in edge_to_add.get_nodes():
-                        if not graph.contains_node_id(node.get_id()):
-                            node.set_timestep(timestep)
-                            graph.add_node(node)
-                    graph.add_edge(edge_to_add)
-                subgraphs.append(copy.copy(graph))
+        # nodes in the order they are connected by edges, shared by all views
+        node_order: tp.List[SubNode] = []
+        node_ids: tp.Set[int] = set()
+        node_set: tp.Set[SubNode] = set()
+
+        index: int = 0
+        while index < len(edges):
+            # add nodes connected to current edge to node-set, and find all edges contained in the current node-set
+            node_set.update(edges[index].get_spatial_nodes())
+            end: int = index + 1
+            while end < len(edges) and set(edges[end].get_spatial_nodes()) <= node_set:
+                end += 1
+            if end == len(edges):
+                break
+
+            timestep: int = len(subgraphs)
+            for edge in edges[index:end]:
+                for node in edge.get_nodes():
+                    if node.get_id() not in node_ids:
+                        node.set_timestep(timestep)
+                        node_ids.add(node.get_id())
+                        node_order.append(node)
+            subgraphs.append(GraphView(self, node_order, len(node_order), end))
+            index = end
         subgraphs.append(self)
 
         # store subgraphs
@@ -1021,57 +1504,124 @@ class Graph(NodeContainer):
     def is_consistent(self) -> bool:
         return bool(np.isclose(self.cost(), 0., atol=self._atol))
 
-    def cost(self) -> float:
-        error: float = 0.
-        for edge in self.get_edges():
-            error += edge.cost()
-        return error
-
-    def ate(self) -> float:
-        te2: float = 0
-        nodes: tp.List[SubSpatialNode] = self.get_spatial_nodes()
-        if len(nodes) == 0:
+    def _sync_metrics(self) -> None:
+        """ Brings the running metric sums up to date with the changes recorded in the element log. """
+        if self._metric_sums is None:
+            return
+        head: int = element_log.head()
+        entries: tp.Optional[tp.List[Entry]] = element_log.since(self._metric_position, Change.METRICS, head)
+        num_elements: int = len(self._spatial_nodes) + len(self._edges)
+        if entries is None or len(entries) > num_elements // 2:
+            # too many changes: sum from scratch
+            self._metric_sums = None
+            self._get_metric_sums()
+            return
+        for element, delta in entries:
+            if self._contains_element(element):
+                self._metric_sums += delta
+        self._metric_position = head
+
+    def _get_metric_sums(self) -> np.ndarray:
+        if self._metric_sums is None:
+            sums: np.ndarray = np.zeros(4)
+            for node in self._spatial_nodes.values():
+                sums += node.metric_terms()
+            for edge in self._edges:
+                sums += edge.metric_terms()
+            self._metric_sums = sums
+            self._metric_position = element_log.head()
+        else:
+            self._sync_metrics()
+        return self._metric_sums
+
+    def _contains_element(self, element: SubNodeEdge) -> bool:
+        if isinstance(element, Edge):
+            return id(element) in self._edge_keys
+        return self._nodes.get(element.get_id()) is element
+
+    def cost(self, is_batched: bool = False) -> float:
+        if is_batched:
+            return self.get_evaluator().cost(self.to_vector().array().flatten())
+        return float(self._get_metric_sums()[0])
+
+    def costs(self) -> np.ndarray:
+        """ Returns the cost of each edge, evaluated in batch from the current node values. """
+        return self.get_evaluator().costs(self.to_vector().array().flatten())
+
+    def get_evaluator(self) -> BatchEvaluator:
+        self._sync_index()
+        if self._evaluator is not None and not self._evaluator.sync():
+            self._evaluator = None
+        if self._evaluator is None:
+            self._evaluator = BatchEvaluator(self)
+        return self._evaluator
+
+    def ate(self, is_batched: bool = False) -> float:
+        num_nodes: int = len(self._spatial_nodes)
+        if num_nodes == 0:
             return 0.
-        node: SubNode
-        for node in nodes:
-            node_ate2 = node.ate2()
-            if node_ate2 is not None:
-                te2 += node_ate2
-        ate: float = np.sqrt(te2 / len(nodes))
+        if is_batched:
+            return float(np.sqrt(np.sum(self._ate2_array()) / num_nodes))
+        ate: float = np.sqrt(self._get_metric_sums()[1] / num_nodes)
         return ate
 
-    def rpe_translation(self) -> float:
-        rpe2: float = 0
-        edges: tp.List[SubEdge] = self.get_edges()
-        if len(edges) == 0:
+    def rpe_translation(self, is_batched: bool = False) -> float:
+        num_edges: int = len(self._edges)
+        if num_edges == 0:
             return 0.
-        edge: SubEdge
-        for edge in edges:
-            edge_rpe2 = edge.rpe_translation2()
-            if edge_rpe2 is not None:
-                rpe2 += edge_rpe2
-        rpe_translation: float = np.sqrt(rpe2 / len(edges))
+        if is_batched:
+            return float(np.sqrt(np.sum(self._rpe2_arrays()[0]) / num_edges))
+        rpe_translation: float = np.sqrt(self._get_metric_sums()[2] / num_edges)
         return rpe_translation
 
-    def rpe_rotation(self) -> float:
-        rpe: float = 0
-        edges: tp.List[SubEdge] = self.get_edges()
-        if len(edges) == 0:
+    def rpe_rotation(self, is_batched: bool = False) -> float:
+        num_edges: int = len(self._edges)
+        if num_edges == 0:
             return 0.
-        edge: SubEdge
-        for edge in edges:
-            edge_rpe2 = edge.rpe_rotation2()
-            if edge_rpe2 is not None:
-                rpe += edge_rpe2
-        rpe_rotation: float = rpe / len(edges)
+        if is_batched:
+            return float(np.sum(self._rpe2_arrays()[1]) / num_edges)
+        rpe_rotation: float = self._get_metric_sums()[3] / num_edges
         return rpe_rotation
 
+    def _ate2_array(self) -> np.ndarray:
+        """ Returns the squared translation errors of the SE2 nodes, evaluated in batch against the truth. """
+        ids: tp.List[int] = [
+            node.get_id() for node in self._spatial_nodes.values() if issubclass(node.data_type(), DataSE2)
+        ]
+        estimates: SE2Array = SE2Array.gather(self, ids)
+        truths: SE2Array = SE2Array.gather(self.get_truth(), ids)
+        return np.sum((estimates.translations() - truths.translations()) ** 2, axis=1)
+
+    def _rpe2_arrays(self) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ Returns the squared translation and rotation errors of the SE2 odometry edges, evaluated in batch. """
+        ids_a: tp.List[int] = []
+        ids_b: tp.List[int] = []
+        for edge in self._edges:
+            if self._is_odometry(edge):
+                ids_a.append(edge.get_spatial_nodes()[0].get_id())
+                ids_b.append(edge.get_spatial_nodes()[1].get_id())
+        vector: np.ndarray = self.to_vector().array().flatten()
+        truth: SubGraph = self.get_truth()
+        truth_vector: np.ndarray = truth.to_vector().array().flatten()
+        deltas: SE2Array = SE2Array.gather(self, ids_b, vector) - SE2Array.gather(self, ids_a, vector)
+        truth_deltas: SE2Array = SE2Array.gather(truth, ids_b, truth_vector) - SE2Array.gather(truth, ids_a, truth_vector)
+        rpet2: np.ndarray = np.sum((deltas.translations() - truth_deltas.translations()) ** 2, axis=1)
+        rper2: np.ndarray = SE2.wrap_angles(deltas.angles() - truth_deltas.angles()) ** 2
+        return rpet2, rper2
+
     # clear
     def clear(self) -> None:
         super().clear()
         self._by_name = {}
         self._by_type = {}
         self._edges = []
+        self._evaluator = None
+        self._buffer.clear()
+        self._edges_by_ids = {}
+        self._adjacency = {}
+        self._edge_keys = {}
+        self._metric_sums = None
+        self._reset_snapshots()
 
     # copy
     def is_similar(self, graph: SubGraph) -> bool:
@@ -1113,11 +1663,22 @@ class Graph(NodeContainer):
         new._previous = None  # not copied
         new._truth = None  # not copied
         new._atol = self._atol  # passed by value
+        new._evaluator = None  # not copied
+        new._buffer = StateBuffer()  # not copied: the nodes are shared
+        new._edges_by_ids = copy.copy(self._edges_by_ids)  # passed by reference -> copy
+        new._adjacency = {id_: copy.copy(edges) for (id_, edges) in self._adjacency.items()}  # passed by reference -> copy
+        new._edge_keys = copy.copy(self._edge_keys)  # passed by reference -> copy
+        new._topology_position = self._topology_position  # passed by value
+        new._metric_sums = copy.copy(self._metric_sums)  # passed by reference -> copy
+        new._metric_position = self._metric_position  # passed by value
+        new._reset_snapshots()  # not copied
         return new
 
     def __deepcopy__(self, memo: tp.Optional[tp.Dict[int, tp.Any]] = None) -> SubEdge:
         if memo is None:
             memo = {}
+        # before the nodes, of which the copies are views of the copied buffer
+        buffer: StateBuffer = copy.deepcopy(self._buffer, memo)
         new = super().__deepcopy__(memo)
         memo[id(self)] = new
 
@@ -1130,4 +1691,202 @@ class Graph(NodeContainer):
         new._previous = None  # not copied
         new._truth = None  # not copied
         new._atol = self._atol  # passed by value
+        new._evaluator = None  # not copied
+        new._buffer = buffer  # passed by reference -> copy
+        new._index_edges()  # new edges
+        self._sync_metrics()
+        new._metric_sums = copy.copy(self._metric_sums)  # passed by reference -> copy
+        new._metric_position = element_log.head()  # up to date for the new elements
+        new._reset_snapshots()  # not copied
         return new
+
+    # pickle
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        state: tp.Dict[str, tp.Any] = self.__dict__.copy()
+        state['_edges_by_ids'] = None  # rebuilt on load
+        state['_adjacency'] = None  # rebuilt on load
+        state['_edge_keys'] = None  # object ids are not persistent
+        state['_evaluator'] = None  # rebuilt on demand
+        state['_metric_sums'] = None  # positions in the element log are not persistent
+        state['_last_snapshot'] = None  # the next snapshot copies all elements
+        state['_snapshot_nodes'] = None  # rebuilt by the next snapshot
+        state['_snapshot_edges'] = None  # object ids are not persistent
+        return state
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__dict__.update(state)
+        if '_buffer' not in state:
+            # graphs pickled before their nodes were buffered keep the values in their nodes
+            self._buffer = StateBuffer()
+        self._evaluator = None
+        self._metric_sums = state.get('_metric_sums')
+        self._metric_position = state.get('_metric_position', 0)
+
+        self._index_edges()
+        self._reset_snapshots()
+
+
+class GraphView(Graph):
+    """ The first nodes and edges of a graph, of which the containers are only created when first accessed. """
+
+    _graph: Graph
+    _node_order: tp.List[SubNode]
+    _num_nodes: int
+    _num_edges: int
+
+    def __init__(
+            self,
+            graph: Graph,
+            node_order: tp.List[SubNode],
+            num_nodes: int,
+            num_edges: int
+    ):
+        # no containers: see _materialise
+        self._name = type(graph).__name__
+        self._previous = None
+        self._truth = None
+        self._graph = graph
+        self._node_order = node_order
+        self._num_nodes = num_nodes
+        self._num_edges = num_edges
+
+    def __getattr__(self, name: str) -> tp.Any:
+        # only called for attributes that are not set, i.e. the containers of a view that is not materialised
+        if name.startswith('__') or '_graph' not in self.__dict__ or self.is_materialised():
+            raise AttributeError(name)
+        self._materialise()
+        return getattr(self, name)
+
+    def is_materialised(self) -> bool:
+        return '_nodes' in self.__dict__
+
+    def _is_buffered(self) -> bool:
+        return self.is_materialised() and super()._is_buffered()
+
+    def _materialise(self) -> None:
+        previous: tp.Optional[SubGraph] = self._previous
+        truth: tp.Optional[SubGraph] = self._truth
+        Graph.__init__(self, name=self._name)
+        self._previous = previous
+        self._truth = truth
+        for node in self._node_order[:self._num_nodes]:
+            self.add_node(node)
+        for edge in self._graph.get_edges()[:self._num_edges]:
+            self.add_edge(edge)
+
+    # elements
+    def get_nodes(self) -> tp.List[SubNode]:
+        if self.is_materialised():
+            return super().get_nodes()
+        return self._node_order[:self._num_nodes]
+
+    def get_edges(self) -> tp.List[SubEdge]:
+        if self.is_materialised():
+            return super().get_edges()
+        return self._graph.get_edges()[:self._num_edges]
+
+    # pickle
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        if self.is_materialised():
+            return super().__getstate__()
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        if '_nodes' in state:
+            super().__setstate__(state)
+        else:
+            # the graph may not be restored yet
+            self.__dict__.update(state)
+
+
+class GraphSnapshot(Graph):
+    """
+    A graph at the time of a snapshot, which holds the copies of elements that changed since the previous snapshot.
+    Its containers are only created when first accessed, from those of the previous snapshot.
+    """
+
+    _previous_snapshot: tp.Optional['GraphSnapshot']
+    _node_copies: tp.Dict[int, SubNode]  # node id -> copy
+    _edge_copies: tp.Dict[int, SubEdge]  # edge position -> copy
+    _num_edges: int
+
+    def __init__(
+            self,
+            graph: Graph,
+            previous_snapshot: tp.Optional['GraphSnapshot'],
+            node_copies: tp.Dict[int, SubNode],
+            edge_copies: tp.Dict[int, SubEdge],
+            num_edges: int,
+            metric_sums: np.ndarray
+    ):
+        # no containers: see _materialise
+        self._name = graph.get_name()
+        self._previous = None
+        self._truth = graph._truth
+        self._atol = graph._atol
+        self._metric_sums = metric_sums.copy()
+        self._previous_snapshot = previous_snapshot
+        self._node_copies = node_copies
+        self._edge_copies = edge_copies
+        self._num_edges = num_edges
+
+    def __getattr__(self, name: str) -> tp.Any:
+        # only called for attributes that are not set, i.e. the containers of a snapshot that is not materialised
+        if name.startswith('__') or '_node_copies' not in self.__dict__ or self.is_materialised():
+            raise AttributeError(name)
+        self._materialise()
+        return getattr(self, name)
+
+    def is_materialised(self) -> bool:
+        return '_nodes' in self.__dict__
+
+    def _is_buffered(self) -> bool:
+        return self.is_materialised() and super()._is_buffered()
+
+    def _materialise(self) -> None:
+        # previous snapshots first, without recursion
+        snapshots: tp.List['GraphSnapshot'] = [self]
+        while snapshots[-1]._previous_snapshot is not None and not snapshots[-1]._previous_snapshot.is_materialised():
+            snapshots.append(snapshots[-1]._previous_snapshot)
+        for snapshot in reversed(snapshots):
+            snapshot._build()
+
+    def _build(self) -> None:
+        nodes: tp.Dict[int, SubNode] = {}
+        edges: tp.List[tp.Optional[SubEdge]] = []
+        if self._previous_snapshot is not None:
+            nodes.update(self._previous_snapshot._nodes)
+            edges += self._previous_snapshot._edges
+        nodes.update(self._node_copies)
+        edges += [None] * (self._num_edges - len(edges))
+        for position, edge in self._edge_copies.items():
+            edges[position] = edge
+
+        previous: tp.Optional[SubGraph] = self._previous
+        truth: tp.Optional[SubGraph] = self._truth
+        metric_sums: np.ndarray = self._metric_sums
+        Graph.__init__(self, name=self._name)
+        self._previous = previous
+        self._truth = truth
+        self.add_nodes(list(nodes.values()))
+        self.add_edges(edges)
+
+        # the copies hold the metrics of the snapshot
+        self._metric_sums = metric_sums
+        self._metric_position = element_log.head()
+        self._previous_snapshot = None
+        self._node_copies = {}
+        self._edge_copies = {}
+
+    # pickle
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        if self.is_materialised():
+            return super().__getstate__()
+        return self.__dict__.copy()
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        if '_nodes' in state:
+            super().__setstate__(state)
+        else:
+            # the previous snapshot may not be restored yet
+            self.__dict__.update(state)
@@ -1,18 +1,39 @@
+import json
 import pathlib
 import typing as tp
 from datetime import datetime
 
+import numpy as np
 from src.definitions import get_project_root
-from src.framework.graph.Graph import Node, Edge, Graph
+from src.framework.graph.BatchEvaluator import EdgeGroup
+from src.framework.graph.Graph import Node, SpatialNode, ParameterNode, Edge, Graph
+from src.framework.graph.data.Parser import Parser
 from src.framework.graph.database import database
+from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification, ParameterDict
+from src.framework.math.matrix.square import SquareFactory
+from src.framework.math.matrix.vector import VectorFactory
 
 if tp.TYPE_CHECKING:
-    from src.framework.graph.Graph import SubNode, SubEdge, SubGraph
+    from src.framework.graph.Graph import SubNode, SubEdge, SubNodeEdge, SubGraph
+    from src.framework.math.matrix.vector.Vector import SubSizeVector
 
 
 class GraphParser(object):
     _database = database
 
+    # binary format: a folder of typed columns (npy-files) and a header, of which the columns are memory-mapped
+    _binary_suffix: str = '.graph'
+    _binary_version: int = 2
+    _binary_header: str = 'header.json'
+
+    @classmethod
+    def binary_suffix(cls) -> str:
+        return cls._binary_suffix
+
+    @classmethod
+    def is_binary(cls, file: pathlib.Path) -> bool:
+        return file.suffix == cls._binary_suffix
+
     @classmethod
     def save(
             cls,
@@ -24,23 +45,142 @@ class GraphParser(object):
             print(f"framework/GraphParser: Saving '{graph.identifier_class_unique()}' to:\n    '{file}'")
         # graph.set_path(file)
 
-        writer: tp.TextIO = file.open('w')
+        if cls.is_binary(file):
+            cls.save_binary(graph, file)
+            return
+
+        lines: tp.List[str] = cls.format_lines(graph.get_nodes(), graph.get_edges())
+        with file.open('w') as writer:
+            writer.write(''.join([f'{line}\n' for line in lines]))
+
+    @classmethod
+    def save_binary(
+            cls,
+            graph: 'SubGraph',
+            folder: pathlib.Path
+    ) -> None:
+        nodes: tp.List['SubNode'] = graph.get_nodes()
+        edges: tp.List['SubEdge'] = graph.get_edges()
+
+        # tags as indices
+        tags: tp.List[str] = []
+        element_tags: tp.List[int] = []
+        for element in graph.get_elements():
+            tag: str = cls._database.from_element(element)
+            if tag not in tags:
+                tags.append(tag)
+            element_tags.append(tags.index(tag))
+        specifications: tp.List[str] = [ParameterDict.from_specification(specification) for specification in ParameterSpecification]
+
+        # nodes
+        node_width: int = cls._max_dim(nodes)
+        node_values: tp.List[tp.List[float]] = []
+        node_specifications: tp.List[int] = []
+        node_indices: tp.List[int] = []
+        for node in nodes:
+            values: tp.List[float] = node.data().to_list()
+            node_values.append(values + [0.] * (node_width - len(values)))
+            if isinstance(node, ParameterNode):
+                node_specifications.append(specifications.index(ParameterDict.from_specification(node.get_specification())))
+                node_indices.append(node.index())
+            else:
+                node_specifications.append(-1)
+                node_indices.append(0)
+
+        # edges, of which the (mostly equal) info matrices are stored once
+        edge_width: int = cls._max_dim(edges)
+        info_width: int = (edge_width * (edge_width + 1)) // 2
+        edge_measurements: tp.List[tp.List[float]] = []
+        edge_information: tp.List[tp.List[float]] = []
+        for edge in edges:
+            values: tp.List[float] = edge.data().to_list()
+            edge_measurements.append(values + [0.] * (edge_width - len(values)))
+            upper: tp.List[float] = edge.get_info_matrix().array()[Parser.upper_indices(edge.dim())].tolist()
+            edge_information.append(upper + [0.] * (info_width - len(upper)))
+        information, information_indices = np.unique(
+            np.array(edge_information, dtype=float).reshape((len(edges), info_width)), axis=0, return_inverse=True
+        )
+
+        columns: tp.Dict[str, np.ndarray] = {
+            'node_ids': cls._compact([node.get_id() for node in nodes]),
+            'node_tags': cls._compact(element_tags[: len(nodes)]),
+            'node_values': np.array(node_values, dtype=float).reshape((len(nodes), node_width)),
+            'node_fixed': np.array([node.is_fixed() for node in nodes], dtype=bool),
+            'node_timesteps': cls._compact([node.get_timestep() for node in nodes]),
+            'node_specifications': cls._compact(node_specifications),
+            'node_indices': cls._compact(node_indices),
+            'edge_tags': cls._compact(element_tags[len(nodes):]),
+            'edge_node_ids': cls._compact([id_ for edge in edges for id_ in edge.get_node_ids()]),
+            'edge_measurements': np.array(edge_measurements, dtype=float).reshape((len(edges), edge_width)),
+            'edge_information': information,
+            'edge_information_indices': cls._compact(information_indices.reshape(-1))
+        }
+        folder.mkdir(parents=True, exist_ok=True)
+        for name, column in columns.items():
+            np.save(folder / f'{name}.npy', column)
+
+        # header last, such that an incomplete folder cannot be opened
+        header: tp.Dict[str, tp.Any] = {
+            'version': cls._binary_version,
+            'tags': tags,
+            'specifications': specifications
+        }
+        (folder / cls._binary_header).write_text(json.dumps(header))
+
+    @staticmethod
+    def _compact(integers: tp.Union[tp.List[int], np.ndarray]) -> np.ndarray:
+        """ Returns integers in the smallest type that holds them. """
+        array: np.ndarray = np.asarray(integers, dtype=np.int64)
+        if not array.size:
+            return array.astype(np.int8)
+        return array.astype(np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max())))
 
-        node: 'SubNode'
-        for node in graph.get_nodes():
-            tag: str = cls._database.from_element(node)
-            id_: str = f'{node.get_id()}'
-            data: str = ' '.join(node.write())
-            writer.write(f'{tag} {id_} {data}\n')
+    @staticmethod
+    def _max_dim(elements: tp.List['SubNodeEdge']) -> int:
+        return max([element.dim() for element in elements], default=0)
+
+    @classmethod
+    def format_lines(
+            cls,
+            nodes: tp.List['SubNode'],
+            edges: tp.List['SubEdge']
+    ) -> tp.List[str]:
+        """ Returns the g2o-lines of nodes, followed by FIX-lines of fixed nodes, and edges. """
+        lines: tp.List[str] = []
+        for node, line in zip(nodes, cls.format_elements(nodes)):
+            lines.append(line)
             if node.is_fixed():
-                writer.write(f'FIX {id_}\n')
+                lines.append(f'FIX {node.get_id()}')
+        return lines + cls.format_elements(edges)
 
-        edge: 'SubEdge'
-        for edge in graph.get_edges():
-            tag: str = cls._database.from_element(edge)
-            ids: str = ' '.join([f'{id_}' for id_ in edge.get_node_ids()])
-            data: str = ' '.join(edge.write())
-            writer.write(f'{tag} {ids} {data}\n')
+    @classmethod
+    def format_elements(cls, elements: tp.List['SubNodeEdge']) -> tp.List[str]:
+        """ Returns the g2o-lines of elements, formatting the values of elements with equal tags together. """
+        lines: tp.List[tp.Optional[str]] = [None] * len(elements)
+        groups: tp.Dict[str, tp.List[int]] = {}
+        for i, element in enumerate(elements):
+            tag: str = cls._database.from_element(element)
+            if isinstance(element, Node) and not isinstance(element, SpatialNode):
+                # parameter nodes contain words
+                lines[i] = ' '.join([tag, f'{element.get_id()}'] + element.write())
+                continue
+            if tag not in groups:
+                groups[tag] = []
+            groups[tag].append(i)
+
+        for tag, indices in groups.items():
+            group: tp.List['SubNodeEdge'] = [elements[i] for i in indices]
+            values: np.ndarray = np.array([element.data().to_list() for element in group])
+            if isinstance(group[0], Edge):
+                ids: tp.List[str] = [' '.join([f'{id_}' for id_ in edge.get_node_ids()]) for edge in group]
+                info_matrices: np.ndarray = np.array([edge.get_info_matrix().array() for edge in group])
+                rows, columns = Parser.upper_indices(info_matrices.shape[1])
+                values = np.hstack((values, info_matrices[:, rows, columns]))
+            else:
+                ids = [f'{node.get_id()}' for node in group]
+            for i, id_, words in zip(indices, ids, Parser.array_to_lines(values)):
+                lines[i] = f'{tag} {id_} {words}'
+        return lines
 
     @classmethod
     def save_path_folder(
@@ -82,7 +222,10 @@ class GraphParser(object):
     ) -> 'SubGraph':
         nodes: tp.Dict[int, 'SubNode']
         edges: tp.List['SubEdge']
-        nodes, edges = cls.read_graph(file, should_print=should_print)
+        if cls.is_binary(file):
+            nodes, edges = cls.read_binary(file, should_print=should_print)
+        else:
+            nodes, edges = cls.read_graph(file, should_print=should_print)
 
         graph: 'SubGraph' = Graph()
         # graph.set_path(file)
@@ -105,19 +248,14 @@ class GraphParser(object):
             nodes_sorted = list(nodes.values())
             edges_sorted = edges
 
-        for node in nodes_sorted:
-            if reference is not None:
-                # copy reference content
-                reference_node = reference.get_node(node.get_id())
-                node = reference_node.copy_attributes_to(node)
-            graph.add_node(node)
-
-        for edge in edges_sorted:
-            if reference is not None:
-                # copy reference content
-                reference_edge = reference.get_edge_from_ids(*(edge.get_node_ids()))
-                edge = reference_edge.copy_attributes_to(edge)
-            graph.add_edge(edge)
+        if reference is not None:
+            # copy reference content
+            for node in nodes_sorted:
+                reference.get_node(node.get_id()).copy_attributes_to(node)
+            for edge in edges_sorted:
+                reference.get_edge_from_ids(*(edge.get_node_ids())).copy_attributes_to(edge)
+        graph.add_nodes(nodes_sorted)
+        graph.add_edges(edges_sorted)
 
         if reference is not None:
             reference.copy_attributes_to(graph)
@@ -132,51 +270,206 @@ class GraphParser(object):
         if should_print:
             print(f"framework/GraphParser: Reading:\n    '{file}'")
 
-        nodes: tp.Dict[int, 'SubNode'] = {}
-        edges: tp.List['SubEdge'] = []
+        lines: tp.List[tp.List[str]] = [line.split() for line in file.read_text().splitlines()]
+        for i, words in enumerate(lines):
+            assert words, f'Line {i} is empty.'
 
-        lines: tp.List[str] = file.open('r').readlines()
-        for i, line in enumerate(lines):
-            # read line
-            assert line != '\n', f'Line {i} is empty.'
-            words: tp.List[str] = line.strip().split()
-
-            # interpret tag
+        # group lines by tag, in order of appearance
+        groups: tp.Dict[str, tp.List[int]] = {}
+        for i, words in enumerate(lines):
             tag: str = words[0]
+            if tag not in groups:
+                groups[tag] = []
+            groups[tag].append(i)
+
+        # nodes
+        read_nodes: tp.Dict[int, 'SubNode'] = {}
+        vectors: tp.Dict[int, np.ndarray] = {}
+        edge_tags: tp.List[tp.Tuple[str, tp.Type['SubEdge'], int]] = []
+        for tag, indices in groups.items():
             if tag == 'FIX':
-                id_: int = int(words[1])
-                assert id_ in nodes
-                node: 'SubNode' = nodes[id_]
-                node.fix()
-            else:
-                element_type, count = cls._database.from_tag(tag)
-
-                words = words[1:]
-                if issubclass(element_type, Node):
-                    assert count == 0
-
-                    # read node
-                    id_: int = int(words[0])
-                    node: 'SubNode' = element_type(None, id_=id_)
-                    words = words[1:]
-                    assert not node.read(words)
-
-                    # add node
-                    assert id_ not in nodes
-                    nodes[id_] = node
-
-                elif issubclass(element_type, Edge):
-                    assert count > 0
-                    edge: SubEdge = element_type(None)
-
-                    # read edge
-                    node_ids: tp.List[int] = [int(id_) for id_ in words[: count]]
-                    for id_ in node_ids:
-                        assert id_ in nodes
-                        node: 'SubNode' = nodes[id_]
-                        edge.add_node(node)
-                    assert not edge.read(words[count:])
-
-                    # add edge
-                    edges.append(edge)
+                continue
+            element_type, count = cls._database.from_tag(tag)
+            if issubclass(element_type, Edge):
+                assert count > 0
+                edge_tags.append((tag, element_type, count))
+                continue
+            assert issubclass(element_type, Node) and count == 0
+
+            array: tp.Optional[np.ndarray] = None
+            if issubclass(element_type, SpatialNode):
+                # values as numeric columns at once, parameter nodes contain words
+                array = Parser.words_to_array([word for i in indices for word in lines[i][2:]], element_type.dim())
+            for k, i in enumerate(indices):
+                id_: int = int(lines[i][1])
+                node: 'SubNode' = element_type(None, id_=id_)
+                assert not node.read(lines[i][2:])
+                vectors[id_] = node.to_vector().array().flatten() if array is None else array[k]
+                read_nodes[i] = node
+
+        nodes: tp.Dict[int, 'SubNode'] = {}
+        for i in sorted(read_nodes):
+            node: 'SubNode' = read_nodes[i]
+            assert node.get_id() not in nodes
+            nodes[node.get_id()] = node
+
+        for i in groups.get('FIX', []):
+            id_: int = int(lines[i][1])
+            assert id_ in nodes
+            nodes[id_].fix()
+
+        # edges
+        read_edges: tp.Dict[int, 'SubEdge'] = {}
+        for tag, element_type, count in edge_tags:
+            indices: tp.List[int] = groups[tag]
+            dim: int = element_type.dim()
+            info_dim: int = (dim * (dim + 1)) // 2
+            measurements: np.ndarray = Parser.words_to_array(
+                [word for i in indices for word in lines[i][1 + count:]], dim + info_dim
+            )[:, :dim]
+
+            edges: tp.List['SubEdge'] = []
+            for i in indices:
+                edge: 'SubEdge' = element_type(None)
+                for word in lines[i][1: 1 + count]:
+                    id_: int = int(word)
+                    assert id_ in nodes
+                    edge.add_node(nodes[id_])
+                edges.append(edge)
+
+            # evaluate error vectors at once, then read
+            vector_type: tp.Type['SubSizeVector'] = VectorFactory.from_dim(dim)
+            errors: np.ndarray = cls._evaluate_errors(edges, vectors, measurements)
+            for i, edge, error in zip(indices, edges, errors):
+                assert not edge.read(lines[i][1 + count:], error_vector=vector_type(error))
+                read_edges[i] = edge
+
+        edges: tp.List['SubEdge'] = [read_edges[i] for i in sorted(read_edges)]
         return nodes, edges
+
+    @classmethod
+    def open_binary(cls, folder: pathlib.Path) -> tp.Tuple[tp.Dict[str, tp.Any], tp.Dict[str, np.ndarray]]:
+        """ Returns the header and the (memory-mapped) columns of a binary graph folder. """
+        assert cls.is_binary(folder), f"'{folder}' is not a binary graph folder."
+        assert (folder / cls._binary_header).is_file(), f"'{folder}' has no header."
+        header: tp.Dict[str, tp.Any] = json.loads((folder / cls._binary_header).read_text())
+        assert header['version'] == cls._binary_version, f"'{folder}' has an unsupported version."
+        columns: tp.Dict[str, np.ndarray] = {file.stem: np.load(file, mmap_mode='r') for file in folder.glob('*.npy')}
+        return header, columns
+
+    @classmethod
+    def read_binary(
+            cls,
+            folder: pathlib.Path,
+            should_print: bool = True
+    ) -> tp.Tuple[tp.Dict[int, 'SubNode'], tp.List['SubEdge']]:
+        """ Reads the nodes and edges, which are constructed per tag at once. """
+        if should_print:
+            print(f"framework/GraphParser: Reading:\n    '{folder}'")
+
+        header, columns = cls.open_binary(folder)
+        element_types: tp.List[tp.Tuple[tp.Type['SubNodeEdge'], int]] = [
+            cls._database.from_tag(tag) for tag in header['tags']
+        ]
+        specifications: tp.List['ParameterSpecification'] = [
+            ParameterDict.from_string(string) for string in header['specifications']
+        ]
+
+        # nodes
+        node_ids: np.ndarray = np.asarray(columns['node_ids'])
+        node_tags: np.ndarray = np.asarray(columns['node_tags'])
+        node_values: np.ndarray = np.asarray(columns['node_values'])
+        node_fixed: np.ndarray = np.asarray(columns['node_fixed'])
+        node_timesteps: np.ndarray = np.asarray(columns['node_timesteps'])
+        read_nodes: tp.List[tp.Optional['SubNode']] = [None] * len(node_ids)
+        for tag in np.unique(node_tags).tolist():
+            element_type, count = element_types[tag]
+            assert issubclass(element_type, Node) and count == 0
+            rows: np.ndarray = np.flatnonzero(node_tags == tag)
+            dim: int = element_type.dim()
+            if issubclass(element_type, ParameterNode):
+                # parameter nodes differ in their specifications
+                for i in rows.tolist():
+                    node: 'SubNode' = element_type(
+                        None, specification=specifications[int(columns['node_specifications'][i])],
+                        id_=int(node_ids[i]), index=int(columns['node_indices'][i])
+                    )
+                    node.set_from_list(node_values[i, : dim].tolist())
+                    node.set_timestep(int(node_timesteps[i]))
+                    node.fix(bool(node_fixed[i]))
+                    read_nodes[i] = node
+                continue
+            group: tp.List['SubNode'] = element_type(None).replicate(
+                element_type.data_type().values_from_array(node_values[rows, : dim]),
+                node_ids[rows].tolist(), node_timesteps[rows].tolist(), node_fixed[rows].tolist()
+            )
+            for i, node in zip(rows.tolist(), group):
+                read_nodes[i] = node
+
+        nodes: tp.Dict[int, 'SubNode'] = {}
+        vectors: tp.Dict[int, np.ndarray] = {}
+        for i, node in enumerate(read_nodes):
+            id_: int = node.get_id()
+            assert id_ not in nodes
+            nodes[id_] = node
+            vectors[id_] = node_values[i, : node.dim()]
+
+        # edges
+        edge_tags: np.ndarray = np.asarray(columns['edge_tags'])
+        counts: np.ndarray = np.array([count for _, count in element_types], dtype=np.int64)[edge_tags]
+        offsets: tp.List[int] = np.concatenate(([0], np.cumsum(counts))).tolist()
+        edge_node_ids: tp.List[int] = columns['edge_node_ids'].tolist()
+        measurements: np.ndarray = np.asarray(columns['edge_measurements'])
+        information: np.ndarray = np.asarray(columns['edge_information'])
+        information_indices: np.ndarray = np.asarray(columns['edge_information_indices'])
+        read_edges: tp.List[tp.Optional['SubEdge']] = [None] * len(edge_tags)
+        for tag in np.unique(edge_tags).tolist():
+            element_type, count = element_types[tag]
+            assert issubclass(element_type, Edge) and count > 0
+            rows: np.ndarray = np.flatnonzero(edge_tags == tag)
+            dim: int = element_type.dim()
+            info_arrays: np.ndarray = Parser.uppers_to_arrays(information, dim)
+            node_lists: tp.List[tp.List['SubNode']] = []
+            for i in rows.tolist():
+                ids: tp.List[int] = edge_node_ids[offsets[i]: offsets[i + 1]]
+                for id_ in ids:
+                    assert id_ in nodes
+                node_lists.append([nodes[id_] for id_ in ids])
+            group: tp.List['SubEdge'] = element_type(None).replicate(
+                node_lists,
+                element_type.data_type().values_from_array(measurements[rows, : dim]),
+                SquareFactory.from_dim(dim).from_arrays(info_arrays[information_indices[rows]])
+            )
+
+            # evaluate error vectors at once
+            errors: np.ndarray = cls._evaluate_errors(group, vectors, measurements[rows, : dim])
+            Edge.set_batch_metrics(group, errors)
+            for i, edge in zip(rows.tolist(), group):
+                read_edges[i] = edge
+        return nodes, read_edges
+
+    @staticmethod
+    def _evaluate_errors(
+            edges: tp.List['SubEdge'],
+            vectors: tp.Dict[int, np.ndarray],
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        """ Returns the error vectors of new edges, evaluated per group of edges with equal configurations. """
+        edge_groups: tp.Dict[tp.Tuple[tp.Any, ...], tp.List[int]] = {}
+        for k, edge in enumerate(edges):
+            key: tp.Tuple[tp.Any, ...] = EdgeGroup.key(edge)
+            if key not in edge_groups:
+                edge_groups[key] = []
+            edge_groups[key].append(k)
+
+        errors: np.ndarray = np.zeros(measurements.shape)
+        for positions in edge_groups.values():
+            group: tp.List['SubEdge'] = [edges[k] for k in positions]
+            dim: int = group[0].dim()
+            values: tp.List[np.ndarray] = [
+                np.array([vectors[edge.get_nodes()[slot].get_id()] for edge in group])
+                for slot in range(len(group[0].get_nodes()))
+            ]
+            estimates: np.ndarray = group[0].estimate_arrays(values)
+            errors[positions, :dim] = group[0].error_arrays(estimates, measurements[positions, :dim])
+        return errors
@@ -38,3 +38,7 @@ class DrawAxis(DrawPoint):
     def draw_point(self) -> Vector3:
         pose = self.draw_pose()
         return pose.translation()
+
+    def draw_planar_pose(self) -> tp.List[float]:
+        """ Returns the pose in the plane, as [x, y, angle]. """
+        return self.draw_pose().to_se2().translation_angle_list()
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.matrix.vector import Vector2
 from src.framework.graph.constraint.EdgeV2 import EdgeV2
 from src.framework.graph.spatial.NodeV2 import NodeV2
@@ -38,7 +39,16 @@ class EdgePosePointV2(EdgeV2):
         spatial_nodes: tp.List['NodeSE2'] = self.get_spatial_nodes()
         a: 'NodeSE2' = spatial_nodes[0]
         b: 'NodeV2' = spatial_nodes[1]
-        return Vector2(b.get_value() - a.get_value().translation())
+        return b.get_value() - a.get_value().translation()
+
+    @classmethod
+    def delta_arrays(cls, values: tp.List[np.ndarray]) -> np.ndarray:
+        return values[1] - values[0][:, :2]
+
+    @classmethod
+    def delta_jacobian_arrays(cls, values: tp.List[np.ndarray]) -> tp.List[np.ndarray]:
+        size: int = len(values[0])
+        return [- np.tile(np.eye(2, 3), (size, 1, 1)), np.tile(np.eye(2), (size, 1, 1))]
 
     # metrics
     def _compute_rpe_translation2(self) -> tp.Optional[float]:
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.lie.transformation import SE2
 from src.framework.math.matrix.vector import Vector2
 from src.framework.graph.constraint.EdgeV2 import EdgeV2
@@ -35,6 +36,14 @@ class EdgePoseV2(EdgeV2):
         node: 'NodeSE2' = self.get_spatial_nodes()[0]
         return node.get_value().translation()
 
+    @classmethod
+    def delta_arrays(cls, values: tp.List[np.ndarray]) -> np.ndarray:
+        return values[0][:, :2]
+
+    @classmethod
+    def delta_jacobian_arrays(cls, values: tp.List[np.ndarray]) -> tp.List[np.ndarray]:
+        return [np.tile(np.eye(2, 3), (len(values[0]), 1, 1))]
+
     # metrics
     def _compute_rpe_translation2(self) -> tp.Optional[float]:
         return None
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.graph.Visualisable import DrawEdge
 from src.framework.graph.constraint.EdgeSE2 import EdgeSE2
 from src.framework.math.lie.transformation import SE2
@@ -43,6 +44,15 @@ class EdgePosesSE2(EdgeSE2, DrawEdge):
         b: 'NodeSE2' = spatial_nodes[1]
         return b.get_value() - a.get_value()
 
+    @classmethod
+    def delta_arrays(cls, values: tp.List[np.ndarray]) -> np.ndarray:
+        return SE2.compose_arrays(SE2.inverse_arrays(values[0]), values[1])
+
+    @classmethod
+    def delta_jacobian_arrays(cls, values: tp.List[np.ndarray]) -> tp.List[np.ndarray]:
+        jacobian_inverse, jacobian_b = SE2.compose_jacobian_arrays(SE2.inverse_arrays(values[0]), values[1])
+        return [jacobian_inverse @ SE2.inverse_jacobian_arrays(values[0]), jacobian_b]
+
     # metrics
     def _compute_rpe_translation2(self) -> tp.Optional[float]:
         assert self.has_truth() and self._is_complete()
@@ -1,6 +1,7 @@
 import typing as tp
 from abc import ABC
 
+import numpy as np
 from src.framework.math.lie.transformation import SE2
 from src.framework.graph.Graph import Edge
 
@@ -26,6 +27,43 @@ class EdgeSE2(Edge[SE2], ABC):
             transformation = parameter.compose_transformation(transformation, is_inverse=True)
         return transformation
 
+    def estimate_arrays(self, values: tp.List[np.ndarray]) -> np.ndarray:
+        cardinality: int = self.cardinality()
+        transformations: np.ndarray = self.delta_arrays(values[:cardinality])
+        for i, parameter in enumerate(self.get_parameter_nodes()):
+            transformations = parameter.compose_transformation_arrays(
+                transformations, values[cardinality + i], is_inverse=True
+            )
+        return transformations
+
+    def estimate_jacobian_arrays(self, values: tp.List[np.ndarray]) -> tp.Tuple[np.ndarray, tp.List[np.ndarray]]:
+        cardinality: int = self.cardinality()
+        transformations: np.ndarray = self.delta_arrays(values[:cardinality])
+        jacobians: tp.List[np.ndarray] = self.delta_jacobian_arrays(values[:cardinality])
+        for i, parameter in enumerate(self.get_parameter_nodes()):
+            transformations, jacobian_transformations, jacobian_parameter = \
+                parameter.compose_transformation_jacobian_arrays(
+                    transformations, values[cardinality + i], is_inverse=True
+                )
+            jacobians = [jacobian_transformations @ jacobian for jacobian in jacobians] + [jacobian_parameter]
+        return transformations, jacobians
+
+    @classmethod
+    def error_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        return SE2.compose_arrays(SE2.inverse_arrays(measurements), estimates)
+
+    @classmethod
+    def error_jacobian_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        return SE2.compose_jacobian_arrays(SE2.inverse_arrays(measurements), estimates)[1]
+
     def _compute_error_vector(self) -> 'Vector3':
         error: SE2 = self.estimate() - self.get_value()
         error_vector: 'Vector3' = error.translation_angle_vector()
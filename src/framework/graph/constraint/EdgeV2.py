@@ -1,5 +1,7 @@
+import typing as tp
 from abc import ABC
 
+import numpy as np
 from src.framework.math.lie.transformation import SE2
 from src.framework.math.matrix.vector import Vector2
 from src.framework.graph.Graph import Edge
@@ -24,5 +26,46 @@ class EdgeV2(Edge[Vector2], ABC):
             transformation = parameter.compose_transformation(transformation, is_inverse=True)
         return transformation.translation()
 
+    def estimate_arrays(self, values: tp.List[np.ndarray]) -> np.ndarray:
+        cardinality: int = self.cardinality()
+        deltas: np.ndarray = self.delta_arrays(values[:cardinality])
+        transformations: np.ndarray = np.column_stack((deltas, np.zeros(len(deltas))))
+        for i, parameter in enumerate(self.get_parameter_nodes()):
+            transformations = parameter.compose_transformation_arrays(
+                transformations, values[cardinality + i], is_inverse=True
+            )
+        return transformations[:, :2]
+
+    def estimate_jacobian_arrays(self, values: tp.List[np.ndarray]) -> tp.Tuple[np.ndarray, tp.List[np.ndarray]]:
+        cardinality: int = self.cardinality()
+        deltas: np.ndarray = self.delta_arrays(values[:cardinality])
+        transformations: np.ndarray = np.column_stack((deltas, np.zeros(len(deltas))))
+        jacobians: tp.List[np.ndarray] = [
+            np.pad(jacobian, ((0, 0), (0, 1), (0, 0))) for jacobian in self.delta_jacobian_arrays(values[:cardinality])
+        ]
+        for i, parameter in enumerate(self.get_parameter_nodes()):
+            transformations, jacobian_transformations, jacobian_parameter = \
+                parameter.compose_transformation_jacobian_arrays(
+                    transformations, values[cardinality + i], is_inverse=True
+                )
+            jacobians = [jacobian_transformations @ jacobian for jacobian in jacobians] + [jacobian_parameter]
+        return transformations[:, :2], [jacobian[:, :2, :] for jacobian in jacobians]
+
+    @classmethod
+    def error_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        return estimates - measurements
+
+    @classmethod
+    def error_jacobian_arrays(
+            cls,
+            estimates: np.ndarray,
+            measurements: np.ndarray
+    ) -> np.ndarray:
+        return np.tile(np.eye(2), (len(estimates), 1, 1))
+
     def _compute_error_vector(self) -> Vector2:
         return self.estimate() - self.get_value()
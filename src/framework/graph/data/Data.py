@@ -1,6 +1,8 @@
+import copy
 import typing as tp
 from abc import abstractmethod
 
+import numpy as np
 from src.framework.math.matrix.vector import VectorFactory
 
 if tp.TYPE_CHECKING:
@@ -46,9 +48,27 @@ class Data(tp.Generic[T]):
     def set_from_vector(self, vector: 'SubVector') -> None:
         pass
 
+    def to_list(self) -> tp.List[float]:
+        """ Returns the elements of the value, as they are written. """
+        return self.to_vector().to_list()
+
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        """ Sets the value from its elements, as they are written. """
+        self.set_from_vector(VectorFactory.from_dim(self.dim())(list_))
+
     def set_zero(self) -> None:
         self.set_from_vector(VectorFactory.from_dim(self.dim()).zeros())
 
+    @classmethod
+    def values_from_array(cls, array: np.ndarray) -> tp.List[T]:
+        """ Returns the values of which the rows of an array are the elements, as they are written. """
+        data: 'Data' = cls()
+        values: tp.List[T] = []
+        for list_ in array.tolist():
+            data.set_from_list(list_)
+            values.append(data.get_value())
+        return values
+
     def set_value(
             self,
             value: T
@@ -89,3 +109,10 @@ class Data(tp.Generic[T]):
     def write(self) -> tp.List[str]:
         """ Writes (or serialises) the class attributes to a list of words (strings). """
         pass
+
+    # copy
+    def __deepcopy__(self, memo: tp.Dict[int, tp.Any]) -> SubData:
+        new: SubData = type(self).__new__(type(self))
+        new.__dict__.update(self.__dict__)
+        new._value = copy.deepcopy(self._value, memo)
+        return new
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.graph.data.Data import Data
 from src.framework.graph.data.Parser import Parser
 from src.framework.math.lie.transformation import SE2
@@ -51,6 +52,17 @@ class DataSE2(DataSE):
     def to_vector(self) -> Vector3:
         return self.get_value().translation_angle_vector()
 
+    def to_list(self) -> tp.List[float]:
+        return self.get_value().translation_angle_list()
+
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        assert len(list_) == self.dim()
+        self.set_value(self._type.from_translation_angle_elements(*list_))
+
+    @classmethod
+    def values_from_array(cls, array: np.ndarray) -> tp.List[SE2]:
+        return cls._type.from_translation_angle_rows(array)
+
     def set_from_vector(self, vector: SubVector) -> None:
         assert vector.dim() == self.dim()
         self.set_value(self.type().from_translation_angle_vector(vector))
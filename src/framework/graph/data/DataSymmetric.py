@@ -28,6 +28,10 @@ class DataSymmetric(Data[SubSquare]):
         assert vector.dim() == self.dim()
         self.set_value(Parser.list_to_symmetric(vector.to_list()))
 
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        assert len(list_) == self.dim()
+        self.set_value(Parser.list_to_symmetric(list_))
+
     def read(self, words: tp.List[str]) -> None:
         floats: tp.List[float] = Parser.words_to_list(words)
         value: SubSquare = Parser.list_to_symmetric(floats)
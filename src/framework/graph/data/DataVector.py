@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.graph.data.Data import Data
 from src.framework.graph.data.Parser import Parser
 from src.framework.math.matrix.vector import SubVector, Vector1, Vector2, Vector3, Vector6
@@ -24,6 +25,10 @@ class DataVector(Data[SubVector]):
         assert vector.dim() == self.dim()
         self.set_value(vector)
 
+    @classmethod
+    def values_from_array(cls, array: np.ndarray) -> tp.List[SubVector]:
+        return cls._type.from_arrays(np.reshape(array, (-1, cls.dim(), 1)))
+
     def read(self, words: tp.List[str]) -> None:
         floats: tp.List[float] = Parser.words_to_list(words)
         value: SubVector = self._type(floats)
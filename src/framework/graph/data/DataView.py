@@ -0,0 +1,129 @@
+import copy
+import typing as tp
+
+from src.framework.graph.data.Data import Data
+from src.framework.math.matrix.vector import VectorFactory
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.data.Data import SubData
+    from src.framework.graph.data.StateBuffer import StateBuffer
+    from src.framework.math.matrix.vector import SubVector
+
+T = tp.TypeVar('T')
+
+
+class DataView(Data[T]):
+    """
+    A data-object of which the value is stored in a state buffer, as its elements. The value is created again when it
+    is read after the buffer was written as a whole. A detached view holds its value itself.
+    """
+
+    _data_type: tp.Type['SubData']
+    _buffer: tp.Optional['StateBuffer']
+    _offset: int
+    _epoch: int  # of the buffer, for which the value is current
+
+    def __init__(
+            self,
+            data_type: tp.Type['SubData'],
+            buffer: 'StateBuffer',
+            offset: int,
+            value: T
+    ):
+        super().__init__()
+        self._data_type = data_type
+        self._type = data_type.type()
+        self._buffer = buffer
+        self._offset = offset
+        self._value = value
+        self._epoch = buffer.epoch()
+
+    # type
+    def type(self) -> tp.Type[T]:
+        return self._type
+
+    def dim(self) -> int:
+        return self._data_type.dim()
+
+    def data_type(self) -> tp.Type['SubData']:
+        return self._data_type
+
+    # buffer
+    def buffer(self) -> tp.Optional['StateBuffer']:
+        return self._buffer
+
+    def is_attached(self) -> bool:
+        return self._buffer is not None
+
+    def offset(self) -> int:
+        return self._offset
+
+    def set_offset(self, offset: int) -> None:
+        self._offset = offset
+
+    def detach(self) -> None:
+        self._value = self.get_value()
+        self._buffer = None
+
+    def _data(self) -> 'SubData':
+        return self._data_type(self.get_value())
+
+    # value
+    def to_vector(self) -> 'SubVector':
+        if not self.is_attached():
+            return self._data().to_vector()
+        return VectorFactory.from_dim(self.dim())(self._buffer.row(self._offset, self.dim()))
+
+    def set_from_vector(self, vector: 'SubVector') -> None:
+        data: 'SubData' = self._data_type()
+        data.set_from_vector(vector)
+        self.set_value(data.get_value())
+
+    def to_list(self) -> tp.List[float]:
+        if not self.is_attached():
+            return self._data().to_list()
+        return self._buffer.row(self._offset, self.dim()).tolist()
+
+    def set_from_list(self, list_: tp.List[float]) -> None:
+        data: 'SubData' = self._data_type()
+        data.set_from_list(list_)
+        self.set_value(data.get_value())
+
+    def set_value(self, value: T) -> None:
+        super().set_value(value)
+        if self.is_attached():
+            self._buffer.row(self._offset, self.dim())[:] = self._data_type(value).to_list()
+            self._epoch = self._buffer.epoch()
+
+    def get_value(self) -> T:
+        if self.is_attached() and self._epoch != self._buffer.epoch():
+            data: 'SubData' = self._data_type()
+            data.set_from_list(self._buffer.row(self._offset, self.dim()).tolist())
+            self._value = data.get_value()
+            self._epoch = self._buffer.epoch()
+        return self._value
+
+    # oplus
+    def oplus(self, delta: 'SubVector') -> T:
+        return self._data().oplus(delta)
+
+    # read/write
+    def read(self, words: tp.List[str]) -> None:
+        data: 'SubData' = self._data_type()
+        data.read(words)
+        self.set_value(data.get_value())
+
+    def write(self) -> tp.List[str]:
+        return self._data().write()
+
+    # copy
+    def __deepcopy__(self, memo: tp.Dict[int, tp.Any]) -> 'SubData':
+        buffer: tp.Optional['StateBuffer'] = memo.get(id(self._buffer)) if self.is_attached() else None
+        if buffer is None:
+            # copied without the buffer
+            return self._data_type(copy.deepcopy(self.get_value(), memo))
+        new: DataView[T] = DataView.__new__(DataView)
+        new.__dict__.update(self.__dict__)
+        new._buffer = buffer
+        new._value = copy.deepcopy(self._value, memo)
+        return new
@@ -1,3 +1,4 @@
+import re
 import typing as tp
 
 import numpy as np
@@ -33,6 +34,26 @@ class Parser(object):
             words.append(word)
         return words
 
+    @classmethod
+    def array_to_lines(cls, array: np.ndarray) -> tp.List[str]:
+        """ Formats each row of an array as a line of words, identical to joining the words of list_to_words. """
+        if array.size == 0:
+            return [''] * len(array)
+        array = array + 0.  # no negative zeros
+        line_format: str = ' '.join(['%.5f'] * array.shape[1])
+        text: str = '\n'.join([line_format] * len(array)) % tuple(array.flatten().tolist())
+        lines: tp.List[str] = cls._trailing_zeros.sub('', text).split('\n')
+
+        # rows with values that are not printed in fixed-point notation
+        magnitudes: np.ndarray = np.abs(array)
+        is_irregular: np.ndarray = ~np.isfinite(array) | ((magnitudes > 0) & (magnitudes < 1e-4)) | (magnitudes >= 1e9)
+        for i in np.flatnonzero(is_irregular.any(axis=1)):
+            lines[i] = ' '.join(cls.list_to_words(array[i].tolist()))
+        return lines
+
+    # all five decimals are zero, or the last few
+    _trailing_zeros = re.compile(r'(?:\.00000|0{1,4})(?![^ \n])')
+
     # words to data
     @classmethod
     def list_to_symmetric(cls, elements: tp.List[float]) -> SubSquare:
@@ -41,17 +62,37 @@ class Parser(object):
         assert dimension.is_integer(), \
             f'elements {elements} are not divisible to form a symmetric matrix ({dimension})'
         dimension = int(dimension)
-        matrix = SquareFactory.from_dim(dimension).zeros()
+        array: np.ndarray = np.zeros((dimension, dimension))
+        rows, columns = cls.upper_indices(dimension)
+        array[rows, columns] = elements
+        array[columns, rows] = elements
+        return SquareFactory.from_dim(dimension)(array)
 
-        indices = np.arange(dimension)
-        count: int = 0
-        for i in indices:
-            for j in indices[i:]:
-                matrix[i, j] = elements[count]
-                matrix[j, i] = matrix[i, j]
-                count += 1
-        return matrix
+    @classmethod
+    def uppers_to_arrays(cls, uppers: np.ndarray, dimension: int) -> np.ndarray:
+        """ Returns the symmetric arrays (N x dim x dim) of which the rows are the upper triangles. """
+        rows, columns = cls.upper_indices(dimension)
+        arrays: np.ndarray = np.zeros((len(uppers), dimension, dimension))
+        arrays[:, rows, columns] = uppers[:, : len(rows)]
+        arrays[:, columns, rows] = uppers[:, : len(rows)]
+        return arrays
+
+    @classmethod
+    def upper_indices(cls, dimension: int) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ Returns the (cached) row and column indices of the upper triangle, in the order of the words. """
+        if dimension not in cls._upper_indices:
+            cls._upper_indices[dimension] = np.triu_indices(dimension)
+        return cls._upper_indices[dimension]
+
+    _upper_indices: tp.Dict[int, tp.Tuple[np.ndarray, np.ndarray]] = {}
 
     @staticmethod
     def words_to_list(words: tp.List[str]) -> tp.List[float]:
         return [float(word) for word in words]
+
+    @staticmethod
+    def words_to_array(words: tp.List[str], columns: int) -> np.ndarray:
+        """ Parses a flat list of words into an array of floats with a given number of columns. """
+        array: np.ndarray = np.array(words, dtype=float)
+        assert array.size % columns == 0, f'{array.size} words cannot be split into rows of {columns}.'
+        return array.reshape((-1, columns))
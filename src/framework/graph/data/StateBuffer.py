@@ -0,0 +1,111 @@
+import copy
+import typing as tp
+
+import numpy as np
+from src.framework.graph.data.DataSE import DataSE2
+from src.framework.graph.data.DataView import DataView
+from src.framework.math.lie.rotation import SO2
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.data.Data import SubData
+
+T = tp.TypeVar('T')
+
+
+class StateBuffer(object):
+    """
+    A contiguous array of node values, laid out as the graph vector, of which the nodes hold views. Writing the whole
+    vector is a single copy, after which the views create their values again when these are read.
+    """
+
+    _values: np.ndarray
+    _size: int
+    _views: tp.List[DataView]  # in order of their offsets
+    _angles: tp.List[int]  # offsets of the angles of SE2 values
+    _epoch: int  # incremented when the whole vector is written
+
+    def __init__(self, capacity: int = 64):
+        self._values = np.zeros(capacity)
+        self._size = 0
+        self._views = []
+        self._angles = []
+        self._epoch = 0
+
+    def size(self) -> int:
+        return self._size
+
+    def count(self) -> int:
+        """ Returns the number of views. """
+        return len(self._views)
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    # views
+    def attach(
+            self,
+            data_type: tp.Type['SubData'],
+            value: T
+    ) -> DataView[T]:
+        """ Appends a value to the buffer, and returns a view of it. """
+        list_: tp.List[float] = data_type(value).to_list()
+        dim: int = len(list_)
+        if self._size + dim > len(self._values):
+            values: np.ndarray = np.zeros(2 * (self._size + dim))
+            values[:self._size] = self._values[:self._size]
+            self._values = values
+        offset: int = self._size
+        self._values[offset: offset + dim] = list_
+        self._size += dim
+        if issubclass(data_type, DataSE2):
+            self._angles.append(offset + 2)
+        view: DataView[T] = DataView(data_type, self, offset, value)
+        self._views.append(view)
+        return view
+
+    def detach(self, view: DataView) -> None:
+        """ Removes the value of a view from the buffer, after which the view holds it. """
+        index: int = self._views.index(view)
+        view.detach()
+        offset: int = view.offset()
+        dim: int = view.dim()
+        self._values[offset: self._size - dim] = self._values[offset + dim: self._size]
+        self._size -= dim
+        del self._views[index]
+        for view_ in self._views[index:]:
+            view_.set_offset(view_.offset() - dim)
+        self._angles = [angle if angle < offset else angle - dim for angle in self._angles if not offset <= angle < offset + dim]
+
+    def clear(self) -> None:
+        """ Detaches all views. """
+        for view in self._views:
+            view.detach()
+        self.__init__()
+
+    # values
+    def row(self, offset: int, dim: int) -> np.ndarray:
+        """ Returns a view of the value at an offset. """
+        return self._values[offset: offset + dim]
+
+    def values(self) -> np.ndarray:
+        """ Returns a view of all values, as the graph vector. """
+        return self._values[:self._size]
+
+    def set_values(self, array: np.ndarray) -> None:
+        """ Copies the graph vector into the buffer, and wraps the angles as SE2 values do. """
+        assert len(array) == self._size
+        self._values[:self._size] = array
+        if self._angles:
+            self._values[self._angles] = list(map(SO2.wrap, self._values[self._angles].tolist()))
+        self._epoch += 1
+
+    # copy
+    def __deepcopy__(self, memo: tp.Dict[int, tp.Any]) -> 'StateBuffer':
+        new: StateBuffer = StateBuffer.__new__(StateBuffer)
+        memo[id(self)] = new
+        new._values = self._values.copy()
+        new._size = self._size
+        new._angles = copy.copy(self._angles)
+        new._epoch = self._epoch
+        new._views = [copy.deepcopy(view, memo) for view in self._views]
+        return new
@@ -3,3 +3,5 @@ from src.framework.graph.data.DataFactory import DataFactory
 from src.framework.graph.data.DataSE import SubDataSE, DataSE2
 from src.framework.graph.data.DataSymmetric import SubDataSymmetric, DataSymmetric2, DataSymmetric3
 from src.framework.graph.data.DataVector import SubDataVector, DataV2, DataV3, DataV6
+from src.framework.graph.data.DataView import DataView
+from src.framework.graph.data.StateBuffer import StateBuffer
@@ -45,6 +45,101 @@ def compose_scale(
     return composed
 
 
+def compose_bias_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> np.ndarray:
+    if is_inverse:
+        parameters = SE2.inverse_arrays(parameters)
+    return SE2.compose_arrays(transformations, parameters)
+
+
+def compose_offset_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> np.ndarray:
+    if is_inverse:
+        parameters = SE2.inverse_arrays(parameters)
+    return SE2.compose_arrays(SE2.compose_arrays(parameters, transformations), SE2.inverse_arrays(parameters))
+
+
+def compose_scale_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> np.ndarray:
+    if is_inverse:
+        parameters = np.reciprocal(parameters)
+    composed: np.ndarray = np.multiply(parameters, transformations)
+    composed[:, 2] = SE2.wrap_angles(composed[:, 2])
+    return composed
+
+
+def compose_bias_jacobian_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Returns compose_bias_arrays, with its jacobians (N x 3 x 3) to the transformations and to the parameters. """
+    jacobian_inverse: np.ndarray = np.tile(np.eye(3), (len(parameters), 1, 1))
+    if is_inverse:
+        jacobian_inverse = SE2.inverse_jacobian_arrays(parameters)
+        parameters = SE2.inverse_arrays(parameters)
+    jacobian_transformations, jacobian_parameters = SE2.compose_jacobian_arrays(transformations, parameters)
+    return (
+        SE2.compose_arrays(transformations, parameters),
+        jacobian_transformations,
+        jacobian_parameters @ jacobian_inverse
+    )
+
+
+def compose_offset_jacobian_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Returns compose_offset_arrays, with its jacobians (N x 3 x 3) to the transformations and to the parameters. """
+    jacobian_inverse: np.ndarray = np.tile(np.eye(3), (len(parameters), 1, 1))
+    if is_inverse:
+        jacobian_inverse = SE2.inverse_jacobian_arrays(parameters)
+        parameters = SE2.inverse_arrays(parameters)
+
+    # parameters * transformations * parameters^-1
+    left: np.ndarray = SE2.compose_arrays(parameters, transformations)
+    jacobian_left_parameters, jacobian_left_transformations = SE2.compose_jacobian_arrays(parameters, transformations)
+    inverse_parameters: np.ndarray = SE2.inverse_arrays(parameters)
+    jacobian_left, jacobian_inverse_parameters = SE2.compose_jacobian_arrays(left, inverse_parameters)
+    jacobian_parameters: np.ndarray = jacobian_left @ jacobian_left_parameters + \
+        jacobian_inverse_parameters @ SE2.inverse_jacobian_arrays(parameters)
+    return (
+        SE2.compose_arrays(left, inverse_parameters),
+        jacobian_left @ jacobian_left_transformations,
+        jacobian_parameters @ jacobian_inverse
+    )
+
+
+def compose_scale_jacobian_arrays(
+        transformations: np.ndarray,
+        parameters: np.ndarray,
+        is_inverse: bool
+) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """ Returns compose_scale_arrays, with its jacobians (N x 3 x 3) to the transformations and to the parameters. """
+    derivatives: np.ndarray = np.ones(parameters.shape)
+    if is_inverse:
+        derivatives = - np.reciprocal(np.square(parameters))
+        parameters = np.reciprocal(parameters)
+    composed: np.ndarray = np.multiply(parameters, transformations)
+    composed[:, 2] = SE2.wrap_angles(composed[:, 2])
+    diagonal: np.ndarray = np.eye(3)
+    return (
+        composed,
+        parameters[:, :, None] * diagonal,
+        (transformations * derivatives)[:, :, None] * diagonal
+    )
+
+
 T = tp.TypeVar('T')
 
 
@@ -80,6 +175,46 @@ class BaseParameterNode(tp.Generic[T], ParameterNode[T]):
         if self.get_specification() == ParameterSpecification.SCALE:
             return self._compose_as_scale(transformation, is_inverse)
 
+    def compose_transformation_arrays(
+            self,
+            transformations: np.ndarray,
+            values: np.ndarray,
+            is_inverse: bool = False
+    ) -> np.ndarray:
+        parameters: np.ndarray = self.to_vector3_array(values)
+        if self.get_specification() == ParameterSpecification.BIAS:
+            return compose_bias_arrays(transformations, parameters, is_inverse)
+        if self.get_specification() == ParameterSpecification.OFFSET:
+            return compose_offset_arrays(transformations, parameters, is_inverse)
+        if self.get_specification() == ParameterSpecification.SCALE:
+            return compose_scale_arrays(transformations, parameters, is_inverse)
+
+    def compose_transformation_jacobian_arrays(
+            self,
+            transformations: np.ndarray,
+            values: np.ndarray,
+            is_inverse: bool = False
+    ) -> tp.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """ Returns compose_transformation_arrays, with its jacobians to the transformations and to the values. """
+        parameters: np.ndarray = self.to_vector3_array(values)
+        if self.get_specification() == ParameterSpecification.BIAS:
+            composed, jacobian_transformations, jacobian_parameters = compose_bias_jacobian_arrays(
+                transformations, parameters, is_inverse
+            )
+        elif self.get_specification() == ParameterSpecification.OFFSET:
+            composed, jacobian_transformations, jacobian_parameters = compose_offset_jacobian_arrays(
+                transformations, parameters, is_inverse
+            )
+        else:
+            composed, jacobian_transformations, jacobian_parameters = compose_scale_jacobian_arrays(
+                transformations, parameters, is_inverse
+            )
+
+        # to_vector3_array is affine: its jacobian (3 x dim) follows from unit values
+        dim: int = values.shape[1]
+        selection: np.ndarray = (self.to_vector3_array(np.eye(dim)) - self.to_vector3_array(np.zeros((1, dim)))).T
+        return composed, jacobian_transformations, jacobian_parameters @ selection
+
     def _compose_as_bias(
             self,
             transformation: SE2,
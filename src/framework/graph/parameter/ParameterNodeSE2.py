@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.lie.transformation import SE2
 from src.framework.graph.parameter.BaseParameterNode import BaseParameterNode
 from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification
@@ -39,3 +40,6 @@ class ParameterNodeSE2(BaseParameterNode[SE2]):
 
     def to_vector3(self) -> 'Vector3':
         return self.to_vector()
+
+    def to_vector3_array(self, values: np.ndarray) -> np.ndarray:
+        return values
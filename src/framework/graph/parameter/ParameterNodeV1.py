@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.matrix.vector import Vector1, Vector3
 from src.framework.graph.parameter.BaseParameterNode import BaseParameterNode
 from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification, ParameterDict
@@ -49,6 +50,14 @@ class ParameterNodeV1(BaseParameterNode[Vector1]):
         list_[self.index()] = self.to_float()
         return Vector3(list_)
 
+    def to_vector3_array(self, values: np.ndarray) -> np.ndarray:
+        filler: float = 0.
+        if self.get_specification() == ParameterSpecification.SCALE:
+            filler = 1.
+        array: np.ndarray = np.full((len(values), 3), filler)
+        array[:, self.index()] = values[:, 0]
+        return array
+
     # read/write
     def read(self, words: tp.List[str]) -> tp.List[str]:
         self.set_specification(ParameterDict.from_string(words[0]))
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.matrix.vector import Vector2, Vector3
 from src.framework.graph.parameter.BaseParameterNode import BaseParameterNode
 from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification, ParameterDict
@@ -47,6 +48,12 @@ class ParameterNodeV2(BaseParameterNode[Vector2]):
         list_.insert(self.index(), filler)
         return Vector3(list_)
 
+    def to_vector3_array(self, values: np.ndarray) -> np.ndarray:
+        filler: float = 0.
+        if self.get_specification() == ParameterSpecification.SCALE:
+            filler = 1.
+        return np.insert(values, self.index(), filler, axis=1)
+
     # read/write
     def read(self, words: tp.List[str]) -> tp.List[str]:
         self.set_specification(ParameterDict.from_string(words[0]))
@@ -1,5 +1,6 @@
 import typing as tp
 
+import numpy as np
 from src.framework.math.matrix.vector import Vector3
 from src.framework.graph.parameter.BaseParameterNode import BaseParameterNode
 from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification
@@ -39,3 +40,6 @@ class ParameterNodeV3(BaseParameterNode[Vector3]):
 
     def to_vector3(self) -> Vector3:
         return self.get_value()
+
+    def to_vector3_array(self, values: np.ndarray) -> np.ndarray:
+        return values
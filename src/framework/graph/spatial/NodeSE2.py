@@ -18,4 +18,7 @@ class NodeSE2(SpatialNode[SE2], DrawAxis):
         return delta[0] ** 2 + delta[1] ** 2
 
     def draw_pose(self) -> 'SE3':
-        return self.get_value().to_se3()
\ No newline at end of file
+        return self.get_value().to_se3()
+
+    def draw_planar_pose(self) -> tp.List[float]:
+        return self.get_value().translation_angle_list()
@@ -4,6 +4,8 @@ SubMultiDimensional = tp.TypeVar('SubMultiDimensional', bound='MultiDimensional'
 
 
 class Dimensional(object):
+    __slots__ = ()
+
     _dim: int
 
     @classmethod
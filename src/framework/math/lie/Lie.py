@@ -14,6 +14,8 @@ SubLie = tp.TypeVar('SubLie', bound='Lie')
 
 
 class Lie(Dimensional):
+    __slots__ = ()
+
     _dof: int
 
     # operators
@@ -95,6 +97,23 @@ class Lie(Dimensional):
         """ returns the vector corresponding to the algebra """
         pass
 
+    # copy
+    def __copy__(self) -> SubLie:
+        """ Returns the element itself, since elements are not modified after construction. """
+        return self
+
+    def __deepcopy__(self, memo: tp.Dict[int, tp.Any]) -> SubLie:
+        return self
+
+    # pickle
+    def __setstate__(self, state: tp.Any) -> None:
+        """ Restores the slots, or the attributes of an element pickled before the classes had slots. """
+        if isinstance(state, tuple):
+            dict_state, slot_state = state
+            state = {**(dict_state or {}), **(slot_state or {})}
+        for name, value in state.items():
+            setattr(self, name, value)
+
     # print
     def to_string(
             self,
@@ -11,6 +11,8 @@ SubSO = tp.TypeVar('SubSO', bound='SO')
 
 
 class SO(Lie):
+    __slots__ = ('_matrix',)
+
     _matrix: SubSquare
 
     def __init__(
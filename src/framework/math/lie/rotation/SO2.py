@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import numpy as np
+import math
+import typing as tp
 
 from src.framework.math.lie.rotation.SO3 import SO3
 from src.framework.math.lie.rotation.SO import SO
@@ -9,13 +10,17 @@ from src.framework.math.matrix.vector import Vector1, Vector3
 
 
 class SO2(SO):
+    """ Stores the angle only: operations are closed-form on it, and the matrix is built on request. """
+
+    __slots__ = ('_angle',)
+
     _dim = 2
     _dof = 1
     _angle: float
 
     def __init__(self, matrix: Square2):
         super().__init__(matrix)
-        self._angle = np.arctan2(matrix[1, 0], matrix[0, 0])
+        self._angle = math.atan2(matrix[1, 0], matrix[0, 0])
 
     def __mul__(self, other: SO2):
         assert type(self) == type(other)
@@ -34,22 +39,26 @@ class SO2(SO):
         return type(self).from_angle(- self._angle)
 
     def jacobian(self) -> Square2:
-        angle: float = self.angle()
-        if np.isclose(angle, 0.):
-            return Square2(np.eye(2) + 0.5 * self.algebra().array())
-        sin_angle: float = np.sin(angle)
-        cos_angle: float = np.cos(angle)
-        matrix_array: np.ndarray = (1 / angle) * np.array([[sin_angle, cos_angle - 1.],
-                                                           [1. - cos_angle, sin_angle]])
-        return Square2(matrix_array)
+        a, b = self.jacobian_elements(self._angle)
+        return Square2([[a, -b],
+                        [b, a]])
 
     def inverse_jacobian(self) -> Square2:
-        jacobian: Square2 = self.jacobian()
-        a: float = jacobian[0, 0]
-        b: float = jacobian[1, 0]
-        matrix_array: np.ndarray = (1 / (a**2 + b**2)) * np.array([[a, b],
-                                                                   [-b, a]])
-        return Square2(matrix_array)
+        a, b = self.jacobian_elements(self._angle)
+        scale: float = 1 / (a**2 + b**2)
+        return Square2([[scale * a, scale * b],
+                        [- scale * b, scale * a]])
+
+    @staticmethod
+    def jacobian_elements(angle: float) -> tp.Tuple[float, float]:
+        """ returns the elements (a, b) of the left Jacobian [[a, -b], [b, a]] of an angle """
+        if abs(angle) <= 1e-8:
+            return 1., 0.5 * angle
+        return math.sin(angle) / angle, (1. - math.cos(angle)) / angle
+
+    @staticmethod
+    def wrap(angle: float) -> float:
+        return math.atan2(math.sin(angle), math.cos(angle))
 
     # alternative representations
     def algebra(self) -> Square2:
@@ -64,9 +73,10 @@ class SO2(SO):
     # alternative creators
     @classmethod
     def from_angle(cls, angle: float) -> SO2:
-        return cls(
-            cls._angle_to_matrix(angle)
-        )
+        rotation: SO2 = cls.__new__(cls)
+        rotation._matrix = None
+        rotation._angle = cls.wrap(angle)
+        return rotation
 
     @classmethod
     def from_vector(cls, vector: Vector1) -> SO2:
@@ -76,6 +86,12 @@ class SO2(SO):
     def from_elements(cls, *args: float) -> SO2:
         return super().from_elements(*args)
 
+    # pickle
+    def __setstate__(self, state: tp.Any) -> None:
+        super().__setstate__(state)
+        if not hasattr(self, '_angle'):
+            self._angle = math.atan2(self._matrix[1, 0], self._matrix[0, 0])
+
     # helper-methods
     @staticmethod
     def _vector_to_algebra(vector: Vector1) -> Square2:
@@ -89,8 +105,7 @@ class SO2(SO):
 
     @staticmethod
     def _angle_to_matrix(angle: float) -> Square2:
-        sin_angle: float = np.sin(angle)
-        cos_angle: float = np.cos(angle)
-        array = np.array([[cos_angle, -sin_angle],
-                          [sin_angle, cos_angle]])
-        return Square2(array)
+        sin_angle: float = math.sin(angle)
+        cos_angle: float = math.cos(angle)
+        return Square2([[cos_angle, -sin_angle],
+                        [sin_angle, cos_angle]])
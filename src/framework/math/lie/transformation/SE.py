@@ -13,6 +13,8 @@ SubSE = tp.TypeVar('SubSE', bound='SE')
 
 
 class SE(Lie, ABC):
+    __slots__ = ('_translation', '_rotation')
+
     _translation: SubVector
     _rotation: SubSO
 
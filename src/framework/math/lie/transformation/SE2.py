@@ -1,5 +1,7 @@
+import math
 import typing as tp
 
+import numpy as np
 from src.framework.math.lie.rotation.SO2 import SO2
 from src.framework.math.lie.transformation.SE3 import SE3
 from src.framework.math.lie.transformation.SE import SE
@@ -10,22 +12,52 @@ SubSE2 = tp.TypeVar('SubSE2', bound='SE2')
 
 
 class SE2(SE):
+    """ Stores (x, y, angle): operations are closed-form on them, and translation and rotation are built on request. """
+
+    __slots__ = ('_x', '_y', '_angle')
 
     _dim = 2
     _dof = 3
 
+    _x: float
+    _y: float
+    _angle: float
+
     def __init__(
             self,
             translation: Vector2,
             rotation: SO2
     ):
         super().__init__(translation, rotation)
+        self._x = float(translation[0])
+        self._y = float(translation[1])
+        self._angle = rotation.angle()
 
     # operators
+    def __mul__(self, other: SubSE2) -> SubSE2:
+        assert type(self) == type(other)
+        cos: float = math.cos(self._angle)
+        sin: float = math.sin(self._angle)
+        return self._from_pose(
+            self._x + cos * other._x - sin * other._y,
+            self._y + sin * other._x + cos * other._y,
+            SO2.wrap(self._angle + other._angle)
+        )
+
+    def __sub__(self, other: SubSE2) -> SubSE2:
+        assert type(self) == type(other)
+        cos: float = math.cos(other._angle)
+        sin: float = math.sin(other._angle)
+        x: float = self._x - other._x
+        y: float = self._y - other._y
+        return self._from_pose(
+            cos * x + sin * y,
+            - sin * x + cos * y,
+            SO2.wrap(self._angle - other._angle)
+        )
+
     def oplus(self, vector: SubVector) -> SubSE2:
-        translation: Vector2 = Vector2(self.translation().array() + vector[:2])
-        rotation: SO2 = self.rotation() * SO2.from_angle(vector[2])
-        return type(self)(translation, rotation)
+        return self._from_pose(self._x + vector[0], self._y + vector[1], SO2.wrap(self._angle + vector[2]))
         # increment: SubSE2 = type(self).from_translation_angle_vector(vector)
         # return self + increment
 
@@ -33,20 +65,69 @@ class SE2(SE):
         difference: SubSE2 = self - transformation
         return difference.translation_angle_vector()
 
+    # properties
+    def translation(self) -> Vector2:
+        if self._translation is None:
+            self._translation = Vector2(self._x, self._y)
+        return self._translation
+
+    def rotation(self) -> SO2:
+        if self._rotation is None:
+            self._rotation = SO2.from_angle(self._angle)
+        return self._rotation
+
+    def inverse(self) -> SubSE2:
+        cos: float = math.cos(self._angle)
+        sin: float = math.sin(self._angle)
+        return self._from_pose(
+            - cos * self._x - sin * self._y,
+            sin * self._x - cos * self._y,
+            SO2.wrap(- self._angle)
+        )
+
     # alternative representations
+    def matrix(self) -> Square3:
+        cos: float = math.cos(self._angle)
+        sin: float = math.sin(self._angle)
+        return Square3([[cos, -sin, self._x],
+                        [sin, cos, self._y],
+                        [0., 0., 1.]])
+
+    def vector(self) -> Vector3:
+        a, b = SO2.jacobian_elements(self._angle)
+        scale: float = 1 / (a**2 + b**2)
+        return Vector3(
+            scale * (a * self._x + b * self._y),
+            scale * (- b * self._x + a * self._y),
+            self._angle
+        )
+
+    def translation_vector(self) -> Vector2:
+        vector: Vector3 = self.vector()
+        return Vector2(vector[0], vector[1])
+
     def translation_angle(self) -> tp.Tuple[Vector2, float]:
-        return self.translation(), self.rotation().angle()
+        return self.translation(), self._angle
 
     def translation_angle_vector(self) -> Vector3:
-        return Vector3(*(self.translation().to_list()), self.rotation().angle())
+        return Vector3(self._x, self._y, self._angle)
 
     def translation_angle_list(self) -> tp.List[float]:
-        return self.translation().to_list() + [self.rotation().angle()]
+        return [self._x, self._y, self._angle]
 
     # conversion
     def to_se3(self) -> SE3:
         return SE3(self.translation().to_vector3(), self.rotation().to_so3())
 
+    # pickle
+    def __setstate__(self, state: tp.Any) -> None:
+        super().__setstate__(state)
+        if not hasattr(self, '_x'):
+            # pickled with translation and rotation only
+            self._x = float(self._translation[0])
+            self._y = float(self._translation[1])
+            self._angle = self._rotation.angle()
+
     # helper-methods
     @staticmethod
     def _vector_to_algebra(vector: SubVector) -> SubSquare:
@@ -63,14 +144,104 @@ class SE2(SE):
                         algebra[1, 2],
                         algebra[1, 0]])
 
+    # batch operations on arrays with rows (x, y, angle)
+    @staticmethod
+    def wrap_angles(angles: np.ndarray) -> np.ndarray:
+        return np.arctan2(np.sin(angles), np.cos(angles))
+
+    @classmethod
+    def compose_arrays(
+            cls,
+            a: np.ndarray,
+            b: np.ndarray
+    ) -> np.ndarray:
+        cos: np.ndarray = np.cos(a[:, 2])
+        sin: np.ndarray = np.sin(a[:, 2])
+        return np.column_stack((
+            a[:, 0] + cos * b[:, 0] - sin * b[:, 1],
+            a[:, 1] + sin * b[:, 0] + cos * b[:, 1],
+            cls.wrap_angles(a[:, 2] + b[:, 2])
+        ))
+
+    @classmethod
+    def inverse_arrays(cls, a: np.ndarray) -> np.ndarray:
+        cos: np.ndarray = np.cos(a[:, 2])
+        sin: np.ndarray = np.sin(a[:, 2])
+        return np.column_stack((
+            - cos * a[:, 0] - sin * a[:, 1],
+            sin * a[:, 0] - cos * a[:, 1],
+            cls.wrap_angles(- a[:, 2])
+        ))
+
+    # jacobians of the batch operations, to the rows (x, y, angle) of their arguments
+    @staticmethod
+    def compose_jacobian_arrays(
+            a: np.ndarray,
+            b: np.ndarray
+    ) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ returns the jacobians (N x 3 x 3) of compose_arrays(a, b) to a and to b """
+        cos: np.ndarray = np.cos(a[:, 2])
+        sin: np.ndarray = np.sin(a[:, 2])
+        jacobian_a: np.ndarray = np.tile(np.eye(3), (len(a), 1, 1))
+        jacobian_a[:, 0, 2] = - sin * b[:, 0] - cos * b[:, 1]
+        jacobian_a[:, 1, 2] = cos * b[:, 0] - sin * b[:, 1]
+        jacobian_b: np.ndarray = np.zeros((len(a), 3, 3))
+        jacobian_b[:, 0, 0] = cos
+        jacobian_b[:, 0, 1] = - sin
+        jacobian_b[:, 1, 0] = sin
+        jacobian_b[:, 1, 1] = cos
+        jacobian_b[:, 2, 2] = 1.
+        return jacobian_a, jacobian_b
+
+    @staticmethod
+    def inverse_jacobian_arrays(a: np.ndarray) -> np.ndarray:
+        """ returns the jacobians (N x 3 x 3) of inverse_arrays(a) to a """
+        cos: np.ndarray = np.cos(a[:, 2])
+        sin: np.ndarray = np.sin(a[:, 2])
+        jacobian: np.ndarray = np.zeros((len(a), 3, 3))
+        jacobian[:, 0, 0] = - cos
+        jacobian[:, 0, 1] = - sin
+        jacobian[:, 0, 2] = sin * a[:, 0] - cos * a[:, 1]
+        jacobian[:, 1, 0] = sin
+        jacobian[:, 1, 1] = - cos
+        jacobian[:, 1, 2] = cos * a[:, 0] + sin * a[:, 1]
+        jacobian[:, 2, 2] = -1.
+        return jacobian
+
     # alternative creators:
+    @classmethod
+    def _from_pose(
+            cls,
+            x: float,
+            y: float,
+            angle: float
+    ) -> SubSE2:
+        """ creates the element without translation and rotation objects, from an angle in (-pi, pi] """
+        transformation: SubSE2 = cls.__new__(cls)
+        transformation._translation = None
+        transformation._rotation = None
+        transformation._x = x
+        transformation._y = y
+        transformation._angle = angle
+        return transformation
+
+    @classmethod
+    def from_matrix(cls, matrix: SubSquare) -> SubSE2:
+        return cls._from_pose(float(matrix[0, 2]), float(matrix[1, 2]), math.atan2(matrix[1, 0], matrix[0, 0]))
+
+    @classmethod
+    def from_vector(cls, vector: SubVector) -> SubSE2:
+        angle: float = SO2.wrap(vector[2])
+        a, b = SO2.jacobian_elements(angle)
+        return cls._from_pose(a * vector[0] - b * vector[1], b * vector[0] + a * vector[1], angle)
+
     @classmethod
     def from_translation_angle(
             cls,
             translation: Vector2,
             angle: float
     ) -> SubSE2:
-        return cls(translation, SO2.from_angle(angle))
+        return cls._from_pose(float(translation[0]), float(translation[1]), SO2.wrap(angle))
 
     @classmethod
     def from_translation_angle_elements(
@@ -79,12 +250,18 @@ class SE2(SE):
             y: float,
             angle: float
     ) -> SubSE2:
-        return cls(Vector2(x, y), SO2.from_angle(angle))
+        return cls._from_pose(float(x), float(y), SO2.wrap(angle))
+
+    @classmethod
+    def from_translation_angle_rows(cls, array: np.ndarray) -> tp.List[SubSE2]:
+        """ Returns the elements of which the rows of an array (N x 3) are the translations and angles. """
+        return [cls._from_pose(x, y, SO2.wrap(angle)) for x, y, angle in array.tolist()]
 
     @classmethod
     def from_translation_angle_vector(
             cls,
             translation_angle_vector: Vector3
     ) -> SubSE2:
-        list_: tp.List[float] = translation_angle_vector.to_list()
-        return cls(Vector2(list_[0], list_[1]), SO2.from_angle(list_[2]))
+        return cls._from_pose(
+            float(translation_angle_vector[0]), float(translation_angle_vector[1]), SO2.wrap(translation_angle_vector[2])
+        )
@@ -0,0 +1,149 @@
+import typing as tp
+
+import numpy as np
+from src.framework.math.lie.transformation.SE2 import SE2
+from src.framework.math.matrix.vector.Vector import Vector
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph
+
+SubSE2Array = tp.TypeVar('SubSE2Array', bound='SE2Array')
+
+
+class SE2Array(object):
+    """ N poses as an (N x 3) array of rows (x, y, angle), with the operations of SE2 applied to all rows at once. """
+
+    _array: np.ndarray
+
+    def __init__(self, array: tp.Union[np.ndarray, tp.List[tp.List[float]]]):
+        self._array = np.asarray(array, dtype=float).reshape((-1, 3))
+
+    def __len__(self) -> int:
+        return self._array.shape[0]
+
+    def __getitem__(self, item) -> tp.Union[SE2, SubSE2Array]:
+        if isinstance(item, (int, np.integer)):
+            return SE2.from_translation_angle_elements(*self._array[item].tolist())
+        return type(self)(self._array[item])
+
+    # operators
+    def __mul__(self, other: SubSE2Array) -> SubSE2Array:
+        return type(self)(SE2.compose_arrays(self._array, other.array()))
+
+    def __add__(self, other: SubSE2Array) -> SubSE2Array:
+        return self * other
+
+    def __sub__(self, other: SubSE2Array) -> SubSE2Array:
+        return type(self)(SE2.compose_arrays(SE2.inverse_arrays(other.array()), self._array))
+
+    def inverse(self) -> SubSE2Array:
+        return type(self)(SE2.inverse_arrays(self._array))
+
+    def oplus(self, vectors: np.ndarray) -> SubSE2Array:
+        array: np.ndarray = self._array + vectors
+        array[:, 2] = SE2.wrap_angles(array[:, 2])
+        return type(self)(array)
+
+    def ominus(self, other: SubSE2Array) -> np.ndarray:
+        return (self - other).translation_angle_vectors()
+
+    # alternative representations
+    def array(self) -> np.ndarray:
+        return self._array
+
+    def translations(self) -> np.ndarray:
+        return self._array[:, :2]
+
+    def angles(self) -> np.ndarray:
+        return self._array[:, 2]
+
+    def translation_angle_vectors(self) -> np.ndarray:
+        return self._array.copy()
+
+    def vectors(self) -> np.ndarray:
+        """ returns the logarithms (N x 3) of the poses """
+        a, b = self._jacobian_elements(self._array[:, 2])
+        scale: np.ndarray = 1 / (a ** 2 + b ** 2)
+        x: np.ndarray = self._array[:, 0]
+        y: np.ndarray = self._array[:, 1]
+        return np.column_stack((scale * (a * x + b * y), scale * (- b * x + a * y), self._array[:, 2]))
+
+    def matrices(self) -> np.ndarray:
+        """ returns the homogeneous matrices (N x 3 x 3) of the poses """
+        cos: np.ndarray = np.cos(self._array[:, 2])
+        sin: np.ndarray = np.sin(self._array[:, 2])
+        matrices: np.ndarray = np.zeros((len(self), 3, 3))
+        matrices[:, 0, 0] = cos
+        matrices[:, 0, 1] = - sin
+        matrices[:, 1, 0] = sin
+        matrices[:, 1, 1] = cos
+        matrices[:, :2, 2] = self._array[:, :2]
+        matrices[:, 2, 2] = 1.
+        return matrices
+
+    def se3_matrices(self) -> np.ndarray:
+        """ returns the homogeneous matrices (N x 4 x 4) of the poses in SE3, as SE2.to_se3 """
+        matrices: np.ndarray = np.zeros((len(self), 4, 4))
+        planar: np.ndarray = self.matrices()
+        matrices[:, :2, :2] = planar[:, :2, :2]
+        matrices[:, :2, 3] = planar[:, :2, 2]
+        matrices[:, 2, 2] = 1.
+        matrices[:, 3, 3] = 1.
+        return matrices
+
+    def to_list(self) -> tp.List[SE2]:
+        return [SE2.from_translation_angle_elements(*row) for row in self._array.tolist()]
+
+    # alternative creators
+    @classmethod
+    def from_list(cls, transformations: tp.List[SE2]) -> SubSE2Array:
+        return cls([transformation.translation_angle_list() for transformation in transformations])
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray) -> SubSE2Array:
+        """ returns the exponentials of (N x 3) vectors """
+        angles: np.ndarray = SE2.wrap_angles(vectors[:, 2])
+        a, b = cls._jacobian_elements(angles)
+        return cls(np.column_stack((
+            a * vectors[:, 0] - b * vectors[:, 1],
+            b * vectors[:, 0] + a * vectors[:, 1],
+            angles
+        )))
+
+    # graph
+    @staticmethod
+    def _indices(graph: 'SubGraph', ids: tp.List[int]) -> np.ndarray:
+        offsets: tp.Dict[int, int] = graph.get_evaluator().get_offsets()
+        return np.array([offsets[id_] for id_ in ids], dtype=int).reshape((-1, 1)) + np.arange(3)
+
+    @classmethod
+    def gather(
+            cls,
+            graph: 'SubGraph',
+            ids: tp.List[int],
+            vector: tp.Optional[np.ndarray] = None
+    ) -> SubSE2Array:
+        """ returns the poses of the nodes with the given ids, optionally from a (flat) graph vector """
+        if vector is None:
+            vector = graph.to_vector().array().flatten()
+        return cls(vector[cls._indices(graph, ids)])
+
+    def scatter(
+            self,
+            graph: 'SubGraph',
+            ids: tp.List[int]
+    ) -> None:
+        """ sets the poses of the nodes with the given ids, and updates the metrics of the graph """
+        vector: np.ndarray = graph.to_vector().array().flatten()
+        vector[self._indices(graph, ids)] = self._array
+        graph.from_vector(Vector(vector))
+
+    # helper-methods
+    @staticmethod
+    def _jacobian_elements(angles: np.ndarray) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ returns the elements (a, b) of the left Jacobians [[a, -b], [b, a]] of angles, as SO2.jacobian_elements """
+        is_small: np.ndarray = np.abs(angles) <= 1e-8
+        safe: np.ndarray = np.where(is_small, 1., angles)
+        a: np.ndarray = np.where(is_small, 1., np.sin(safe) / safe)
+        b: np.ndarray = np.where(is_small, 0.5 * angles, (1. - np.cos(safe)) / safe)
+        return a, b
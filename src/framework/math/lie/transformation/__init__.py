@@ -1,3 +1,4 @@
 from src.framework.math.lie.transformation.SE2 import SE2
+from src.framework.math.lie.transformation.SE2Array import SE2Array
 from src.framework.math.lie.transformation.SE3 import SE3
 from src.framework.math.lie.transformation.SEFactory import SEFactory
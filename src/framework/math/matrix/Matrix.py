@@ -19,6 +19,16 @@ class Matrix(object):
         super().__init__()
         self._matrix = np.asarray(data).astype(float)
 
+    @classmethod
+    def from_arrays(cls, arrays: np.ndarray) -> tp.List[SubMatrix]:
+        """ Returns the matrices of many arrays (N x rows x columns) at once, as views of one copy. """
+        matrices: tp.List[SubMatrix] = []
+        for array in np.array(arrays, dtype=float):
+            matrix: SubMatrix = cls.__new__(cls)
+            matrix._matrix = array
+            matrices.append(matrix)
+        return matrices
+
     # alternative representations
     def array(self) -> np.ndarray:
         return self._matrix
@@ -45,6 +55,12 @@ class Matrix(object):
     def is_zero(self) -> bool:
         return not self._matrix.any()
 
+    # copy
+    def __deepcopy__(self, memo: tp.Dict[int, tp.Any]) -> SubMatrix:
+        new: SubMatrix = type(self).__new__(type(self))
+        new._matrix = self._matrix.copy()
+        return new
+
     # print
     def to_string(
             self,
@@ -0,0 +1,401 @@
+import typing as tp
+
+import numpy as np
+from scipy import sparse
+
+from src.framework.graph.BatchEvaluator import EdgeGroup
+from src.framework.graph.ElementLog import Change, Entry, element_log
+from src.framework.math.matrix.vector import VectorFactory
+from src.framework.optimiser.SparseOptimiser import SparseOptimiser
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubNode, SubEdge
+    from src.framework.math.matrix.vector.Vector import SubSizeVector
+
+# linearised edges: keys of edges, cells of node values (n x k), hessian blocks (n x k x k), gradients (n x k)
+Batch = tp.Tuple[tp.List[int], np.ndarray, np.ndarray, np.ndarray]
+
+# linearised edges added to (1) or removed from (-1) the system: cells, hessian blocks, gradients, sign
+Contribution = tp.Tuple[np.ndarray, np.ndarray, np.ndarray, float]
+
+
+class IncrementalOptimiser(object):
+    """
+    Incremental Gauss-Newton on a growing graph, keeping linearised edges and the system assembled from them between
+    updates (iSAM-style). The edges to linearise again are found from the element log.
+    """
+
+    _graph: 'SubGraph'
+    _threshold: float  # relinearisation of nodes whose delta exceeds it
+    _tolerance: float  # writing of nodes whose estimate changed more than it
+
+    # variables, in the order of the graph vector: linearisation point, delta and node-id per cell
+    _offsets: tp.Dict[int, int]
+    _node_ids: tp.Dict[int, int]  # id of node -> node-id
+    _last_node: tp.Optional['SubNode']
+    _point: np.ndarray
+    _delta: np.ndarray
+    _cell_ids: np.ndarray
+    _fixed_ids: tp.Set[int]
+    _columns: np.ndarray
+    _size: int
+
+    # estimates as last written to the graph
+    _estimate: np.ndarray
+
+    # linearised edges
+    _batches: tp.List[Batch]
+    _is_alive: tp.List[np.ndarray]
+    _factors: tp.Dict[int, tp.Tuple[int, int]]  # edge-key -> (batch, row)
+    _num_dead: int
+    _num_edges: int  # of the graph, that have been linearised
+    _last_edge: tp.Optional['SubEdge']
+    _position: int  # in the element log
+
+    # system on the free variables, kept up to date with the contributions of linearised edges
+    _hessian: tp.Optional[sparse.csc_matrix]  # None if to be assembled from all batches
+    _gradient: np.ndarray
+    _contributions: tp.List[Contribution]
+
+    def __init__(
+            self,
+            graph: 'SubGraph',
+            threshold: float = 1e-2,
+            tolerance: float = 1e-6
+    ):
+        self._graph = graph
+        self._threshold = threshold
+        self._tolerance = tolerance
+        self.reset()
+
+    def reset(self) -> None:
+        self._offsets = {}
+        self._node_ids = {}
+        self._last_node = None
+        self._point = np.zeros(0)
+        self._delta = np.zeros(0)
+        self._cell_ids = np.zeros(0, dtype=int)
+        self._fixed_ids = set()
+        self._columns = np.zeros(0, dtype=int)
+        self._size = 0
+        self._estimate = np.zeros(0)
+
+        self._batches = []
+        self._is_alive = []
+        self._factors = {}
+        self._num_dead = 0
+        self._num_edges = 0
+        self._last_edge = None
+        self._position = element_log.head()
+
+        self._hessian = None
+        self._gradient = np.zeros(0)
+        self._contributions = []
+
+    # variables
+    def _add_variables(self) -> None:
+        """ Appends the nodes that have been added to the graph. """
+        nodes: tp.List['SubNode'] = self._graph.get_nodes()
+        count: int = len(self._offsets)
+        if len(nodes) < count or (count > 0 and nodes[count - 1] is not self._last_node):
+            # nodes have been removed: start over
+            self.reset()
+            count = 0
+        if len(nodes) == count:
+            return
+
+        offset: int = len(self._point)
+        values: tp.List[float] = []
+        cell_ids: tp.List[int] = []
+        for node in nodes[count:]:
+            id_: int = node.get_id()
+            self._offsets[id_] = offset
+            self._node_ids[id(node)] = id_
+            values += node.to_list()
+            cell_ids += [id_] * node.dim()
+            if node.is_fixed():
+                self._fixed_ids.add(id_)
+            offset += node.dim()
+        self._last_node = nodes[-1]
+
+        self._point = np.concatenate((self._point, values))
+        self._delta = np.concatenate((self._delta, np.zeros(len(values))))
+        self._estimate = np.concatenate((self._estimate, values))
+        self._cell_ids = np.concatenate((self._cell_ids, np.array(cell_ids, dtype=int)))
+        self._set_columns()
+
+    def _set_columns(self) -> None:
+        """ Numbers the cells of free nodes, such that cells that are appended are numbered last. """
+        is_free: np.ndarray = np.isin(self._cell_ids, list(self._fixed_ids), invert=True)
+        self._columns = np.full(len(self._point), -1)
+        self._columns[is_free] = np.arange(np.count_nonzero(is_free))
+        self._size = int(np.count_nonzero(is_free))
+
+    def _relinearise_variables(self) -> tp.List[int]:
+        """ Moves the linearisation point of nodes whose delta exceeds the threshold, and returns their ids. """
+        is_moved: np.ndarray = np.abs(self._delta) > self._threshold
+        if not is_moved.any():
+            return []
+        ids: np.ndarray = np.unique(self._cell_ids[is_moved])
+        cells: np.ndarray = np.isin(self._cell_ids, ids)
+        self._point[cells] += self._delta[cells]
+        self._delta[cells] = 0.
+        return ids.tolist()
+
+    # edges
+    def _stale_edges(self) -> tp.List['SubEdge']:
+        """
+        Returns the edges that were added to the graph or changed (measurement, info matrix or nodes) since the last
+        update, as recorded in the element log. Nodes of which the value or fixation was changed meanwhile are taken
+        over, and their edges are returned as well.
+        """
+        edges: tp.List['SubEdge'] = self._graph.get_edges()
+        head: int = element_log.head()
+        entries: tp.Optional[tp.List[Entry]] = element_log.since(self._position, Change.STATE, head)
+        is_appended: bool = len(edges) >= self._num_edges and \
+            (self._num_edges == 0 or edges[self._num_edges - 1] is self._last_edge)
+        if entries is None or not is_appended:
+            # too many changes, or edges have been removed: start over
+            self.reset()
+            self._add_variables()
+            entries = []
+
+        stale: tp.List['SubEdge'] = edges[self._num_edges:]
+        keys: tp.Set[int] = {id(edge) for edge in stale}
+        moved_ids: tp.List[int] = []
+        is_fixation_changed: bool = False
+        for element, _ in entries:
+            # logged elements are alive, so an element with the same id is the same element
+            key: int = id(element)
+            if key in self._factors:
+                if key not in keys:
+                    keys.add(key)
+                    stale.append(element)
+            elif key in self._node_ids:
+                id_: int = self._node_ids[key]
+                if element.is_fixed() != (id_ in self._fixed_ids):
+                    self._fixed_ids ^= {id_}
+                    is_fixation_changed = True
+                if self._take_value(element):
+                    moved_ids.append(id_)
+        for id_ in moved_ids:
+            for edge in self._graph.get_edges_of_node(id_):
+                if id(edge) not in keys:
+                    keys.add(id(edge))
+                    stale.append(edge)
+        if is_fixation_changed:
+            self._set_columns()
+            self._hessian = None
+
+        self._num_edges = len(edges)
+        self._last_edge = edges[-1] if edges else None
+        self._position = head
+        return stale
+
+    def _take_value(self, node: 'SubNode') -> bool:
+        """ Takes a value of a node that was set by others as its linearisation point, and returns whether it was. """
+        offset: int = self._offsets[self._node_ids[id(node)]]
+        cells: slice = slice(offset, offset + node.dim())
+        value: np.ndarray = np.array(node.to_list())
+        if not np.any(np.abs(value - self._estimate[cells]) > self._tolerance):
+            return False
+        self._point[cells] = value
+        self._delta[cells] = 0.
+        self._estimate[cells] = value
+        return True
+
+    def _remove_factors(self, keys: tp.List[int]) -> None:
+        """ Forgets the linearisation of edges, and subtracts it from the system. """
+        rows_by_batch: tp.Dict[int, tp.List[int]] = {}
+        for key in keys:
+            batch, row = self._factors.pop(key)
+            if batch not in rows_by_batch:
+                rows_by_batch[batch] = []
+            rows_by_batch[batch].append(row)
+        for batch, rows in rows_by_batch.items():
+            _, cells, hessians, gradients = self._batches[batch]
+            self._is_alive[batch][rows] = False
+            self._contributions.append((cells[rows], hessians[rows], gradients[rows], -1.))
+        self._num_dead += len(keys)
+
+    def _groups(self, edges: tp.List['SubEdge']) -> tp.List[EdgeGroup]:
+        """ Returns edges in groups with the same layout, on the vector of variables. """
+        by_key: tp.Dict[tp.Tuple[tp.Any, ...], tp.List['SubEdge']] = {}
+        for edge in edges:
+            key: tp.Tuple[tp.Any, ...] = EdgeGroup.key(edge)
+            if key not in by_key:
+                by_key[key] = []
+            by_key[key].append(edge)
+        return [
+            EdgeGroup(group_edges, list(range(len(group_edges))), self._offsets) for group_edges in by_key.values()
+        ]
+
+    def _linearise(self, edges: tp.List['SubEdge']) -> None:
+        """ Linearises edges at the current linearisation point, in batches of edges with the same layout. """
+        self._remove_factors([id(edge) for edge in edges if id(edge) in self._factors])
+
+        for group in self._groups(edges):
+            group_edges: tp.List['SubEdge'] = group.get_edges()
+            values: tp.List[np.ndarray] = group.gather(self._point)
+            errors: np.ndarray = group.errors(values)
+            jacobian: np.ndarray = np.concatenate(group.jacobians(values), axis=2)
+            cells: np.ndarray = np.concatenate(group.slot_indices(), axis=1)
+
+            # J^T W J and J^T W e
+            weighted_jacobian: np.ndarray = np.einsum('nij,nik->njk', jacobian, group.info_matrices())
+            hessians: np.ndarray = np.einsum('njk,nkl->njl', weighted_jacobian, jacobian)
+            gradients: np.ndarray = np.einsum('njk,nk->nj', weighted_jacobian, errors)
+
+            batch: int = len(self._batches)
+            keys: tp.List[int] = [id(edge) for edge in group_edges]
+            self._batches.append((keys, cells, hessians, gradients))
+            self._is_alive.append(np.ones(len(keys), dtype=bool))
+            self._contributions.append((cells, hessians, gradients, 1.))
+            for row, key in enumerate(keys):
+                self._factors[key] = (batch, row)
+
+    def _compact(self) -> None:
+        """ Merges the live rows of all batches with the same width, after which the system is assembled anew. """
+        by_width: tp.Dict[int, tp.List[int]] = {}
+        for batch, (_, cells, _, _) in enumerate(self._batches):
+            if cells.shape[1] not in by_width:
+                by_width[cells.shape[1]] = []
+            by_width[cells.shape[1]].append(batch)
+
+        batches: tp.List[Batch] = []
+        for indices in by_width.values():
+            keys: tp.List[int] = []
+            for i in indices:
+                keys += [key for key, is_alive in zip(self._batches[i][0], self._is_alive[i].tolist()) if is_alive]
+            if keys:
+                batches.append((
+                    keys,
+                    np.concatenate([self._batches[i][1][self._is_alive[i]] for i in indices]),
+                    np.concatenate([self._batches[i][2][self._is_alive[i]] for i in indices]),
+                    np.concatenate([self._batches[i][3][self._is_alive[i]] for i in indices])
+                ))
+        self._batches = batches
+        self._is_alive = [np.ones(len(batch[0]), dtype=bool) for batch in batches]
+        for batch, (keys, _, _, _) in enumerate(batches):
+            for row, key in enumerate(keys):
+                self._factors[key] = (batch, row)
+        self._num_dead = 0
+
+        # without the rounding errors of added and subtracted contributions
+        self._hessian = None
+
+    # linear system
+    def _assemble(self, contributions: tp.List[Contribution]) -> tp.Tuple[sparse.csc_matrix, np.ndarray]:
+        """ Returns the hessian and gradient on the free variables of (signed) contributions. """
+        rows: tp.List[np.ndarray] = []
+        cols: tp.List[np.ndarray] = []
+        data: tp.List[np.ndarray] = []
+        gradient: np.ndarray = np.zeros(self._size)
+        for cells, hessians, gradients, sign in contributions:
+            columns: np.ndarray = self._columns[cells]
+            rows.append(np.broadcast_to(columns[:, :, None], hessians.shape).flatten())
+            cols.append(np.broadcast_to(columns[:, None, :], hessians.shape).flatten())
+            data.append(sign * hessians.flatten())
+            is_active: np.ndarray = columns >= 0
+            np.add.at(gradient, columns[is_active], sign * gradients[is_active])
+        if not data:
+            return sparse.csc_matrix((self._size, self._size)), gradient
+
+        rows_array: np.ndarray = np.concatenate(rows)
+        cols_array: np.ndarray = np.concatenate(cols)
+        data_array: np.ndarray = np.concatenate(data)
+        mask: np.ndarray = (rows_array >= 0) & (cols_array >= 0)
+        hessian: sparse.csc_matrix = sparse.coo_matrix(
+            (data_array[mask], (rows_array[mask], cols_array[mask])), shape=(self._size, self._size)
+        ).tocsc()
+        return hessian, gradient
+
+    def _update_system(self) -> None:
+        """ Adds the contributions of edges that were linearised or forgotten since the last solve to the system. """
+        if self._hessian is None:
+            self._hessian, self._gradient = self._assemble([
+                (cells[is_alive], hessians[is_alive], gradients[is_alive], 1.)
+                for (_, cells, hessians, gradients), is_alive in zip(self._batches, self._is_alive)
+            ])
+        else:
+            hessian, gradient = self._assemble(self._contributions)
+            # appended variables are numbered last
+            size: int = self._hessian.shape[0]
+            indptr: np.ndarray = np.concatenate(
+                (self._hessian.indptr, np.full(self._size - size, self._hessian.indptr[-1]))
+            )
+            self._hessian = sparse.csc_matrix(
+                (self._hessian.data, self._hessian.indices, indptr), shape=(self._size, self._size)
+            ) + hessian
+            self._gradient = np.concatenate((self._gradient, np.zeros(self._size - size))) + gradient
+        self._contributions = []
+
+    def _solve(self) -> bool:
+        """ Solves for the delta of all variables from their linearisation point. """
+        self._update_system()
+        if not self._batches:
+            return True
+        step: tp.Optional[np.ndarray] = SparseOptimiser.solve_gauss_newton(self._hessian, self._gradient)
+        if step is None:
+            return False
+        is_free: np.ndarray = self._columns >= 0
+        self._delta = np.zeros(len(self._point))
+        self._delta[is_free] = step[self._columns[is_free]]
+        return True
+
+    # update
+    def update(self, iterations: int = 3) -> bool:
+        """ Adds new nodes and edges of the graph, relinearises what is affected, and writes the estimates back. """
+        self._add_variables()
+        stale: tp.List['SubEdge'] = self._stale_edges()
+        is_solved: bool = True
+        for _ in range(iterations):
+            # edges of nodes that moved from their linearisation point
+            edge_keys: tp.Set[int] = {id(edge) for edge in stale}
+            for id_ in self._relinearise_variables():
+                for edge in self._graph.get_edges_of_node(id_):
+                    if id(edge) not in edge_keys:
+                        edge_keys.add(id(edge))
+                        stale.append(edge)
+            if not stale:
+                break
+            self._linearise(stale)
+            if self._num_dead > len(self._factors):
+                self._compact()
+            is_solved = self._solve()
+            if not is_solved:
+                break
+            stale = []
+
+        self._write()
+        # the estimates written are no changes by others
+        self._position = element_log.head()
+        return is_solved
+
+    def _write(self) -> None:
+        """ Writes the estimates of nodes that changed to the graph, and updates the metrics of their edges. """
+        estimate: np.ndarray = self._point + self._delta
+        is_changed: np.ndarray = np.abs(estimate - self._estimate) > self._tolerance
+        if not is_changed.any():
+            return
+        ids: np.ndarray = np.unique(self._cell_ids[is_changed])
+        cells: np.ndarray = np.isin(self._cell_ids, ids)
+        self._estimate[cells] = estimate[cells]
+
+        edges: tp.List['SubEdge'] = []
+        edge_keys: tp.Set[int] = set()
+        for id_ in ids.tolist():
+            node: 'SubNode' = self._graph.get_node(id_)
+            offset: int = self._offsets[id_]
+            node.set_from_list(estimate[offset: offset + node.dim()].tolist())
+            for edge in self._graph.get_edges_of_node(id_):
+                if id(edge) not in edge_keys:
+                    edge_keys.add(id(edge))
+                    edges.append(edge)
+
+        # error vectors of edges in batch
+        for group in self._groups(edges):
+            vector_type: tp.Type['SubSizeVector'] = VectorFactory.from_dim(group.dim())
+            errors: np.ndarray = group.errors(group.gather(self._estimate))
+            for edge, error in zip(group.get_edges(), errors.tolist()):
+                edge.set_metrics(vector_type(error))
@@ -5,6 +5,8 @@ from pathlib import Path
 
 from src.definitions import get_project_root
 from src.framework.graph.GraphParser import GraphParser
+from src.framework.optimiser.OptimiserWorker import OptimiserWorker
+from src.framework.optimiser.SparseOptimiser import SparseOptimiser
 
 if tp.TYPE_CHECKING:
     from src.framework.graph.Graph import SubGraph
@@ -15,6 +17,7 @@ class Library(Enum):
     DENSE = 'Dense'
     EIGEN = 'Eigen'
     PCG = 'PCG'
+    SCIPY = 'SciPy'
 
 
 class Solver(Enum):
@@ -48,17 +51,29 @@ class Optimiser(object):
         Library.PCG: {
             Solver.GN: 'gn_pcg',
             Solver.LM: 'lm_pcg'
+        },
+        Library.SCIPY: {
+            Solver.GN: 'gn_scipy',
+            Solver.LM: 'lm_scipy'
         }
     }
 
+    _worker: tp.Optional[OptimiserWorker]
+
+    # folder of the g2o input and output files, relative to the project root
+    _temp_folder: str = 'graphs/temp'
+
     # constructor
     def __init__(
             self,
             library: Library = Library.CHOLMOD,
-            solver: Solver = Solver.GN
+            solver: Solver = Solver.GN,
+            is_persistent: bool = False
     ):
         self._library = library
         self._solver = solver
+        self._worker = None
+        self.set_persistent(is_persistent)
 
     # solver
     def set(
@@ -82,6 +97,30 @@ class Optimiser(object):
     def get_solver(self) -> Solver:
         return self._solver
 
+    # persistent g2o-process, instead of a g2o-process (and files) per optimisation
+    def set_persistent(self, is_persistent: bool) -> None:
+        if is_persistent and self._worker is None:
+            self._worker = OptimiserWorker()
+        elif not is_persistent and self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+
+    def is_persistent(self) -> bool:
+        return self._worker is not None
+
+    def stop(self) -> None:
+        """ Stops the persistent g2o-process, if running, which is started again by the next optimisation. """
+        if self._worker is not None:
+            self._worker.stop()
+
+    @classmethod
+    def set_temp_folder(cls, folder: str) -> None:
+        cls._temp_folder = folder
+
+    @classmethod
+    def get_temp_folder(cls) -> str:
+        return cls._temp_folder
+
     @classmethod
     def get_libraries(cls) -> tp.List[Library]:
         return list(cls.solvers.keys())
@@ -107,6 +146,12 @@ class Optimiser(object):
             should_print: bool = False,
             compute_marginals: bool = False
     ) -> tp.Optional['SubGraph']:
+        if self.is_persistent() and self._library != Library.SCIPY and not compute_marginals:
+            return self._worker.optimise(
+                graph,
+                self.get_solver_string(self._library, self._solver),
+                should_print=should_print
+            )
         return self.optimise(
             graph,
             self._library,
@@ -124,8 +169,11 @@ class Optimiser(object):
             should_print: bool = False,
             compute_marginals: bool = False
     ) -> tp.Optional['SubGraph']:
+        if library == Library.SCIPY:
+            return cls.optimise_in_process(graph, solver, should_print=should_print)
+
         root: Path = get_project_root()
-        relative_to: str = 'graphs/temp'
+        relative_to: str = cls._temp_folder
         GraphParser.save_path_folder(graph, relative_to, 'before', should_print=should_print)
 
         path_g2o_bin: Path = (root / 'g2o/bin/g2o').resolve()
@@ -157,3 +205,22 @@ class Optimiser(object):
             # graph.copy_attributes_to(solution)
             return solution
         return None
+
+    @classmethod
+    def optimise_in_process(
+            cls,
+            graph: 'SubGraph',
+            solver: Solver = Solver.GN,
+            should_print: bool = False
+    ) -> tp.Optional['SubGraph']:
+        assert solver in cls.solvers[Library.SCIPY]
+        solution: 'SubGraph' = graph.copy()
+        optimiser = SparseOptimiser(solution)
+        if solver == Solver.LM:
+            is_solved: bool = optimiser.levenberg_marquardt(should_print=should_print)
+        else:
+            is_solved = optimiser.gauss_newton(should_print=should_print)
+        if is_solved:
+            optimiser.write()
+            return solution
+        return None
@@ -0,0 +1,174 @@
+import subprocess
+import typing as tp
+import weakref
+from pathlib import Path
+
+from src.definitions import get_project_root
+from src.framework.graph.GraphParser import GraphParser
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubNode, SubEdge
+
+NodeState = tp.Tuple[bool, tp.List[float]]  # fixed, value
+EdgeState = tp.Tuple[tp.Tuple[int, ...], tp.List[float], tp.List[tp.List[float]]]  # node ids, value, info matrix
+
+
+class OptimiserWorker(object):
+    """ A long-lived g2o process, to which a graph is streamed as deltas of the elements it already holds. """
+
+    _process: tp.Optional[subprocess.Popen]
+
+    # content of the worker: the graph it belongs to, the nodes by their ids and the edges by the ids of the edges
+    _graph: tp.Optional[weakref.ref]
+    _node_states: tp.Dict[int, NodeState]
+    _edge_states: tp.Dict[int, tp.Tuple[weakref.ref, EdgeState]]
+
+    def __init__(self):
+        self._process = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._graph = None
+        self._node_states = {}
+        self._edge_states = {}
+
+    # process
+    def start(self) -> None:
+        if self.is_running():
+            return
+        path_worker_bin: Path = (get_project_root() / 'g2o/bin/g2o_worker').resolve()
+        self._process = subprocess.Popen(
+            [str(path_worker_bin)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+        self._reset()
+
+    def stop(self) -> None:
+        if self.is_running():
+            self._send(['QUIT'])
+            self._process.stdin.close()
+            self._process.wait()
+        self._process = None
+        self._reset()
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def _send(self, lines: tp.List[str]) -> None:
+        self._process.stdin.write(''.join(f'{line}\n' for line in lines))
+        self._process.stdin.flush()
+
+    def _receive(self) -> tp.List[str]:
+        line: str = self._process.stdout.readline()
+        assert line, 'g2o_worker has exited.'
+        return line.split()
+
+    def _command(self, lines: tp.List[str]) -> bool:
+        self._send(lines)
+        return self._receive() == ['OK']
+
+    # delta
+    @staticmethod
+    def _edge_state(edge: 'SubEdge') -> EdgeState:
+        return tuple(edge.get_node_ids()), edge.to_list(), edge.get_info_matrix().array().tolist()
+
+    def _holds_part_of(
+            self,
+            graph: 'SubGraph',
+            edge_states: tp.List[EdgeState]
+    ) -> bool:
+        """ Returns whether the worker holds elements of the graph only, of which the edges are unchanged. """
+        if self._graph is None or self._graph() is not graph:
+            return False
+        if not self._node_states.keys() <= {node.get_id() for node in graph.get_nodes()}:
+            return False
+        num_held: int = 0
+        for edge, state in zip(graph.get_edges(), edge_states):
+            held: tp.Optional[tp.Tuple[weakref.ref, EdgeState]] = self._edge_states.get(id(edge))
+            if held is not None:
+                if held[0]() is not edge or held[1] != state:
+                    # a replaced, re-measured or re-weighted edge
+                    return False
+                num_held += 1
+        return num_held == len(self._edge_states)
+
+    def _delta(self, graph: 'SubGraph') -> tp.Tuple[tp.List['SubNode'], tp.List['SubEdge'], tp.List[str]]:
+        """ Returns the nodes and edges the worker does not hold yet, and the value-lines of the nodes that changed. """
+        nodes: tp.List['SubNode'] = graph.get_nodes()
+        edges: tp.List['SubEdge'] = graph.get_edges()
+        edge_states: tp.List[EdgeState] = [self._edge_state(edge) for edge in edges]
+        if not self._holds_part_of(graph, edge_states):
+            # another graph, or elements that have been removed or changed: start over
+            if self._node_states or self._edge_states:
+                assert self._command(['CLEAR'])
+            self._reset()
+            self._graph = weakref.ref(graph)
+
+        new_nodes: tp.List['SubNode'] = []
+        new_edges: tp.List['SubEdge'] = []
+        value_lines: tp.List[str] = []
+        for node in nodes:
+            state: NodeState = (node.is_fixed(), node.to_list())
+            if node.get_id() not in self._node_states:
+                new_nodes.append(node)
+            elif state != self._node_states[node.get_id()]:
+                value_lines.append(' '.join([str(node.get_id()), str(int(state[0]))] + [repr(value) for value in state[1]]))
+            self._node_states[node.get_id()] = state
+        for edge, state in zip(edges, edge_states):
+            if id(edge) not in self._edge_states:
+                new_edges.append(edge)
+                self._edge_states[id(edge)] = (weakref.ref(edge), state)
+        return new_nodes, new_edges, value_lines
+
+    # optimise
+    def optimise(
+            self,
+            graph: 'SubGraph',
+            solver_string: str,
+            iterations: int = 5,
+            should_print: bool = False
+    ) -> tp.Optional['SubGraph']:
+        self.start()
+        nodes, edges, value_lines = self._delta(graph)
+        if should_print:
+            print(f'framework/OptimiserWorker: Sending {len(nodes)} nodes, {len(edges)} edges and {len(value_lines)} values.')
+        lines: tp.List[str] = GraphParser.format_lines(nodes, edges)
+        if (lines and not self._command([f'LOAD {len(lines)}'] + lines)) or \
+                (value_lines and not self._command([f'SET {len(value_lines)}'] + value_lines)):
+            self.stop()
+            return None
+
+        self._send([f'OPTIMIZE {solver_string} {iterations}'])
+        words: tp.List[str] = self._receive()
+        if words[0] != 'ESTIMATES':
+            # start over on the next call
+            self._graph = None
+            return None
+        count: int = int(words[1])
+        if should_print:
+            print(f'framework/OptimiserWorker: chi2= {float(words[2]):.6f}')
+
+        solution: 'SubGraph' = graph.copy()
+        ids: tp.List[int] = []
+        for _ in range(count):
+            words = self._receive()
+            id_: int = int(words[0])
+            # estimates are given as their elements in g2o-files, not as vectors
+            solution.get_node(id_).set_from_list([float(word) for word in words[1:]])
+            ids.append(id_)
+        # metrics of edges in batch
+        solution.from_vector(solution.to_vector())
+        for id_ in ids:
+            self._node_states[id_] = (False, solution.get_node(id_).to_list())
+        return solution
+
+    # pickling: a copy starts its own process
+    def __getstate__(self) -> tp.Dict[str, tp.Any]:
+        return {}
+
+    def __setstate__(self, state: tp.Dict[str, tp.Any]) -> None:
+        self.__init__()
@@ -0,0 +1,244 @@
+import typing as tp
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse import linalg
+
+from src.framework.graph.BatchEvaluator import BatchEvaluator, EdgeGroup
+from src.framework.math.matrix.vector.Vector import Vector
+
+if tp.TYPE_CHECKING:
+    from src.framework.graph.Graph import SubGraph, SubNode
+
+
+class SparseOptimiser(object):
+    """ In-process Gauss-Newton/Levenberg-Marquardt least-squares solver on scipy.sparse. """
+
+    _graph: 'SubGraph'
+    _evaluator: BatchEvaluator
+
+    # state
+    _state: np.ndarray
+    _columns: np.ndarray
+    _size: int
+
+    # finite differences
+    _epsilon: float = 1e-6
+
+    # damping of rank-deficient Gauss-Newton steps, relative to the largest diagonal element of the hessian
+    _damping: float = 1e-9
+
+    def __init__(self, graph: 'SubGraph'):
+        self._graph = graph
+        self._evaluator = graph.get_evaluator()
+
+        columns: tp.List[int] = []
+        size: int = 0
+        node: 'SubNode'
+        for node in graph.get_nodes():
+            dim: int = node.dim()
+            if node.is_fixed():
+                columns += [-1] * dim
+            else:
+                columns += list(range(size, size + dim))
+                size += dim
+        self._columns = np.array(columns, dtype=int)
+        self._size = size
+        self._state = graph.to_vector().array().flatten()
+
+    # cost
+    def cost(self, state: tp.Optional[np.ndarray] = None) -> float:
+        if state is None:
+            state = self._state
+        return self._evaluator.cost(state)
+
+    # linear system
+    def linearise(self) -> tp.Tuple[sparse.csc_matrix, np.ndarray]:
+        rows: tp.List[np.ndarray] = []
+        cols: tp.List[np.ndarray] = []
+        data: tp.List[np.ndarray] = []
+        gradient: np.ndarray = np.zeros(self._size)
+
+        for group in self._evaluator.get_groups():
+            values: tp.List[np.ndarray] = group.gather(self._state)
+            errors: np.ndarray = group.errors(values)
+
+            jacobians: tp.List[np.ndarray] = []
+            columns: tp.List[np.ndarray] = []
+            for jacobian, indices in zip(group.jacobians(values), group.slot_indices()):
+                slot_columns: np.ndarray = self._columns[indices]
+                if np.all(slot_columns < 0):
+                    continue
+                jacobians.append(jacobian)
+                columns.append(slot_columns)
+            if not jacobians:
+                continue
+
+            # J^T W J and J^T W e, per pair of connected slots
+            for i, (jacobian_i, columns_i) in enumerate(zip(jacobians, columns)):
+                weighted_jacobian: np.ndarray = np.einsum('nij,nik->njk', jacobian_i, group.info_matrices())
+                is_active: np.ndarray = columns_i >= 0
+                np.add.at(gradient, columns_i[is_active], np.einsum('njk,nk->nj', weighted_jacobian, errors)[is_active])
+                for jacobian_j, columns_j in zip(jacobians, columns):
+                    block: np.ndarray = np.einsum('njk,nkl->njl', weighted_jacobian, jacobian_j)
+                    rows.append(np.broadcast_to(columns_i[:, :, None], block.shape).flatten())
+                    cols.append(np.broadcast_to(columns_j[:, None, :], block.shape).flatten())
+                    data.append(block.flatten())
+
+        if data:
+            rows_array: np.ndarray = np.concatenate(rows)
+            cols_array: np.ndarray = np.concatenate(cols)
+            data_array: np.ndarray = np.concatenate(data)
+            mask: np.ndarray = (rows_array >= 0) & (cols_array >= 0)
+            hessian = sparse.coo_matrix(
+                (data_array[mask], (rows_array[mask], cols_array[mask])), shape=(self._size, self._size)
+            ).tocsc()
+        else:
+            hessian = sparse.csc_matrix((self._size, self._size))
+        return hessian, gradient
+
+    @classmethod
+    def numeric_jacobian(
+            cls,
+            group: EdgeGroup,
+            values: tp.List[np.ndarray],
+            slot: int
+    ) -> np.ndarray:
+        """ Returns the jacobians (size x dim x slot-dim) of the errors of a group to the values of a node slot. """
+        slot_dim: int = values[slot].shape[1]
+        jacobian: np.ndarray = np.zeros((group.size(), group.dim(), slot_dim))
+        for k in range(slot_dim):
+            jacobian[:, :, k] = cls._derivative(group, values, slot, k)
+        return jacobian
+
+    @classmethod
+    def _derivative(
+            cls,
+            group: EdgeGroup,
+            values: tp.List[np.ndarray],
+            slot: int,
+            k: int
+    ) -> np.ndarray:
+        values_plus: tp.List[np.ndarray] = list(values)
+        values_minus: tp.List[np.ndarray] = list(values)
+        values_plus[slot] = values[slot].copy()
+        values_minus[slot] = values[slot].copy()
+        values_plus[slot][:, k] += cls._epsilon
+        values_minus[slot][:, k] -= cls._epsilon
+        difference: np.ndarray = group.difference(group.errors(values_plus), group.errors(values_minus))
+        return difference / (2 * cls._epsilon)
+
+    @classmethod
+    def check_jacobians(
+            cls,
+            graph: 'SubGraph',
+            should_print: bool = False
+    ) -> float:
+        """ Returns the largest difference between the analytic and the numeric jacobians of the edges of a graph. """
+        vector: np.ndarray = graph.to_vector().array().flatten()
+        difference: float = 0.
+        for group in graph.get_evaluator().get_groups():
+            values: tp.List[np.ndarray] = group.gather(vector)
+            for slot, jacobian in enumerate(group.jacobians(values)):
+                group_difference: float = float(np.max(np.abs(jacobian - cls.numeric_jacobian(group, values, slot))))
+                if should_print:
+                    names: tp.List[str] = [type(node).__name__ for node in group.get_edges()[0].get_nodes()]
+                    print(
+                        f'framework/SparseOptimiser: {type(group.get_edges()[0]).__name__} ({", ".join(names)}), '
+                        f'slot {slot}: {group_difference:.3e}'
+                    )
+                difference = max(difference, group_difference)
+        return difference
+
+    def _increment(self, step: np.ndarray) -> np.ndarray:
+        state: np.ndarray = self._state.copy()
+        is_active: np.ndarray = self._columns >= 0
+        state[is_active] += step[self._columns[is_active]]
+        return state
+
+    @staticmethod
+    def solve(
+            hessian: sparse.csc_matrix,
+            gradient: np.ndarray,
+            damping: float = 0.
+    ) -> tp.Optional[np.ndarray]:
+        """ Solves the (damped) normal equations, or returns None if they are singular. """
+        if len(gradient) == 0:
+            return np.zeros(0)
+        if damping > 0.:
+            hessian = (hessian + damping * sparse.identity(len(gradient), format='csc')).tocsc()
+        try:
+            step: np.ndarray = linalg.splu(hessian).solve(- gradient)
+        except RuntimeError:
+            # exactly singular
+            return None
+        if not np.all(np.isfinite(step)):
+            return None
+        return step
+
+    @classmethod
+    def solve_gauss_newton(
+            cls,
+            hessian: sparse.csc_matrix,
+            gradient: np.ndarray
+    ) -> tp.Optional[np.ndarray]:
+        """ Solves the normal equations, or the slightly damped ones if they are rank-deficient. """
+        step: tp.Optional[np.ndarray] = cls.solve(hessian, gradient)
+        if step is None:
+            # e.g. parameters that are not observable yet
+            damping: float = cls._damping * max(float(hessian.diagonal().max(initial=0.)), 1.)
+            step = cls.solve(hessian, gradient, damping=damping)
+        return step
+
+    # optimise
+    def gauss_newton(self, iterations: int = 5, should_print: bool = False) -> bool:
+        cost: float = self.cost()
+        for iteration in range(iterations):
+            hessian, gradient = self.linearise()
+            step: tp.Optional[np.ndarray] = self.solve_gauss_newton(hessian, gradient)
+            if step is None:
+                return False
+            self._state = self._increment(step)
+            cost = self.cost()
+            if should_print:
+                print(f'framework/SparseOptimiser: iteration= {iteration} chi2= {cost:.6f}')
+        return bool(np.isfinite(cost))
+
+    def levenberg_marquardt(self, iterations: int = 5, should_print: bool = False) -> bool:
+        cost: float = self.cost()
+        damping: tp.Optional[float] = None
+        factor: float = 2.
+        for iteration in range(iterations):
+            hessian, gradient = self.linearise()
+            if damping is None:
+                damping = 1e-5 * max(float(hessian.diagonal().max(initial=0.)), 1e-12)
+
+            # increase damping until the cost decreases
+            is_improved: bool = False
+            for _ in range(10):
+                step: tp.Optional[np.ndarray] = self.solve(hessian, gradient, damping=damping)
+                if step is None:
+                    damping *= factor
+                    factor *= 2
+                    continue
+                state: np.ndarray = self._increment(step)
+                new_cost: float = self.cost(state)
+                gain: float = float(step @ (damping * step - gradient))
+                rho: float = (cost - new_cost) / gain if gain > 0. else -1.
+                if rho > 0. and np.isfinite(new_cost):
+                    self._state = state
+                    cost = new_cost
+                    damping *= max(1 / 3, 1 - (2 * rho - 1) ** 3)
+                    factor = 2.
+                    is_improved = True
+                    break
+                damping *= factor
+                factor *= 2
+            if should_print:
+                print(f'framework/SparseOptimiser: iteration= {iteration} chi2= {cost:.6f} lambda= {damping:.6e}')
+            if not is_improved:
+                break
+        return bool(np.isfinite(cost))
+
+    def write(self) -> None:
+        self._graph.from_vector(Vector(self._state.tolist()))
@@ -1,16 +1,18 @@
 import pathlib
-import sys
 import typing as tp
 from abc import abstractmethod
 from datetime import datetime
 
 import numpy as np
+from src.framework.analysis.sim.MonteCarlo import MonteCarlo
 from src.framework.graph.GraphParser import GraphParser
 from src.framework.simulation.Sensor import SensorFactory
 from src.framework.simulation.Simulation import PlainSimulation, OptimisingSimulation, PostSimulation
-from src.utils import GeoHash2D
+from src.utils import GridIndex2D
+from src.utils.ProgressLog import progress_log
 
 if tp.TYPE_CHECKING:
+    from src.framework.analysis.sim.GraphData import SubGraphData
     from src.framework.graph.data.DataFactory import Quantity
     from src.framework.graph.Graph import SubEdge, SubGraph
     from src.framework.graph.spatial.NodeSE2 import NodeSE2
@@ -25,9 +27,13 @@ if tp.TYPE_CHECKING:
 SubBiSimulation = tp.TypeVar('SubBiSimulation', bound='BiSimulation')
 
 
+class SimulationCancelled(Exception):
+    """ Raised by the step of a simulation that has been cancelled (e.g. from another thread). """
+
+
 class BiSimulation(object):
     _name: str
-    _geo: GeoHash2D[int]
+    _geo: GridIndex2D
     _path: tp.Optional['SubPath']
 
     # optimiser
@@ -37,10 +43,12 @@ class BiSimulation(object):
     _constraint_seed: tp.Optional[int]
     _constraint_rng: np.random.RandomState
     _sensor_seed: tp.Optional[int]
+    _sensor_block_size: int = 64  # measurements of noise drawn at once
 
     # simulations
     _truth_sim: tp.Optional['SubSimulation']
     _estimate_sim: tp.Optional['SubSimulation']
+    _is_cancelled: bool  # checked at each step
 
     def __init__(
             self,
@@ -52,7 +60,7 @@ class BiSimulation(object):
             name = self.__class__.__name__
         self._name = name
         self._optimiser = optimiser
-        self._geo = GeoHash2D[int]()
+        self._geo = GridIndex2D()
         self._path = None
 
         # rng
@@ -62,6 +70,7 @@ class BiSimulation(object):
         # simulations
         self._truth_sim = None
         self._estimate_sim = None
+        self._is_cancelled = False
 
         # configure
         self.configure()
@@ -75,6 +84,10 @@ class BiSimulation(object):
         """ Returns the name. """
         return self._name
 
+    def identifier(self) -> str:
+        """ Returns the class and name, which tell apart the runs of different simulations. """
+        return f'{type(self).__module__}.{type(self).__qualname__}; {self._name}'
+
     # optimiser
     def set_optimiser(self, optimiser: 'Optimiser') -> None:
         self._optimiser = optimiser
@@ -196,7 +209,7 @@ class BiSimulation(object):
         truth_measurement: 'SE2' = truth_sensor.decompose(transformation)
         truth_node, truth_edge = truth_sim.add_odometry(sensor_name, truth_measurement)
 
-        # store new 'truth' pose in geo-hashmap
+        # store new 'truth' pose in spatial index
         translation: 'Vector2' = truth_sim.current().get_value().translation()
         self._geo.add(translation[0], translation[1], truth_sim.current().get_id())
 
@@ -251,19 +264,15 @@ class BiSimulation(object):
         truth_sim: 'SubSimulation' = self.truth_simulation()
 
         pose_ids: tp.List[int] = truth_sim.pose_ids()
-        if len(pose_ids) > separation:
+        if len(pose_ids) > separation + 1:
             current: 'NodeSE2' = truth_sim.current()
             location: 'Vector2' = current.get_value().translation()
 
-            closures: tp.List[int] = self._geo.find_within(location[0], location[1], distance)
-            filtered: tp.List[int] = pose_ids[:-1 - separation]
-            matches: tp.List[int] = []
-            for closure in closures:
-                if closure in filtered:
-                    matches.append(closure)
-            if matches:
-                closure_id: int = matches[0]
-                # closure_id: int = self._rng.choice(closures)
+            # pose-ids are increasing: the last one that is separated bounds the closures
+            closure_id: tp.Optional[int] = self._geo.find_oldest_within(
+                location[0], location[1], distance, max_value=pose_ids[-2 - separation]
+            )
+            if closure_id is not None:
                 current_id: int = self.get_current_id()
                 self.add_poses_edge(sensor_name, closure_id, current_id)
                 return True
@@ -343,20 +352,14 @@ class BiSimulation(object):
             info_matrix_truth: 'SubSquare',
             info_matrix_estimate: 'SubSquare'
     ) -> None:
-        self.truth_simulation().model().add_sensor(
-            sensor_name, SensorFactory.from_value(
-                type_,
-                info_matrix=info_matrix_truth,
-                seed=self._sensor_seed
-            )
-        )
-        self.estimate_simulation().model().add_sensor(
-            sensor_name, SensorFactory.from_value(
-                type_,
-                info_matrix=info_matrix_estimate,
-                seed=self._sensor_seed
-            )
+        truth_sensor: 'SubSensor' = SensorFactory.from_value(type_, info_matrix=info_matrix_truth, seed=self._sensor_seed)
+        estimate_sensor: 'SubSensor' = SensorFactory.from_value(
+            type_, info_matrix=info_matrix_estimate, seed=self._sensor_seed
         )
+        truth_sensor.set_block_size(self._sensor_block_size)
+        estimate_sensor.set_block_size(self._sensor_block_size)
+        self.truth_simulation().model().add_sensor(sensor_name, truth_sensor)
+        self.estimate_simulation().model().add_sensor(sensor_name, estimate_sensor)
 
     def add_sensor_with_cov_matrix(
             self,
@@ -386,11 +389,6 @@ class BiSimulation(object):
         return self.get_truth_sensor(sensor_name), self.get_estimate_sensor(sensor_name)
 
     # tools
-    @staticmethod
-    def print(text: str) -> None:
-        sys.__stdout__.write(f'\r{text}')
-        sys.__stdout__.flush()
-
     def save(
             self,
             name: tp.Optional[str] = None,
@@ -406,17 +404,33 @@ class BiSimulation(object):
         GraphParser.save_path_folder(self.estimate_simulation().graph(), folder, name=f'{name}_perturbed', should_print=should_print)
 
     # simulation
+    def set_cancelled(self, is_cancelled: bool = True) -> None:
+        """ Stops runs at their next step (by raising SimulationCancelled), until it is reset. """
+        self._is_cancelled = is_cancelled
+
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
     def step(self) -> None:
+        if self._is_cancelled:
+            raise SimulationCancelled(self._name)
         self.truth_simulation().step()
         self.estimate_simulation().step()
-        self.print(f'framework/Simulation: Time: {self.timestep():.2f}')
+        progress_log.progress('framework/Simulation', f'Time: {self.timestep():.2f}')
 
     def run(self, should_save: bool = False) -> 'SubGraph':
         self.reset()
         self.initialise()
-        self.simulate()
-        print('\nframework/Simulation: Finalising simulation...')
-        self.finalise()
+        try:
+            self.simulate()
+            progress_log.log('framework/Simulation', 'Finalising simulation...')
+            self.finalise()
+        finally:
+            if self.estimate_simulation().has_optimiser():
+                # a persistent g2o-process is not kept between runs
+                self.estimate_simulation().get_optimiser().stop()
+        if self.estimate_simulation().has_recorder():
+            self.estimate_simulation().get_recorder().finish(self.estimate_simulation().graph())
 
         if should_save:
             self.save()
@@ -426,13 +440,25 @@ class BiSimulation(object):
             self,
             num: int
     ) -> tp.List['SubGraph']:
-        graphs: tp.List['SubGraph'] = []
+        return list(self.monte_carlo_runs(num))
+
+    def monte_carlo_runs(
+            self,
+            num: int
+    ) -> tp.Iterator['SubGraph']:
+        """ Yields the graph of each Monte Carlo step once it has been run. """
         for i in range(num):
             self.set_sensor_seed(i)
             print(f'framework/Simulation: Monte Carlo step {i + 1}/{num}...')
-            estimate = self.run()
-            graphs.append(estimate)
-        return graphs
+            yield self.run()
+
+    def monte_carlo_data(
+            self,
+            num: int,
+            num_workers: tp.Optional[int] = None
+    ) -> 'SubGraphData':
+        """ Runs Monte Carlo steps in parallel worker processes, and returns their metrics instead of graphs. """
+        return MonteCarlo(self, num_runs=num, num_workers=num_workers).run()[0]
 
     # simulation
     def set_simulation(self, simulation: tp.Type['SubSimulation']) -> 'SubSimulation':
@@ -443,8 +469,10 @@ class BiSimulation(object):
     def set_plain_simulation(self) -> PlainSimulation:
         return self.set_simulation(PlainSimulation)
 
-    def set_optimising_simulation(self) -> OptimisingSimulation:
-        return self.set_simulation(OptimisingSimulation)
+    def set_optimising_simulation(self, is_incremental: bool = False) -> OptimisingSimulation:
+        simulation: OptimisingSimulation = self.set_simulation(OptimisingSimulation)
+        simulation.set_incremental(is_incremental)
+        return simulation
 
     def set_post_simulation(self) -> PostSimulation:
         return self.set_simulation(PostSimulation)
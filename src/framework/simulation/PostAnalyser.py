@@ -73,15 +73,15 @@ class SpatialBatchAnalyser(PostAnalyser):
         self._nodes = None
 
     def post_process(self) -> None:
+        graph: 'SubGraph' = self._sim.graph()
         if self._nodes is not None:
             for node in self._nodes:
                 id_: int = node.get_id()
-                self._sim.graph().remove_node_id(id_)
+                incident_edges: tp.List['SubEdge'] = graph.get_edges_of_node(id_)
+                graph.remove_node_id(id_)
 
-                edges: tp.List['SubEdge'] = self.edges()
-                for edge in edges:
-                    if edge.contains_node_id(id_):
-                        edge.remove_node_id(id_)
+                for edge in incident_edges:
+                    edge.remove_node_id(id_)
 
         # calculate edge centres
         edges: tp.List['SubEdge'] = self.edges()
@@ -24,6 +24,12 @@ class Sensor(tp.Generic[T]):
     _type: tp.Type[T]
     _rng: np.random.RandomState
 
+    # noise: factor of the covariance, and standard normals drawn ahead in blocks
+    _noise_factor: tp.Optional[np.ndarray]
+    _block_size: int
+    _block: np.ndarray
+    _block_index: int
+
     _info_matrix: 'SubSquare'
     _parameters: tp.Dict[str, 'SubParameter']
 
@@ -32,12 +38,13 @@ class Sensor(tp.Generic[T]):
             seed: tp.Optional[int] = None,
             info_matrix: tp.Optional['SubSquare'] = None
     ):
+        self._block_size = 1
         self.set_rng(seed)
 
         # information
         if info_matrix is None:
             info_matrix = SquareFactory.from_dim(self.dim()).identity()
-        self._info_matrix = info_matrix
+        self.set_info_matrix(info_matrix)
         self._parameters = {}
 
     # measurement-type
@@ -52,12 +59,13 @@ class Sensor(tp.Generic[T]):
     # info
     def set_info_matrix(self, info_matrix: 'SubSquare') -> None:
         self._info_matrix = info_matrix
+        self._noise_factor = None
 
     def get_info_matrix(self) -> 'SubSquare':
         return self._info_matrix
 
     def set_cov_matrix(self, cov_matrix: 'SubSquare') -> None:
-        self._info_matrix = cov_matrix.inverse()
+        self.set_info_matrix(cov_matrix.inverse())
 
     def get_cov_matrix(self) -> 'SubSquare':
         return self._info_matrix.inverse()
@@ -65,16 +73,45 @@ class Sensor(tp.Generic[T]):
     # noise
     def set_rng(self, seed: tp.Optional[int] = None) -> None:
         self._rng = np.random.RandomState(seed)
+        self._block = np.zeros((0, self.dim()))
+        self._block_index = 0
+
+    def set_block_size(self, block_size: int) -> None:
+        """ Draws the standard normals of block_size measurements at once, without changing the seeded noise. """
+        assert block_size >= 1, f'{block_size}'
+        self._block_size = block_size
+
+    def get_block_size(self) -> int:
+        return self._block_size
+
+    def get_noise_factor(self) -> np.ndarray:
+        """ Returns the square root F of the covariance, with noise z @ F for standard normal z. """
+        if self._noise_factor is None:
+            # as RandomState.multivariate_normal, such that seeded noise is unchanged
+            _, s, v = np.linalg.svd(self.get_cov_matrix().array())
+            self._noise_factor = np.sqrt(s)[:, None] * v
+        return self._noise_factor
+
+    def _standard_normals(self, count: int) -> np.ndarray:
+        """ Returns the next (count x dim) standard normals of the stream, refilling the block when it runs out. """
+        available: int = len(self._block) - self._block_index
+        if count <= available:
+            normals: np.ndarray = self._block[self._block_index: self._block_index + count]
+            self._block_index += count
+            return normals
+        drawn: np.ndarray = self._rng.standard_normal((max(count - available, self._block_size), self.dim()))
+        normals = np.concatenate((self._block[self._block_index:], drawn[:count - available]))
+        self._block = drawn
+        self._block_index = count - available
+        return normals
 
     def generate_noise(self) -> 'SubSizeVector':
-        dim: int = self.dim()
-        vector_type: tp.Type['SubSizeVector'] = VectorFactory.from_dim(dim)
-        return vector_type(
-            self._rng.multivariate_normal(
-                mean=[0] * dim,
-                cov=self.get_info_matrix().inverse().array()
-            )
-        )
+        vector_type: tp.Type['SubSizeVector'] = VectorFactory.from_dim(self.dim())
+        return vector_type(self._standard_normals(1)[0] @ self.get_noise_factor())
+
+    def generate_noise_array(self, count: int) -> np.ndarray:
+        """ Returns the noise (count x dim) of the next count measurements. """
+        return self._standard_normals(count) @ self.get_noise_factor()
 
     # parameters
     def has_parameter(self, name: str) -> bool:
@@ -5,6 +5,7 @@ from src.framework.graph.GraphManager import GraphManager
 from src.framework.graph.constraint.EdgeFactory import EdgeFactory
 from src.framework.graph.spatial.SpatialNodeFactory import SpatialNodeFactory
 from src.framework.math.lie.transformation import SE2
+from src.framework.optimiser.IncrementalOptimiser import IncrementalOptimiser
 from src.framework.optimiser.Optimiser import Optimiser
 from src.framework.simulation.Model import Model
 from src.framework.simulation.Parameter import StaticParameter, TimelyBatchParameter, SlidingParameter, \
@@ -12,6 +13,7 @@ from src.framework.simulation.Parameter import StaticParameter, TimelyBatchParam
 from src.framework.simulation.PostAnalyser import SpatialBatchAnalyser
 
 if tp.TYPE_CHECKING:
+    from src.framework.analysis.sim.GraphRecorder import GraphRecorder
     from src.framework.graph.Graph import SubNode, SubParameterNode, SubEdge, SubGraph
     from src.framework.graph.data.DataFactory import Quantity
     from src.framework.graph.parameter.ParameterSpecification import ParameterSpecification
@@ -32,6 +34,10 @@ class Simulation(GraphManager):
     _pose_ids: tp.List[int]  # list of pose-ids
     _current_node: 'NodeSE2'  # current pose-node
 
+    # recording of previous graphs, which are only kept as history if required
+    _recorder: tp.Optional['GraphRecorder']
+    _should_keep_history: bool
+
     def __init__(
             self,
             optimiser: tp.Optional[Optimiser] = None
@@ -41,6 +47,8 @@ class Simulation(GraphManager):
         if optimiser is None:
             optimiser = Optimiser()
         self._optimiser = optimiser
+        self._recorder = None
+        self._should_keep_history = True
         super().__init__()
 
     def model(self) -> 'SubModel':
@@ -49,6 +57,8 @@ class Simulation(GraphManager):
     def reset(self) -> None:
         super().reset()
         self._model.reset()
+        if self.has_recorder():
+            self._recorder.reset()
 
         # reset graph
         self._pose_ids = []
@@ -157,8 +167,29 @@ class Simulation(GraphManager):
         return self._optimiser
 
     def set_previous(self, previous: 'SubGraph') -> None:
-        """ Sets a previous graph. """
-        self.graph().set_previous(previous)
+        """ Sets a previous graph, and records it. """
+        if self.has_recorder():
+            self._recorder.record(previous)
+        if self._should_keep_history:
+            self.graph().set_previous(previous)
+
+    # recorder
+    def set_recorder(
+            self,
+            recorder: tp.Optional['GraphRecorder'],
+            should_keep_history: bool = True
+    ) -> None:
+        """ Sets a recorder of the previous graphs, without which they can only be analysed if kept as history. """
+        assert recorder is not None or should_keep_history
+        self._recorder = recorder
+        self._should_keep_history = should_keep_history
+
+    def has_recorder(self) -> bool:
+        return self._recorder is not None
+
+    def get_recorder(self) -> 'GraphRecorder':
+        assert self.has_recorder()
+        return self._recorder
 
     def add_static_parameter(
             self,
@@ -218,16 +249,30 @@ class OptimisingSimulation(Simulation, ABC):
     _has_closure: bool  # indicates whether a closure has occurred at this step
     _last_cost: tp.Optional[float]
 
+    # incremental optimisation, instead of optimising the whole graph at each closure
+    _is_incremental: bool
+    _incremental_optimiser: tp.Optional[IncrementalOptimiser]
+
     def __init__(self, optimiser: tp.Optional[Optimiser] = None):
         super().__init__(optimiser=optimiser)
         self._has_closure = False
         self._last_cost = None
+        self._is_incremental = False
         self.set_timestep(0)
 
     def reset(self) -> None:
         super().reset()
         self._has_closure = False
         self._last_cost = None
+        self._incremental_optimiser = None
+
+    def set_incremental(self, is_incremental: bool = True) -> None:
+        """ Sets whether closures update the previous solution incrementally, without reinitialising parameters. """
+        self._is_incremental = is_incremental
+        self._incremental_optimiser = None
+
+    def is_incremental(self) -> bool:
+        return self._is_incremental
 
     def add_odometry(
             self,
@@ -246,14 +291,22 @@ class OptimisingSimulation(Simulation, ABC):
     def step(self) -> 'SubGraph':
         graph: 'SubGraph' = self.graph()
         solution: tp.Optional['SubGraph'] = None
-        if self._has_closure:
+        if self._has_closure and self._is_incremental:
+            if self._incremental_optimiser is None:
+                self._incremental_optimiser = IncrementalOptimiser(graph)
+            # the graph holds the solution
+            if self._incremental_optimiser.update():
+                self._last_cost = graph.cost()
+        elif self._has_closure:
             cost_threshold: tp.Optional[float] = 0.
             if self._last_cost is not None:
                 cost_threshold = 2 * self._last_cost
             solution = graph.optimise(self.get_optimiser(), cost_threshold=cost_threshold)
-            self._last_cost = solution.cost()
+            if solution is not None:
+                self._last_cost = solution.cost(is_batched=True)
         if solution is None:
-            solution = graph.copy()
+            # unchanged elements are shared with the previous snapshot
+            solution = graph.snapshot()
         self.set_previous(solution)
 
         self.increment_timestep()
@@ -11,6 +11,7 @@ class OptimisationPane(QtWidgets.QWidget):
 
     _tree: TopTreeNode
     _optimisation_handler: OptimisationHandler
+    _is_graph_selected: bool
 
     # constructor
     def __init__(
@@ -21,6 +22,7 @@ class OptimisationPane(QtWidgets.QWidget):
         super().__init__(**kwargs)
         self._tree = tree
         self._optimisation_handler = OptimisationHandler(tree.optimiser())
+        self._is_graph_selected = False
 
         layout = QtWidgets.QVBoxLayout()
         self.setLayout(layout)
@@ -43,8 +45,30 @@ class OptimisationPane(QtWidgets.QWidget):
         self._optimisation_handler.signal_update.connect(self._handle_graph_selection_update)
         layout.addWidget(self._button_optimise)
 
+        # progress of a running optimisation
+        self._progress_bar = QtWidgets.QProgressBar(parent=self)
+        layout.addWidget(self._progress_bar)
+        self._button_cancel = QtWidgets.QPushButton(parent=self)
+        self._button_cancel.setText('Cancel')
+        self._button_cancel.setEnabled(False)
+        self._button_cancel.clicked.connect(self._optimisation_handler.cancel)
+        layout.addWidget(self._button_cancel)
+        self._optimisation_handler.signal_progress.connect(self._handle_progress)
+        self._optimisation_handler.signal_running.connect(self._handle_running)
+
     def _handle_graph_selection_update(self, signal: int):
-        self._button_optimise.setEnabled(True if signal == self._optimisation_handler.get_signal_filled() else False)
+        self._is_graph_selected = signal == self._optimisation_handler.get_signal_filled()
+        self._button_optimise.setEnabled(self._is_graph_selected and not self._optimisation_handler.is_running())
 
     def _handle_optimise(self):
-        self._optimisation_handler.optimise(should_print=True)
\ No newline at end of file
+        self._optimisation_handler.optimise(should_print=True)
+
+    def _handle_progress(self, num_done: int, num: int) -> None:
+        self._progress_bar.setMaximum(num)
+        self._progress_bar.setValue(num_done)
+
+    def _handle_running(self, is_running: bool) -> None:
+        if is_running:
+            self._progress_bar.setValue(0)
+        self._button_optimise.setEnabled(self._is_graph_selected and not is_running)
+        self._button_cancel.setEnabled(is_running)
\ No newline at end of file
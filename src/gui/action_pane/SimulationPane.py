@@ -30,17 +30,39 @@ class SimulationPane(QtWidgets.QWidget):
         simulator_box = SimulationBox(self._simulation_handler, parent=self)
         layout.addWidget(LabelPane(simulator_box, 'Choose a simulation:'))
 
-        button_simulate = QtWidgets.QPushButton(self)
-        button_simulate.setText('Simulate graph')
-        button_simulate.clicked.connect(self._simulation_handler.simulate)
-        layout.addWidget(button_simulate)
+        self._button_simulate = QtWidgets.QPushButton(self)
+        self._button_simulate.setText('Simulate graph')
+        self._button_simulate.clicked.connect(self._simulation_handler.simulate)
+        layout.addWidget(self._button_simulate)
 
-        button_mc = QtWidgets.QPushButton(self)
-        button_mc.setText('Monte Carlo simulation')
-        button_mc.clicked.connect(self._handle_mc)
-        layout.addWidget(button_mc)
+        self._button_mc = QtWidgets.QPushButton(self)
+        self._button_mc.setText('Monte Carlo simulation')
+        self._button_mc.clicked.connect(self._handle_mc)
+        layout.addWidget(self._button_mc)
+
+        # progress of a running simulation
+        self._progress_bar = QtWidgets.QProgressBar(self)
+        layout.addWidget(self._progress_bar)
+        self._button_cancel = QtWidgets.QPushButton(self)
+        self._button_cancel.setText('Cancel')
+        self._button_cancel.setEnabled(False)
+        self._button_cancel.clicked.connect(self._simulation_handler.cancel)
+        layout.addWidget(self._button_cancel)
+        self._simulation_handler.signal_progress.connect(self._handle_progress)
+        self._simulation_handler.signal_running.connect(self._handle_running)
 
         layout.addWidget(LabelPane(config, 'Simulation parameters:'))
 
     def _handle_mc(self) -> None:
         return self._simulation_handler.monte_carlo(3)
+
+    def _handle_progress(self, num_done: int, num: int) -> None:
+        self._progress_bar.setMaximum(num)
+        self._progress_bar.setValue(num_done)
+
+    def _handle_running(self, is_running: bool) -> None:
+        if is_running:
+            self._progress_bar.setValue(0)
+        self._button_simulate.setEnabled(not is_running)
+        self._button_mc.setEnabled(not is_running)
+        self._button_cancel.setEnabled(is_running)
@@ -1,9 +1,11 @@
+import functools
 import typing as tp
 
 from PyQt5 import QtCore
 from src.framework.graph.Graph import SubGraph, Graph
 from src.framework.optimiser.Optimiser import Optimiser
 from src.gui.modules.TreeNode import GraphTreeNode, TrajectoryTreeNode
+from src.gui.modules.Worker import Worker, JobState
 
 
 class OptimisationHandler(QtCore.QObject):
@@ -12,9 +14,15 @@ class OptimisationHandler(QtCore.QObject):
     _graph_node: tp.Optional[GraphTreeNode]
     _include_history: bool
 
+    # running optimisation, of which the solution is added to the trajectory of the graph
+    _worker: tp.Optional[Worker]
+    _trajectory_node: tp.Optional[TrajectoryTreeNode]
+
     _signal_filled: int = 1
     _signal_empty: int = 0
     signal_update = QtCore.pyqtSignal(int)
+    signal_progress = QtCore.pyqtSignal(int, int)  # steps done, steps
+    signal_running = QtCore.pyqtSignal(bool)
 
     # constructor
     def __init__(self, optimiser: Optimiser):
@@ -22,6 +30,8 @@ class OptimisationHandler(QtCore.QObject):
         self._optimiser = optimiser
         self._graph_node = None
         self._include_history = False
+        self._worker = None
+        self._trajectory_node = None
 
     @classmethod
     def get_signal_filled(cls) -> int:
@@ -55,12 +65,29 @@ class OptimisationHandler(QtCore.QObject):
 
     def optimise(self, should_print: bool = True) -> None:
         assert self._graph_node is not None
+        if self.is_running():
+            print('gui/OptimisationHandler: An optimisation is running already.')
+            return
         graph: SubGraph = self._graph_node.get_graph()
 
         subgraphs: tp.List[SubGraph] = [graph]
         if self._include_history:
             subgraphs = graph.subgraphs()
 
+        self._trajectory_node = self._graph_node.get_parent()
+        self._worker = Worker(functools.partial(self._optimise, subgraphs, should_print), len(subgraphs) + 1)
+        self._worker.signal_result.connect(self._handle_solution)
+        self._worker.signal_progress.connect(self.signal_progress)
+        self._worker.signal_finished.connect(self._handle_finished)
+        self._worker.start()
+        self.signal_running.emit(True)
+
+    def _optimise(
+            self,
+            subgraphs: tp.List[SubGraph],
+            should_print: bool
+    ) -> tp.Iterator[tp.Optional[SubGraph]]:
+        """ Yields once each subgraph is optimised, and lastly the solution of all subgraphs. """
         subsolutions: tp.List[SubGraph] = []
         for subgraph in subgraphs:
             print(f"gui/OptimisationHandler: Optimising '{subgraph.identifier_class_unique()}'...")
@@ -69,8 +96,30 @@ class OptimisationHandler(QtCore.QObject):
             if subsolutions:
                 subsolution.set_previous(subsolutions[-1])
             subsolutions.append(subsolution)
-
-        solution: SubGraph = Graph.from_subgraphs(subsolutions)
-
-        trajectory_node: TrajectoryTreeNode = self._graph_node.get_parent()
-        trajectory_node.add_graph(solution)
+            yield None
+
+        yield Graph.from_subgraphs(subsolutions)
+
+    # worker
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def cancel(self) -> None:
+        if self.is_running():
+            print('gui/OptimisationHandler: Cancelling optimisation...')
+            self._worker.cancel()
+
+    def _handle_solution(self, solution: SubGraph) -> None:
+        self._trajectory_node.add_graph(solution)
+
+    def _handle_finished(self, state: JobState) -> None:
+        self._worker.wait()
+        exception: tp.Optional[Exception] = self._worker.get_exception()
+        self._worker = None
+        self._optimiser.stop()
+        self._trajectory_node = None
+        if state == JobState.FAILED:
+            print(f'gui/OptimisationHandler: Optimisation failed with an error: {exception!r}')
+        elif state == JobState.CANCELLED:
+            print('gui/OptimisationHandler: Optimisation cancelled.')
+        self.signal_running.emit(False)
@@ -1,8 +1,10 @@
+import functools
 import typing as tp
 
 from PyQt5.QtCore import QObject, pyqtSignal
 from src.gui.action_pane.ConfigurationTree import ConfigurationTree
-from src.gui.modules.TreeNode import TopTreeNode
+from src.gui.modules.TreeNode import TopTreeNode, TrajectoryTreeNode
+from src.gui.modules.Worker import Worker, Job, JobState
 
 if tp.TYPE_CHECKING:
     from src.framework.graph.Graph import SubGraph
@@ -14,7 +16,13 @@ class SimulationHandler(QObject):
     _config: ConfigurationTree
     _simulation: tp.Optional['SubSimulation']
 
+    # running simulation, of which the graphs are added to a trajectory as they arrive
+    _worker: tp.Optional[Worker]
+    _trajectory: tp.Optional[TrajectoryTreeNode]
+
     signal_update = pyqtSignal(int)
+    signal_progress = pyqtSignal(int, int)  # runs done, runs
+    signal_running = pyqtSignal(bool)
 
     # constructor
     def __init__(
@@ -27,6 +35,8 @@ class SimulationHandler(QObject):
         self._tree = tree
         self._config = config
         self._simulation = None
+        self._worker = None
+        self._trajectory = None
 
     def set_simulation(self, simulation: 'SubSimulation'):
         simulation.set_optimiser(self._tree.optimiser())
@@ -45,13 +55,54 @@ class SimulationHandler(QObject):
 
     def simulate(self) -> None:
         print(f"gui/SimulationHandler: Simulating trajectory with '{self._simulation.get_name()}'...")
-        graph_estimate: 'SubGraph' = self._simulation.run()
-        self._tree.add_graph(
-            graph_estimate,
-            origin=self._simulation.get_name()
-        )
+        self._start(self._run, 1)
 
     def monte_carlo(self, num) -> None:
         print(f"gui/SimulationHandler: Monte Carlo simulation with '{self._simulation.get_name()}' (with n = {num})...")
-        graphs: tp.List['SubGraph'] = self._simulation.monte_carlo(num)
-        self._tree.add_graphs(graphs, self._simulation.get_name())
+        self._start(functools.partial(self._simulation.monte_carlo_runs, num), num)
+
+    # worker
+    def is_running(self) -> bool:
+        return self._worker is not None
+
+    def cancel(self) -> None:
+        if self.is_running():
+            print(f"gui/SimulationHandler: Cancelling simulation with '{self._simulation.get_name()}'...")
+            self._simulation.set_cancelled()
+            self._worker.cancel()
+
+    def _start(self, job: Job, num_runs: int) -> None:
+        if self.is_running():
+            print('gui/SimulationHandler: A simulation is running already.')
+            return
+        self._simulation.set_cancelled(False)
+        self._trajectory = None
+        self._worker = Worker(job, num_runs)
+        self._worker.signal_result.connect(self._handle_graph)
+        self._worker.signal_progress.connect(self.signal_progress)
+        self._worker.signal_finished.connect(self._handle_finished)
+        self._worker.start()
+        self.signal_running.emit(True)
+
+    def _run(self) -> tp.Iterator['SubGraph']:
+        yield self._simulation.run()
+
+    def _handle_graph(self, graph: 'SubGraph') -> None:
+        if self._trajectory is None:
+            self._trajectory = self._tree.add_graph(graph, origin=self._simulation.get_name())
+        else:
+            self._trajectory.add_graph(graph)
+
+    def _handle_finished(self, state: JobState) -> None:
+        self._worker.wait()
+        exception: tp.Optional[Exception] = self._worker.get_exception()
+        self._worker = None
+        self._trajectory = None
+        if state == JobState.FAILED:
+            print(
+                f"\ngui/SimulationHandler: Simulation with '{self._simulation.get_name()}' failed with an error: "
+                f"{exception!r}"
+            )
+        elif state == JobState.CANCELLED:
+            print(f"\ngui/SimulationHandler: Simulation with '{self._simulation.get_name()}' cancelled.")
+        self.signal_running.emit(False)
@@ -559,18 +559,20 @@ class TopTreeNode(GraphicsTreeNode, QtCore.QObject):
             self,
             graph: 'SubGraph',
             origin: tp.Optional[str] = None
-    ) -> None:
+    ) -> TrajectoryTreeNode:
         trajectory: TrajectoryTreeNode = self._add_trajectory(origin=origin)
         trajectory.add_graph(graph)
+        return trajectory
 
     def add_graphs(
             self,
             graphs: tp.List['SubGraph'],
             origin: tp.Optional[str] = None
-    ) -> None:
+    ) -> TrajectoryTreeNode:
         trajectory: TrajectoryTreeNode = self._add_trajectory(origin=origin)
         for graph in graphs:
             trajectory.add_graph(graph)
+        return trajectory
 
     def clear(self) -> None:
         child: 'SubGraphicsTreeNode'
@@ -0,0 +1,89 @@
+import traceback
+import typing as tp
+from enum import Enum
+
+from PyQt5 import QtCore
+from src.framework.simulation.BiSimulation import SimulationCancelled
+
+Job = tp.Callable[[], tp.Iterator[tp.Any]]  # yields once per step: a result, or None
+
+
+class JobState(Enum):
+    COMPLETE = 'complete'
+    CANCELLED = 'cancelled'
+    FAILED = 'failed'
+
+
+class Worker(QtCore.QObject):
+    """
+    Runs a job on a thread of its own, of which the results and progress are passed to the GUI-thread by (queued)
+    signals. A cancelled job stops after its current step.
+    """
+
+    _job: Job
+    _num_steps: int
+    _is_cancelled: bool
+    _exception: tp.Optional[Exception]
+    _thread: QtCore.QThread
+
+    signal_result = QtCore.pyqtSignal(object)
+    signal_progress = QtCore.pyqtSignal(int, int)  # steps done, steps
+    signal_finished = QtCore.pyqtSignal(object)  # JobState
+
+    # constructor
+    def __init__(
+            self,
+            job: Job,
+            num_steps: int
+    ):
+        super().__init__()
+        self._job = job
+        self._num_steps = num_steps
+        self._is_cancelled = False
+        self._exception = None
+
+        self._thread = QtCore.QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self.run)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._is_cancelled = True
+
+    def is_cancelled(self) -> bool:
+        return self._is_cancelled
+
+    def get_exception(self) -> tp.Optional[Exception]:
+        """ Returns the exception by which the job failed, if any. """
+        return self._exception
+
+    def wait(self) -> None:
+        """ Waits for the thread to stop, once the job is finished. """
+        self._thread.quit()
+        self._thread.wait()
+
+    @QtCore.pyqtSlot()
+    def run(self) -> None:
+        num_done: int = 0
+        try:
+            for result in self._job():
+                num_done += 1
+                if result is not None:
+                    self.signal_result.emit(result)
+                self.signal_progress.emit(num_done, self._num_steps)
+                if self._is_cancelled:
+                    break
+        except SimulationCancelled:
+            pass
+        except Exception as exception:
+            # an exception must not leave the thread, or the application is aborted
+            traceback.print_exc()
+            self._exception = exception
+        if self._exception is not None:
+            self.signal_finished.emit(JobState.FAILED)
+        elif num_done == self._num_steps:
+            self.signal_finished.emit(JobState.COMPLETE)
+        else:
+            self.signal_finished.emit(JobState.CANCELLED)
@@ -1,26 +1,55 @@
 import sys
+import threading
+import typing as tp
 
-from PyQt5 import QtGui, QtWidgets
+from PyQt5 import QtCore, QtGui, QtWidgets
+from src.utils.ProgressLog import progress_log
+
+if tp.TYPE_CHECKING:
+    from src.utils.ProgressLog import LogEvent
 
 
 class Stream(object):
+    """ Writes to the standard output, and collects the text for a text-edit, which takes it in batches. """
+
+    _texts: tp.List[str]
+    _lock: threading.Lock  # written by worker threads, taken by the GUI-thread
 
     # constructor
-    def __init__(self, edit: QtWidgets.QTextEdit):
-        self.edit = edit
+    def __init__(self):
         self.out = sys.__stdout__
+        self._texts = []
+        self._lock = threading.Lock()
 
     # overridden methods
     def write(self, m):
-        self.edit.insertPlainText(m)
+        with self._lock:
+            self._texts.append(m)
         self.out.write(m)
 
     def flush(self):
         pass
 
+    # progress log sink
+    def write_events(self, events: tp.List['LogEvent']) -> None:
+        """ Collects lines of the progress log, which are written to the standard output by the log itself. """
+        lines: tp.List[str] = [f'{event.to_string()}\n' for event in events if not event.is_progress()]
+        with self._lock:
+            self._texts.extend(lines)
+
+    def take(self) -> str:
+        with self._lock:
+            text: str = ''.join(self._texts)
+            self._texts = []
+        return text
+
 
 class TerminalText(QtWidgets.QTextEdit):
 
+    _stream: Stream
+    _timer: QtCore.QTimer
+    _interval: int = 100  # milliseconds between appends
+
     # constructor
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -31,7 +60,19 @@ class TerminalText(QtWidgets.QTextEdit):
         p.setColor(QtGui.QPalette.Text, QtGui.QColor("#ffffff"))
         self.setPalette(p)
 
-        sys.stdout = Stream(self)
+        self._stream = Stream()
+        sys.stdout = self._stream
+        progress_log.add_sink(self._stream.write_events)
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.append_stream)
+        self._timer.start(self._interval)
+
+    def append_stream(self) -> None:
+        """ Appends all text written since the last call at once. """
+        text: str = self._stream.take()
+        if text:
+            self.insertPlainText(text)
 
     def insertPlainText(self, text: str) -> None:
         super().insertPlainText(text)
@@ -14,10 +14,13 @@ class PopUp(object):
         filename, _ = QtWidgets.QFileDialog.getOpenFileName(
             caption='Select file',
             directory='',
-            filter='g2o (*.g2o)'
+            filter='g2o (*.g2o);;binary (header.json)'
         )
         if filename:
             path = pathlib.Path(filename)
+            if GraphParser.is_binary(path.parent):
+                # binary graphs are folders, opened by their header
+                path = path.parent
             graph: SubGraph = GraphParser.load(path, should_sort=True)
             return graph, path
         return None
@@ -44,12 +47,12 @@ class PopUp(object):
         filename, _ = QtWidgets.QFileDialog.getSaveFileName(
             caption='Save as file',
             directory='',
-            filter='g2o (*.g2o)'
+            filter='g2o (*.g2o);;binary (*.graph)'
         )
         if filename:
-            if not filename.endswith('.g2o'):
-                filename += '.g2o'
             path: pathlib.Path = pathlib.Path(filename)
+            if not (path.suffix == '.g2o' or GraphParser.is_binary(path)):
+                path = pathlib.Path(f'{filename}.g2o')
             GraphParser.save(graph, path)
             return path
         return None
@@ -7,6 +7,7 @@ from PyQt5.QtGui import QVector3D
 from src.framework.math.matrix.vector import Vector3
 from src.gui.modules.TreeNode import TopTreeNode
 from src.gui.viewer.Grid import Grid
+from src.gui.viewer.items.GraphicsItem import GraphicsItem
 if tp.TYPE_CHECKING:
     from src.gui.viewer.items.GraphicsItem import SubGLGraphicsItem
 
@@ -49,7 +50,11 @@ class Viewer(gl.GLViewWidget):
         if self._is_grid:
             items.append(self._grid)
 
+        kept: tp.Set[int] = {id(item) for item in items}
         for item in self.items:
+            if id(item) not in kept and isinstance(item, GraphicsItem):
+                # while the context of its buffers can be made current
+                item.delete_buffers()
             item._setView(None)
         for item in items:
             item._setView(self)
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import typing as tp
 
+import numpy as np
 from OpenGL.GL import *
 from src.framework.graph.Visualisable import DrawAxis
 from src.framework.math.lie.transformation import SE3
-from src.gui.viewer.Drawer import Drawer
 from src.gui.viewer.items.GraphicsItem import GraphicsItem
 
 if tp.TYPE_CHECKING:
@@ -29,6 +29,7 @@ class Axes(GraphicsItem):
         self.setGLOptions(gl_options)
         self._width: float = width
         self._size: float = size
+        self.rebuild()
 
     # public method
     def paint(self):
@@ -38,12 +39,24 @@ class Axes(GraphicsItem):
         glHint(GL_LINE_SMOOTH_HINT, GL_NICEST)
 
         glLineWidth(self._width)
-        glBegin(GL_LINES)
+        self.draw_buffers(GL_LINES)
 
-        for pose in self._poses:
-            Drawer.axis(pose, self._size)
+    # GraphicsItem
+    def _build(self) -> tp.Tuple[np.ndarray, np.ndarray]:
+        """ Returns a line from the centre of each pose along each of its axes, in red, green and blue. """
+        count: int = len(self._poses)
+        centres: np.ndarray = np.array([pose.translation().to_list() for pose in self._poses]).reshape(count, 1, 3)
+        rotations: np.ndarray = np.array([pose.rotation().array() for pose in self._poses]).reshape(count, 3, 3)
 
-        glEnd()
+        # poses x axes x (centre, end) x 3
+        vertices: np.ndarray = np.zeros((count, 3, 2, 3))
+        vertices[:, :, 0, :] = centres
+        vertices[:, :, 1, :] = centres + self._size * rotations.transpose((0, 2, 1))
+
+        colours: np.ndarray = np.zeros((count, 3, 2, 4))
+        colours[:, :, :, :3] = np.eye(3)[None, :, None, :]
+        colours[:, :, :, 3] = 0.5
+        return vertices, colours
 
     # constructor method
     @staticmethod
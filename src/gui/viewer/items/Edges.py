@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import typing as tp
 
+import numpy as np
 from OpenGL.GL import *
 from src.framework.graph.Visualisable import DrawEdge
 from src.framework.math.matrix.vector import Vector3
-from src.gui.viewer.Drawer import Drawer
 from src.gui.viewer.Rgb import Rgb, RgbTuple
 from src.gui.viewer.items.GraphicsItem import GraphicsItem
 
@@ -31,6 +31,7 @@ class Edges(GraphicsItem):
         # settings
         self._width: float = width
         self.setGLOptions(gl_options)
+        self.rebuild()
 
     # public method
     def paint(self):
@@ -42,12 +43,12 @@ class Edges(GraphicsItem):
         glDepthMask(False)  #
 
         glLineWidth(self._width)
-        glBegin(GL_LINES)
+        self.draw_buffers(GL_LINES)
 
-        for nodeset in self._nodesets:
-            Drawer.line(*nodeset, colour=self._colour)
-
-        glEnd()
+    # GraphicsItem
+    def _build(self) -> tp.Tuple[np.ndarray, np.ndarray]:
+        vertices: np.ndarray = np.array([[a.to_list(), b.to_list()] for a, b in self._nodesets])
+        return vertices, self.uniform_colours(self._colour, 2 * len(self._nodesets))
 
     # constructor method
     @staticmethod
@@ -1,10 +1,14 @@
 import typing as tp
 from abc import abstractmethod
 
+import numpy as np
+from OpenGL.GL import *
+from OpenGL.arrays import vbo
 from pyqtgraph.opengl.GLGraphicsItem import GLGraphicsItem
 from src.gui.viewer.Rgb import Rgb, RgbTuple
 
 if tp.TYPE_CHECKING:
+    from pyqtgraph.opengl import GLViewWidget
     from src.framework.graph.Visualisable import SubVisualisable
 
 SubGLGraphicsItem = tp.TypeVar('SubGLGraphicsItem', bound='GLGraphicsItem')
@@ -14,17 +18,77 @@ SubGraphicsItem = tp.TypeVar('SubGraphicsItem', bound='GraphicsItem')
 class GraphicsItem(GLGraphicsItem):
     name: str
 
+    # geometry: vertices (n x 3) and their colours (n x 4), uploaded to buffers when first painted
+    _vertices: np.ndarray
+    _colours: np.ndarray
+    _buffers: tp.Optional[tp.Tuple[vbo.VBO, vbo.VBO]]
+
     # constructor
     def __init__(self, colour: tp.Optional[RgbTuple] = Rgb.WHITE):
         super().__init__()
         self._colour: RgbTuple = colour
+        self._vertices = np.zeros((0, 3), dtype=np.float32)
+        self._colours = np.zeros((0, 4), dtype=np.float32)
+        self._buffers = None
 
     def set_colour(self, colour: RgbTuple) -> None:
         self._colour = colour
+        self.rebuild()
 
     def get_colour(self) -> RgbTuple:
         return self._colour
 
+    # geometry
+    def rebuild(self) -> None:
+        """ Recomputes the vertices and colours, which are uploaded again when next painted. """
+        vertices, colours = self._build()
+        self._vertices = np.ascontiguousarray(vertices, dtype=np.float32).reshape(-1, 3)
+        self._colours = np.ascontiguousarray(colours, dtype=np.float32).reshape(-1, 4)
+        assert len(self._vertices) == len(self._colours)
+        self.delete_buffers()
+
+    @abstractmethod
+    def _build(self) -> tp.Tuple[np.ndarray, np.ndarray]:
+        pass
+
+    def delete_buffers(self) -> None:
+        """ Deletes the buffers, with the context of the view current, of which they are. """
+        if self._buffers is None:
+            return
+        view: tp.Optional['GLViewWidget'] = self.view()
+        if view is not None:
+            view.makeCurrent()
+            for buffer in self._buffers:
+                buffer.delete()
+        # otherwise removed from the view, and deleted with its context
+        self._buffers = None
+
+    def draw_buffers(self, mode: int) -> None:
+        """ Draws all vertices from the buffers in a single call. """
+        if len(self._vertices) == 0:
+            return
+        if self._buffers is None:
+            self._buffers = (vbo.VBO(self._vertices), vbo.VBO(self._colours))
+        vertex_buffer, colour_buffer = self._buffers
+
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        try:
+            vertex_buffer.bind()
+            glVertexPointer(3, GL_FLOAT, 0, vertex_buffer)
+            colour_buffer.bind()
+            glColorPointer(4, GL_FLOAT, 0, colour_buffer)
+            glDrawArrays(mode, 0, len(self._vertices))
+        finally:
+            colour_buffer.unbind()
+            vertex_buffer.unbind()
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+
+    @staticmethod
+    def uniform_colours(colour: RgbTuple, count: int, alpha: float = 0.5) -> np.ndarray:
+        return np.tile(np.array([*colour, alpha], dtype=np.float32), (count, 1))
+
     # eligibility method
     @staticmethod
     @abstractmethod
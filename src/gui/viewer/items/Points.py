@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import typing as tp
 
+import numpy as np
 from OpenGL.GL import *
 from src.framework.graph.Visualisable import SubVisualisable, DrawPoint
 from src.framework.math.matrix.vector import Vector3
-from src.gui.viewer.Drawer import Drawer
 from src.gui.viewer.Rgb import Rgb, RgbTuple
 from src.gui.viewer.items.GraphicsItem import GraphicsItem
 
@@ -27,6 +27,7 @@ class Points(GraphicsItem):
         self._points: tp.List[Vector3] = points
         # settings
         self._width: float = width
+        self.rebuild()
 
     # public method
     def paint(self):
@@ -41,16 +42,17 @@ class Points(GraphicsItem):
         glEnable(GL_POINT_SMOOTH)
         glPointSize(self._width)
 
-        glBegin(GL_POINTS)
+        self.draw_buffers(GL_POINTS)
 
-        for point in self._points:
-            Drawer.point(point, colour=self._colour)
-
-        glEnd()
         glDisable(GL_POINT_SMOOTH)
         glBlendFunc(GL_NONE, GL_NONE)
         glDisable(GL_BLEND)
 
+    # GraphicsItem
+    def _build(self) -> tp.Tuple[np.ndarray, np.ndarray]:
+        vertices: np.ndarray = np.array([point.to_list() for point in self._points])
+        return vertices, self.uniform_colours(self._colour, len(self._points))
+
     # constructor method
     @staticmethod
     def check(element_type: tp.Type['SubVisualisable']) -> bool:
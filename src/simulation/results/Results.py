@@ -38,6 +38,9 @@ class Results(BiSimulation, ABC):
         self._num_steps = num_steps
         return self
 
+    def identifier(self) -> str:
+        return f'{super().identifier()}; {self._num_steps} steps'
+
     def configure(self) -> None:
         self.set_sensor_seed(0)
         self.set_constraint_rng(0)
@@ -75,8 +78,6 @@ class Results(BiSimulation, ABC):
         gps_num: int = 10  # 10
         gps_ids: set = set(self.get_constraint_rng().randint(1, self._num_steps, size=(gps_num,)))
 
-        costs: tp.List[float] = []
-
         for i in range(self._num_steps):
             self.step()
 
@@ -87,8 +88,6 @@ class Results(BiSimulation, ABC):
                 self.add_gps('gps')
 
             self.loop(i)
-            cost = self.estimate_simulation().graph().cost()
-            costs.append(cost)
 
     @abstractmethod
     def loop(self, iteration: int) -> None:
@@ -0,0 +1,106 @@
+import typing as tp
+
+import numpy as np
+
+
+class GridIndex2D(object):
+    """ Points with integer values (e.g. node ids), in a uniform grid of square cells. """
+
+    _size: float
+
+    # points, in the order they were added
+    _xs: np.ndarray
+    _ys: np.ndarray
+    _values: np.ndarray
+    _count: int
+
+    # cell -> indices of its points
+    _cells: tp.Dict[tp.Tuple[int, int], tp.List[int]]
+
+    def __init__(self, size: float = 1.):
+        self._size = size
+        self.reset()
+
+    def reset(self) -> None:
+        self._xs = np.zeros(16)
+        self._ys = np.zeros(16)
+        self._values = np.zeros(16, dtype=int)
+        self._count = 0
+        self._cells = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(
+            self,
+            x: float,
+            y: float,
+            value: int
+    ) -> None:
+        if self._count == len(self._values):
+            self._xs = np.concatenate((self._xs, np.zeros(self._count)))
+            self._ys = np.concatenate((self._ys, np.zeros(self._count)))
+            self._values = np.concatenate((self._values, np.zeros(self._count, dtype=int)))
+        self._xs[self._count] = x
+        self._ys[self._count] = y
+        self._values[self._count] = value
+
+        cell: tp.Tuple[int, int] = self._cell(x, y)
+        if cell not in self._cells:
+            self._cells[cell] = []
+        self._cells[cell].append(self._count)
+        self._count += 1
+
+    # queries
+    def find_within(
+            self,
+            x: float,
+            y: float,
+            distance: float,
+            max_value: tp.Optional[int] = None
+    ) -> tp.List[int]:
+        """ Returns the values of all points within <distance> from (x, y), up to <max_value>, in ascending order. """
+        return np.sort(self._values[self._find_indices(x, y, distance, max_value)]).tolist()
+
+    def find_oldest_within(
+            self,
+            x: float,
+            y: float,
+            distance: float,
+            max_value: tp.Optional[int] = None
+    ) -> tp.Optional[int]:
+        """ Returns the lowest value of the points within <distance> from (x, y), up to <max_value>, if any. """
+        indices: np.ndarray = self._find_indices(x, y, distance, max_value)
+        if len(indices) == 0:
+            return None
+        return int(np.min(self._values[indices]))
+
+    # helper-methods
+    def _cell(
+            self,
+            x: float,
+            y: float
+    ) -> tp.Tuple[int, int]:
+        return int(np.floor(x / self._size)), int(np.floor(y / self._size))
+
+    def _find_indices(
+            self,
+            x: float,
+            y: float,
+            distance: float,
+            max_value: tp.Optional[int]
+    ) -> np.ndarray:
+        """ Returns the indices of the points within <distance> from (x, y), up to <max_value>. """
+        a_min, b_min = self._cell(x - distance, y - distance)
+        a_max, b_max = self._cell(x + distance, y + distance)
+        candidates: tp.List[int] = []
+        for a in range(a_min, a_max + 1):
+            for b in range(b_min, b_max + 1):
+                cell: tp.Optional[tp.List[int]] = self._cells.get((a, b))
+                if cell is not None:
+                    candidates.extend(cell)
+        indices: np.ndarray = np.array(candidates, dtype=int)
+        is_within: np.ndarray = (self._xs[indices] - x) ** 2 + (self._ys[indices] - y) ** 2 <= distance ** 2
+        if max_value is not None:
+            is_within &= self._values[indices] <= max_value
+        return indices[is_within]
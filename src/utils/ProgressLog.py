@@ -0,0 +1,157 @@
+import atexit
+import collections
+import sys
+import threading
+import time
+import typing as tp
+
+
+class LogEvent(object):
+    """ A progress update, which replaces the previous update of its source, or a line of text. """
+
+    __slots__ = ('_source', '_text', '_is_progress')
+
+    _source: str
+    _text: str
+    _is_progress: bool
+
+    def __init__(
+            self,
+            source: str,
+            text: str,
+            is_progress: bool
+    ):
+        self._source = source
+        self._text = text
+        self._is_progress = is_progress
+
+    def source(self) -> str:
+        return self._source
+
+    def text(self) -> str:
+        return self._text
+
+    def is_progress(self) -> bool:
+        return self._is_progress
+
+    def to_string(self) -> str:
+        return f'{self._source}: {self._text}'
+
+
+Sink = tp.Callable[[tp.List[LogEvent]], None]
+
+
+class ProgressLog(object):
+    """
+    Progress updates and lines of text, buffered and passed to sinks in batches: progress at most once per interval (of
+    which successive updates of a source are coalesced), and lines right away. Progress that is buffered within an
+    interval of the last batch is passed on by a timer, and a full buffer is passed on at once, such that no event is
+    dropped.
+    """
+
+    _events: tp.Deque[LogEvent]
+    _capacity: int
+    _sinks: tp.List[Sink]
+    _interval: float
+    _last_flush: float
+    _timer: tp.Optional[threading.Timer]  # passes on buffered progress
+    _is_enabled: bool
+    _lock: threading.Lock  # events may be added by worker threads
+    _flush_lock: threading.Lock  # batches are passed to the sinks in order
+
+    # standard output sink
+    _is_on_progress_line: bool
+
+    def __init__(
+            self,
+            capacity: int = 1024,
+            interval: float = 0.1
+    ):
+        self._events = collections.deque()
+        self._capacity = capacity
+        self._sinks = [self.write_stdout]
+        self._interval = interval
+        self._last_flush = 0.
+        self._timer = None
+        self._is_enabled = True
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._is_on_progress_line = False
+
+    def set_enabled(self, is_enabled: bool = True) -> None:
+        """ Enables or disables (e.g. for headless runs) the log, of which events are then dropped right away. """
+        if not is_enabled:
+            self.flush()
+        self._is_enabled = is_enabled
+
+    def is_enabled(self) -> bool:
+        return self._is_enabled
+
+    def set_interval(self, interval: float) -> None:
+        self._interval = interval
+
+    # sinks
+    def add_sink(self, sink: Sink) -> None:
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink: Sink) -> None:
+        self._sinks.remove(sink)
+
+    def write_stdout(self, events: tp.List[LogEvent]) -> None:
+        """ Writes progress on a line of its own that is overwritten, and lines below it. """
+        texts: tp.List[str] = []
+        for event in events:
+            if event.is_progress():
+                texts.append(f'\r{event.to_string()}')
+            elif self._is_on_progress_line:
+                texts.append(f'\n{event.to_string()}\n')
+            else:
+                texts.append(f'{event.to_string()}\n')
+            self._is_on_progress_line = event.is_progress()
+        sys.__stdout__.write(''.join(texts))
+        sys.__stdout__.flush()
+
+    # events
+    def progress(self, source: str, text: str) -> None:
+        if not self._is_enabled:
+            return
+        now: float = time.time()
+        with self._lock:
+            if self._events and self._events[-1].is_progress() and self._events[-1].source() == source:
+                self._events[-1] = LogEvent(source, text, True)
+            else:
+                self._events.append(LogEvent(source, text, True))
+            delay: float = self._interval - (now - self._last_flush)
+            if delay > 0. and len(self._events) < self._capacity:
+                if self._timer is None:
+                    self._timer = threading.Timer(delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+        self.flush()
+
+    def log(self, source: str, text: str) -> None:
+        if not self._is_enabled:
+            return
+        with self._lock:
+            self._events.append(LogEvent(source, text, False))
+        self.flush()
+
+    def flush(self) -> None:
+        """ Passes all buffered events to the sinks. """
+        with self._flush_lock:
+            with self._lock:
+                events: tp.List[LogEvent] = list(self._events)
+                self._events.clear()
+                self._last_flush = time.time()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if events:
+                for sink in self._sinks:
+                    sink(events)
+
+
+progress_log: ProgressLog = ProgressLog()
+# e.g. the last progress of a run
+atexit.register(progress_log.flush)
@@ -0,0 +1,38 @@
+import numpy as np
+from src.definitions import get_project_root
+from src.framework.graph.Graph import Graph
+from src.framework.graph.GraphParser import GraphParser
+from src.framework.math.lie.transformation import SE2
+
+graph_file = (get_project_root() / 'graphs/input_INTEL_g2o.g2o').resolve()
+
+
+def scalar_costs(graph: Graph) -> np.ndarray:
+    return np.array([edge.mahalanobis_distance(edge._compute_error_vector(), edge.get_info_matrix())
+                     for edge in graph.get_edges()])
+
+
+def test_batched_cost_follows_edge_changes():
+    graph: Graph = GraphParser.load(graph_file, should_print=False)
+    assert np.isclose(graph.cost(is_batched=True), graph.cost(), rtol=1e-12)
+
+    edge = graph.get_edges()[10]
+    edge.set_value(edge.get_value() + SE2.from_translation_angle_elements(0.5, -0.2, 0.3))
+    assert np.isclose(graph.cost(is_batched=True), graph.cost(), rtol=1e-12)
+    assert np.allclose(graph.costs(), scalar_costs(graph), rtol=1e-9)
+
+    edge = graph.get_edges()[20]
+    edge.set_info_matrix(edge.get_info_matrix() + edge.get_info_matrix())
+    assert np.isclose(graph.cost(is_batched=True), graph.cost(), rtol=1e-12)
+    assert np.allclose(graph.costs(), scalar_costs(graph), rtol=1e-9)
+
+
+def test_from_vector_after_measurement_change():
+    graph: Graph = GraphParser.load(graph_file, should_print=False)
+    graph.cost(is_batched=True)
+
+    edge = graph.get_edges()[30]
+    edge.set_from_list([1., 2., 0.5])
+    graph.from_vector(graph.to_vector())
+    assert np.allclose([edge_.cost() for edge_ in graph.get_edges()], scalar_costs(graph), rtol=1e-9)
+    assert np.isclose(graph.cost(), np.sum(scalar_costs(graph)), rtol=1e-12)
@@ -0,0 +1,51 @@
+import pathlib
+import shutil
+
+import numpy as np
+from src.framework.analysis.sim.GraphData import GraphData
+
+# pickled by the baseline tree: ResultsConstantBiasStatic, manhattan, 40 steps, seeds 0 and 1, config [0.1] * 3
+fixture: pathlib.Path = pathlib.Path(__file__).parent / 'fixtures' / 'graph_data_baseline.pickle'
+
+# (cost, ate, rpet, rper) of the final graphs, as computed by the baseline tree
+baseline_metrics = [
+    (30.837812669310892, 0.5332982468251459, 0.06883324560705537, 0.0015958805001976457),
+    (25.91886701872708, 1.1949231882694407, 0.051559109037015265, 0.0014495490524692246)
+]
+
+
+def graph_metrics(graph_data: GraphData, index: int):
+    graph = graph_data.graph(index)
+    return graph.cost(), graph.ate(), graph.rpe_translation(), graph.rpe_rotation()
+
+
+def assert_series_equal(a, b):
+    assert a.keys() == b.keys()
+    assert np.allclose(a.time(), b.time())
+    for key in a.keys():
+        assert np.allclose(a.data(key), b.data(key), equal_nan=True)
+
+
+def test_load_baseline_pickle():
+    graph_data: GraphData = GraphData.load(fixture)
+    for index, metrics in enumerate(baseline_metrics):
+        assert np.allclose(graph_metrics(graph_data, index), metrics)
+        assert np.isclose(graph_data.graph(index).cost(is_batched=True), metrics[0])
+
+
+def test_migrate_baseline_pickle(tmp_path: pathlib.Path):
+    shutil.copy(fixture, tmp_path)
+    paths = GraphData.migrate_all(tmp_path)
+    assert paths == [tmp_path / 'graph_data_baseline.results']
+    assert GraphData.migrate_all(tmp_path) == []
+
+    legacy: GraphData = GraphData.load_pickle(fixture)
+    migrated: GraphData = GraphData.load(paths[0])
+    assert_series_equal(legacy._metrics, migrated._metrics)
+    for group, time_datas in legacy._series_groups().items():
+        migrated_time_datas = migrated._series_groups()[group]
+        assert list(time_datas) == list(migrated_time_datas)
+        for name, time_data in time_datas.items():
+            assert_series_equal(time_data, migrated_time_datas[name])
+    for index, metrics in enumerate(baseline_metrics):
+        assert np.allclose(graph_metrics(migrated, index), metrics)
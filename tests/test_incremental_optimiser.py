@@ -0,0 +1,56 @@
+import typing as tp
+
+import numpy as np
+from src.definitions import get_project_root
+from src.framework.graph.Graph import Graph
+from src.framework.graph.GraphParser import GraphParser
+from src.framework.optimiser.IncrementalOptimiser import IncrementalOptimiser
+from src.framework.optimiser.SparseOptimiser import SparseOptimiser
+
+graph_file = (get_project_root() / 'graphs/input_INTEL_g2o.g2o').resolve()
+
+
+def _grow(num_steps: int) -> tp.Tuple[Graph, IncrementalOptimiser]:
+    source: Graph = GraphParser.load(graph_file, should_print=False)
+    nodes = source.get_nodes()
+    num_nodes: int = len(nodes)
+    graph: Graph = Graph()
+    optimiser: IncrementalOptimiser = IncrementalOptimiser(graph)
+    edges = source.get_edges()
+    index: int = 0
+    for step in range(1, num_steps + 1):
+        for node in nodes[len(graph.get_nodes()): num_nodes * step // num_steps]:
+            graph.add_node(node)
+        while index < len(edges) and all(graph.contains_node_id(id_) for id_ in edges[index].get_node_ids()):
+            graph.add_edge(edges[index])
+            index += 1
+        optimiser.update()
+    for _ in range(3):
+        optimiser.update()
+    return graph, optimiser
+
+
+def _optimum(graph: Graph) -> float:
+    optimiser: SparseOptimiser = SparseOptimiser(graph)
+    optimiser.gauss_newton(10)
+    return optimiser.cost()
+
+
+def test_changed_info_matrices_are_relinearised():
+    graph, optimiser = _grow(20)
+    for edge in graph.get_edges()[::5]:
+        info_matrix = edge.get_info_matrix()
+        edge.set_info_matrix(type(info_matrix)(4 * info_matrix.array()))
+    for _ in range(5):
+        optimiser.update()
+    assert np.isclose(graph.cost(), _optimum(graph), rtol=1e-3)
+
+
+def test_values_set_by_others_are_taken_over():
+    graph, optimiser = _grow(20)
+    node = graph.get_nodes()[500]
+    value: tp.List[float] = node.to_list()
+    node.set_from_list([element + 0.5 for element in value])
+    for _ in range(5):
+        optimiser.update()
+    assert np.allclose(node.to_list(), value, atol=1e-2)
@@ -0,0 +1,29 @@
+import time
+import typing as tp
+
+from src.utils.ProgressLog import LogEvent, ProgressLog
+
+
+def _log(interval: float) -> tp.Tuple[ProgressLog, tp.List[LogEvent]]:
+    log: ProgressLog = ProgressLog(capacity=16, interval=interval)
+    log.remove_sink(log.write_stdout)
+    events: tp.List[LogEvent] = []
+    log.add_sink(events.extend)
+    return log, events
+
+
+def test_last_progress_is_passed_on():
+    log, events = _log(0.05)
+    for i in range(10):
+        log.progress('test', f'{i}')
+    time.sleep(0.2)
+    assert events[-1].text() == '9'
+
+
+def test_events_are_not_dropped():
+    log, events = _log(60.)
+    log.progress('test', 'start')
+    for i in range(100):
+        log.progress(f'source {i}', f'{i}')
+    log.flush()
+    assert len(events) == 101
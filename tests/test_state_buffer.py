@@ -0,0 +1,47 @@
+import pickle
+
+import numpy as np
+from src.definitions import get_project_root
+from src.framework.graph.Graph import Graph
+from src.framework.graph.GraphParser import GraphParser
+from src.framework.math.lie.transformation import SE2
+from src.framework.math.matrix.vector.Vector import Vector
+
+graph_file = (get_project_root() / 'graphs/input_INTEL_g2o.g2o').resolve()
+
+
+def test_nodes_read_values_written_as_vector():
+    graph: Graph = GraphParser.load(graph_file, should_print=False)
+    assert graph._is_buffered()
+
+    array: np.ndarray = graph.to_vector().array().flatten() + 0.1
+    array[5] += 2 * np.pi
+    graph.from_vector(Vector(array))
+    node = graph.get_nodes()[1]
+    assert np.allclose(node.to_list(), array[3:6] - [0., 0., 2 * np.pi])
+    assert np.allclose(node.get_value().translation_angle_list(), node.to_list())
+    costs = [edge.mahalanobis_distance(edge._compute_error_vector(), edge.get_info_matrix()) for edge in graph.get_edges()]
+    assert np.allclose([edge.cost() for edge in graph.get_edges()], costs, rtol=1e-9)
+
+    node.set_value(SE2.from_translation_angle_elements(1., 2., 0.5))
+    assert np.allclose(graph.to_vector().array().flatten()[3:6], [1., 2., 0.5])
+
+
+def test_copies_keep_their_own_values():
+    graph: Graph = GraphParser.load(graph_file, should_print=False)
+    array: np.ndarray = graph.to_vector().array().flatten()
+
+    copy_: Graph = graph.copy()
+    assert copy_._is_buffered()
+    copy_.from_vector(Vector(array + 0.01))
+    assert np.array_equal(graph.to_vector().array().flatten(), array)
+
+    loaded: Graph = pickle.loads(pickle.dumps(graph))
+    assert loaded._is_buffered()
+    assert np.array_equal(loaded.to_vector().array().flatten(), array)
+
+    node = graph.get_nodes()[-1]
+    graph.remove_node_id(node.get_id())
+    assert graph._is_buffered()
+    assert np.array_equal(graph.to_vector().array().flatten(), array[:-3])
+    assert np.array_equal(node.to_list(), array[-3:])